@@ -0,0 +1,106 @@
+import logging
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.checkpoints import write_json_atomic
+from scraper.multitab import DEFAULT_TABS, bench_browsers, configured_datasets
+from scraper.replay import ReplayServer
+from scraper.sharding import DEFAULT_FACET, FACET_PARAMS, bench_shards
+from eurostat_manager import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Django management command that compares multi-tab scraping in one Chrome
+    instance against one Chrome process per dataset.
+    Unlike benchmark_eurostat it needs a browser; with --replay the datasets are
+    served by a local ReplayServer, so no network access is needed.
+    With --shards it measures one dataset scraped as 1..N filtered shards instead
+    (live page only: recordings ignore the filter parameters).
+    """
+    help = 'Benchmarks datasets per minute and browser memory: one Chrome with N tabs vs one Chrome per dataset'
+
+    def add_arguments(self, parser):
+        """
+        Define command-line arguments for this management command.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser object to add arguments to
+
+        Adds:
+            --replay: Recording (or inspector/ snapshots) served as every dataset
+            --datasets: Number of datasets served from the recording
+            --tabs: Tabs in one browser, and concurrent browsers per dataset
+            --no-headless: Show the browser windows
+            --output: Optional JSON file to write the results to
+            --shards: Shard counts to compare on one dataset (e.g. 1 2 4)
+            --shard-by: Facet the shards are split by
+            --url: Dataset page of the shard benchmark
+        """
+        parser.add_argument('--replay', metavar='DIR',
+                            help='Serve this recording as every dataset (default: EUROSTAT_DATASETS, live)')
+        parser.add_argument('--datasets', type=int, default=8,
+                            help='Number of datasets served from the recording (with --replay)')
+        parser.add_argument('--tabs', type=int, default=DEFAULT_TABS,
+                            help='Tabs in multi-tab mode, browsers running at once in process-per-browser mode')
+        parser.add_argument('--no-headless', action='store_true', help='Show the browser windows')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--shards', type=int, nargs='+',
+                            help='Compare these shard counts on one dataset instead, e.g. --shards 1 2 4')
+        parser.add_argument('--shard-by', choices=sorted(FACET_PARAMS), default=DEFAULT_FACET,
+                            help=f'Facet the shards are split by (default: {DEFAULT_FACET})')
+        parser.add_argument('--url', help='Dataset page of the shard benchmark (default: EUROSTAT_CONFIG["BASE_URL"])')
+
+    def handle(self, *args, **options):
+        """Run both modes against the same datasets and report throughput and memory"""
+        if options['shards']:
+            return self.handle_shards(options)
+        replay_dir = options['replay']
+        with ReplayServer(replay_dir) if replay_dir else nullcontext() as server:
+            if server:
+                # Distinct URLs so every dataset gets its own checkpoint and geo cache key
+                datasets = {f"replay{i}": f"{server.url}?dataset={i}" for i in range(options['datasets'])}
+            else:
+                datasets = configured_datasets()
+            if not datasets:
+                raise CommandError("No datasets: set EUROSTAT_DATASETS (or EUROSTAT_BASE_URL) or use --replay")
+            results = bench_browsers(datasets, tabs=options['tabs'], headless=not options['no_headless'],
+                                     accept_consent=server is None)
+
+        for result in results:
+            self.stdout.write(self.format_result(result))
+        multi_tab, per_browser = results
+        if multi_tab['datasets_per_minute_per_gb'] and per_browser['datasets_per_minute_per_gb']:
+            ratio = multi_tab['datasets_per_minute_per_gb'] / per_browser['datasets_per_minute_per_gb']
+            self.stdout.write(self.style.SUCCESS(f"Multi-tab: x{ratio:.2f} datasets per minute per GB"))
+
+        if options['output']:
+            write_json_atomic(options['output'], {'results': results})
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def handle_shards(self, options):
+        """Scrape one dataset with every shard count and report the speedup over one shard"""
+        url = options['url'] or settings.EUROSTAT_CONFIG.get('BASE_URL')
+        if not url:
+            raise CommandError("No dataset: use --url or set EUROSTAT_BASE_URL")
+        counts = sorted(set(options['shards']) | {1})  # One shard is the baseline
+        results = bench_shards(url, counts, facet=options['shard_by'], headless=not options['no_headless'])
+        for result in results:
+            self.stdout.write(f"{result['case']:<20} {result['observations']} observations  "
+                              f"{result['seconds']:8.1f} s  x{result['speedup']:.2f}"
+                              f"  (discovery {result['discovery_seconds']:.1f} s)")
+        if options['output']:
+            write_json_atomic(options['output'], {'results': results})
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def format_result(self, result):
+        """One human readable line per result"""
+        line = (f"{result['case']:<20} {result['extracted']}/{result['datasets']} datasets  "
+                f"{result['seconds']:8.1f} s  {result['datasets_per_minute']:6.2f}/min")
+        if result['peak_bytes']:
+            line += (f"  peak {result['peak_bytes'] / 1024 ** 2:.0f} MiB"
+                     f"  {result['datasets_per_minute_per_gb']:.2f}/min/GB")
+        return line
@@ -0,0 +1,114 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.benchmarks import (
+    DEFAULT_CELLS, DEFAULT_GEO_SIZES, DEFAULT_THRESHOLD, DEFAULT_YEARS, SUITES,
+    BenchmarkCheckFailed, BenchmarkConfig, compare_results, isolated_database, load_results, write_results,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Django management command that runs the offline benchmark suites.
+    All suites run against a throwaway test database, never against db.sqlite3,
+    and none of them needs a browser or network access.
+    """
+    help = 'Runs offline performance benchmarks for the scraper and its data engines'
+
+    def add_arguments(self, parser):
+        """
+        Define command-line arguments for this management command.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser object to add arguments to
+
+        Adds:
+            --suite: Suite to run (repeatable, defaults to all suites)
+            --geos: Synthetic table sizes in number of geo areas
+            --years: Number of years per synthetic geo area
+            --cells: Number of synthetic cells for the parsing suite
+            --repeat: Runs per measurement (the best one is kept)
+            --output: Optional JSON file to write the results to
+            --compare: Baseline results file to compare against
+            --threshold: Relative slowdown flagged as a regression
+        """
+        parser.add_argument('--suite', action='append', choices=sorted(SUITES), dest='suites',
+                            help='Benchmark suite to run (repeatable, default: all)')
+        parser.add_argument('--geos', type=int, nargs='+', default=list(DEFAULT_GEO_SIZES),
+                            help='Synthetic table sizes (number of geo areas), e.g. --geos 100 1000 10000')
+        parser.add_argument('--years', type=int, default=DEFAULT_YEARS,
+                            help='Number of years per synthetic geo area')
+        parser.add_argument('--cells', type=int, default=DEFAULT_CELLS,
+                            help='Number of synthetic cells for the parsing suite')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per measurement, best one is kept')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--compare', metavar='BASELINE',
+                            help='Compare against a results file and fail on regressions')
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help=f'Relative slowdown flagged as regression (default: {DEFAULT_THRESHOLD})')
+
+    def handle(self, *args, **options):
+        """Run the selected suites, report, save and compare results"""
+        suites = options['suites'] or sorted(SUITES)
+        config = BenchmarkConfig(
+            geo_sizes=options['geos'],
+            n_years=options['years'],
+            repeat=options['repeat'],
+            cells=options['cells'],
+        )
+        results = []
+        with isolated_database():
+            for name in suites:
+                logger.info(f"Running benchmark suite '{name}'")
+                try:
+                    results.extend(SUITES[name](config))
+                except BenchmarkCheckFailed as e:
+                    raise CommandError(f"Benchmark suite '{name}' failed its correctness check: {e}")
+
+        for result in results:
+            self.stdout.write(self.format_result(result))
+
+        if options['output']:
+            write_results(options['output'], results, config)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['compare']:
+            self.compare(results, options['compare'], options['threshold'])
+
+    def format_result(self, result):
+        """One human readable line per result"""
+        size = next((f"{key}={result[key]}" for key in ('geos', 'cells', 'bytes') if key in result), '')
+        line = f"{result['suite']:<8} {result['case']:<22} {size:<14} {result['seconds'] * 1000:12.3f} ms"
+        if result.get('orm_seconds') is not None:
+            line += f"  (ORM {result['orm_seconds'] * 1000:.3f} ms, x{result['speedup']:.1f})"
+        elif result.get('speedup') is not None:
+            line += f"  (x{result['speedup']:.1f})"
+        if result.get('bytes_per_observation') is not None:
+            line += f"  ({result['bytes_per_observation']:.1f} B/observation)"
+        if result.get('peak_bytes') is not None:
+            line += f"  (peak {result['peak_bytes'] / 1024:.1f} KiB)"
+        return line
+
+    def compare(self, results, baseline_path, threshold):
+        """
+        Print the comparison against a baseline and fail if anything regressed
+
+        Raises:
+            CommandError: When at least one result is slower than the baseline beyond threshold
+        """
+        comparisons = compare_results(results, load_results(baseline_path), threshold)
+        regressions = [comparison for comparison in comparisons if comparison['regression']]
+        for comparison in comparisons:
+            suite, case, *_ = comparison['key']
+            line = (f"{suite:<8} {case:<22} {comparison['baseline_seconds'] * 1000:10.3f} ms -> "
+                    f"{comparison['seconds'] * 1000:10.3f} ms  x{comparison['ratio']:.2f}")
+            self.stdout.write(self.style.ERROR(line + "  REGRESSION") if comparison['regression'] else line)
+
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmark(s) regressed more than {threshold:.0%} "
+                               f"against {baseline_path}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path} ({len(comparisons)} compared)"))
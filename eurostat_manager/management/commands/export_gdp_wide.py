@@ -0,0 +1,70 @@
+import logging
+import os
+import shutil
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from scraper.pivot import FLAG_MODES, LABEL_FIELDS, build_wide_table
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Django management command that exports GDP data in the wide analyst layout.
+    Produces the same shape as data/gdp_data_latest.csv (geo_area, year_XXXX, ...)
+    directly from the normalized GeoArea and GDPData tables.
+    """
+    help = 'Exports GDP data as a wide geo × year CSV (gdp_data_latest.csv layout)'
+
+    def add_arguments(self, parser):
+        """
+        Define command-line arguments for this management command.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser object to add arguments to
+
+        Adds:
+            --output: Output CSV path (default: timestamped file in data/)
+            --update-latest: Also overwrite data/gdp_data_latest.csv with the export
+            --flags: How to render data quality flags (none, inline, columns)
+            --label: Geo attribute used for the geo_area column (name or code)
+            --include-unavailable: Also export values of cells marked unavailable
+        """
+        parser.add_argument('--output', help='Output CSV path')
+        parser.add_argument('--update-latest', action='store_true',
+                            help='Also overwrite data/gdp_data_latest.csv with the export')
+        parser.add_argument('--flags', choices=FLAG_MODES, default='none',
+                            help='Render flags inline (value(flag)) or as parallel flag_YYYY columns')
+        parser.add_argument('--label', choices=LABEL_FIELDS, default='name',
+                            help='Geo attribute used for the geo_area column')
+        parser.add_argument('--include-unavailable', action='store_true',
+                            help='Export values of cells marked unavailable')
+
+    def handle(self, *args, **options):
+        """Build the wide table and write it to disk"""
+        table = build_wide_table(
+            label=options['label'],
+            include_unavailable=options['include_unavailable'],
+        )
+
+        output = options['output']
+        if not output:
+            # Default layout of the data/ folder: timestamped export
+            os.makedirs('data', exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output = os.path.join('data', f"gdp_data_{timestamp}.csv")
+        table.write_csv(output, flag_mode=options['flags'])
+
+        # The tracked snapshot is only replaced on request
+        if options['update_latest']:
+            latest = os.path.join('data', 'gdp_data_latest.csv')
+            if os.path.abspath(output) != os.path.abspath(latest):
+                os.makedirs('data', exist_ok=True)
+                shutil.copyfile(output, latest)
+            self.stdout.write(f"Updated {latest}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {len(table.labels)} geo areas × {len(table.years)} years to {output}"
+        ))
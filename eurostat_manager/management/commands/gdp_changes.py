@@ -0,0 +1,61 @@
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.changes import DEFAULT_PAGE_SIZE, change_to_dict, changes_since
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Django management command that prints the GDP change log after a cursor.
+    Changes are written as NDJSON on stdout; the next cursor is the id of the
+    last change printed (also stored in --cursor-file, for incremental syncs).
+    """
+    help = 'Prints GDP observation changes since a cursor as NDJSON'
+
+    def add_arguments(self, parser):
+        """
+        Define command-line arguments for this management command.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser object to add arguments to
+
+        Adds:
+            --since: Last change id already consumed
+            --cursor-file: Read the cursor from this file and store the next one in it
+            --limit: Maximum changes printed
+            --geo: Only changes of this geo code
+        """
+        parser.add_argument('--since', type=int, default=None, help='Last change id already consumed (default: 0)')
+        parser.add_argument('--cursor-file', help='File holding the cursor; updated after printing')
+        parser.add_argument('--limit', type=int, default=DEFAULT_PAGE_SIZE, help='Maximum changes printed')
+        parser.add_argument('--geo', help='Only changes of this geo code')
+
+    def handle(self, *args, **options):
+        """Print one page of changes and advance the cursor"""
+        cursor = options['since']
+        if cursor is None:
+            cursor = self.read_cursor(options['cursor_file']) if options['cursor_file'] else 0
+
+        changes, next_cursor = changes_since(cursor, limit=options['limit'], geo_code=options['geo'])
+        for change in changes:
+            self.stdout.write(json.dumps(change_to_dict(change)))
+
+        if options['cursor_file'] and next_cursor != cursor:
+            with open(options['cursor_file'], 'w', encoding='utf-8') as f:
+                f.write(str(next_cursor))
+        logger.info(f"{len(changes)} changes after cursor {cursor}, next cursor {next_cursor}")
+
+    @staticmethod
+    def read_cursor(path):
+        """Cursor stored in path (0 when the file does not exist yet)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError as e:
+            raise CommandError(f"Invalid cursor in {path}: {e}")
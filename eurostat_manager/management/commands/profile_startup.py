@@ -0,0 +1,60 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.importtime import DEFAULT_TARGETS, HEAVY_MODULES, heavy_imports, profile_imports
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Django management command that profiles startup imports.
+    Runs `python -X importtime` in a fresh interpreter that calls django.setup()
+    and imports the given modules, then reports the slowest imports and fails
+    when a browser-automation or dataframe backend is imported eagerly.
+    """
+    help = 'Profiles import time at startup and checks that heavy backends stay lazy'
+
+    def add_arguments(self, parser):
+        """
+        Define command-line arguments for this management command.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser object to add arguments to
+
+        Adds:
+            --module: Module imported after django.setup() (repeatable, defaults to DEFAULT_TARGETS)
+            --top: Number of slowest top-level imports to print
+            --allow-heavy: Report eagerly imported heavy modules without failing
+        """
+        parser.add_argument('--module', action='append', dest='modules',
+                            help=f'Module to import after django.setup() (default: {", ".join(DEFAULT_TARGETS)})')
+        parser.add_argument('--top', type=int, default=15,
+                            help='Number of slowest top-level imports to show')
+        parser.add_argument('--allow-heavy', action='store_true',
+                            help=f'Do not fail when one of {", ".join(HEAVY_MODULES)} is imported')
+
+    def handle(self, *args, **options):
+        """Profile the imports, print the breakdown and check the heavy modules"""
+        try:
+            entries = profile_imports(options['modules'] or DEFAULT_TARGETS)
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        top_level = sorted((entry for entry in entries if entry['depth'] == 0),
+                           key=lambda entry: entry['cumulative_us'], reverse=True)
+        total_us = sum(entry['cumulative_us'] for entry in top_level)
+        self.stdout.write(f"{len(entries)} modules imported, {total_us / 1000:.1f} ms in total")
+        for entry in top_level[:options['top']]:
+            self.stdout.write(f"{entry['cumulative_us'] / 1000:10.1f} ms  {entry['module']}")
+
+        heavy = heavy_imports(entries)
+        if not heavy:
+            self.stdout.write(self.style.SUCCESS("No heavy backend imported at startup"))
+            return
+        for entry in heavy:
+            self.stdout.write(self.style.WARNING(
+                f"Heavy import at startup: {entry['module']} ({entry['cumulative_us'] / 1000:.1f} ms)"))
+        if not options['allow_heavy']:
+            raise CommandError(f"{len(heavy)} heavy module(s) imported at startup, import them lazily")
@@ -0,0 +1,104 @@
+import logging
+import subprocess
+import sys
+import time
+
+from django.conf import settings as django_settings
+from django.core.management.base import BaseCommand, CommandError
+
+from scraper.checkpoints import dataset_key
+from scraper.multitab import configured_datasets
+from scraper.scheduling import RunLock, ScheduleState, schedule_intervals
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for due datasets (at most; the scheduler wakes up when the next one is due)
+DEFAULT_POLL_SECONDS = 60
+
+
+class Command(BaseCommand):
+    """
+    Django management command that replaces cron for scrape_eurostat.
+    Every configured dataset (EUROSTAT_DATASETS) is scraped on its own interval
+    plus random jitter, one run at a time, each in a child scrape_eurostat
+    process so a crashed browser never takes the scheduler down. Runs hold the
+    per-dataset RunLock, so a manual or cron run of the same dataset is never
+    overlapped; runs missed while the scheduler was down collapse into one.
+    """
+    help = 'Runs scrape_eurostat for the configured datasets on intervals with jitter and single-flight locking'
+
+    def add_arguments(self, parser):
+        """
+        Define command-line arguments for this management command.
+
+        Args:
+            parser (argparse.ArgumentParser): Parser object to add arguments to
+
+        Adds:
+            --dataset: Only schedule these datasets (repeatable, defaults to all configured)
+            --once: Run the due datasets once and exit (for cron or systemd timers)
+            --poll: Maximum seconds between checks for due datasets
+            --incremental: Pass --incremental to every run
+            --pipelined: Pass --pipelined to every run
+        """
+        parser.add_argument('--dataset', action='append', dest='datasets',
+                            help='Dataset name from EUROSTAT_DATASETS (repeatable, default: all)')
+        parser.add_argument('--once', action='store_true', help='Run the due datasets once and exit')
+        parser.add_argument('--poll', type=float, default=DEFAULT_POLL_SECONDS,
+                            help='Maximum seconds between checks for due datasets')
+        parser.add_argument('--incremental', action='store_true', help='Scrape incrementally (see scrape_eurostat)')
+        parser.add_argument('--pipelined', action='store_true', help='Pipelined import (see scrape_eurostat)')
+
+    def handle(self, *args, **options):
+        """Loop over due datasets until interrupted (or once with --once)"""
+        datasets = configured_datasets()
+        if options['datasets']:
+            unknown = set(options['datasets']) - set(datasets)
+            if unknown:
+                raise CommandError(f"Unknown dataset(s): {', '.join(sorted(unknown))}")
+            datasets = {name: datasets[name] for name in options['datasets']}
+        if not datasets:
+            raise CommandError("No datasets configured: set EUROSTAT_DATASETS or EUROSTAT_BASE_URL")
+
+        state = ScheduleState(schedule_intervals(datasets))
+        extra_args = [flag for flag in ('--incremental', '--pipelined') if options[flag.lstrip('-')]]
+        logger.info(f"Scheduling {', '.join(datasets)}: " + ", ".join(
+            f"{name} every {interval}" for name, interval in state.intervals.items()))
+        try:
+            while True:
+                for name, missed in state.due():
+                    self.run_dataset(state, name, datasets[name], missed, extra_args)
+                if options['once']:
+                    return
+                # Still due right now means skipped (locked elsewhere): check again after a poll interval
+                time.sleep(min(options['poll'], state.seconds_until_next()) or options['poll'])
+        except KeyboardInterrupt:
+            logger.info("Scheduler stopped")
+
+    def run_dataset(self, state, name, url, missed, extra_args):
+        """
+        Scrape one due dataset in a child process and schedule its next run
+        Args:
+            state (ScheduleState): Schedule being run
+            name (str): Dataset name
+            url (str): Dataset page
+            missed (int): Scheduled runs this run stands for
+            extra_args (list): Extra scrape_eurostat arguments
+        """
+        lock = RunLock(dataset_key(url))
+        holder = lock.holder()
+        if holder is not None:
+            # Left due: retried at the next check once the other run is done
+            logger.info(f"{name} is being scraped by another process ({lock.describe(holder)}), waiting")
+            return
+        if missed > 1:
+            logger.warning(f"{name}: {missed} missed runs collapsed into one catch-up run")
+        logger.info(f"Scraping {name} ({url})")
+        start = time.perf_counter()
+        command = [sys.executable, str(django_settings.BASE_DIR / 'manage.py'), 'scrape_eurostat', '--url', url]
+        returncode = subprocess.run(command + extra_args).returncode
+        status = "success" if returncode == 0 else "failed"
+        next_run = state.record_run(name, status)
+        log = logger.info if returncode == 0 else logger.error
+        log(f"{name}: {status} (exit code {returncode}) in {time.perf_counter() - start:.1f}s, "
+            f"next run at {next_run:%Y-%m-%d %H:%M:%S}")
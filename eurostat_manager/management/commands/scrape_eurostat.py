@@ -1,7 +1,26 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from scraper.eurostat_scraper import EurostatScraper
 from scraper.models import GeoArea, GDPData
+from scraper.pipeline import ImportPipeline, DEFAULT_BATCH_SIZE, DEFAULT_QUEUE_SIZE
+from scraper.records import ObservationBatch
+from scraper.checkpoints import ImportCheckpoint, batch_fingerprint
+from scraper.metrics import RunMetrics
+from scraper.logconfig import run_context
+from scraper.replay import ReplayServer
+from scraper.incremental import IncrementalPlan, RefreshState
+from scraper.geo_cache import geo_area_defaults, resolve_geo_pks
+from scraper.checkpoints import dataset_key
+from scraper.scheduling import RunLock, RunLockHeld
+from scraper.changes import ChangeLog, diff_observations
+from scraper.resources import ResourceLimitExceeded, ResourceMonitor
+from scraper.store import gdp_dataset_code, load_batch
+from scraper.sharding import DEFAULT_FACET, FACET_PARAMS, ShardedScraper, ShardMergeError
+from scraper.validation import ValidationFailed, load_history, validate_batch
+from eurostat_manager import settings
+from contextlib import nullcontext
+from functools import cached_property
 import logging
+import time
 from django.db import transaction
 
 logger = logging.getLogger(__name__)
@@ -13,8 +32,16 @@ class Command(BaseCommand):
     1. Extracts data using the EurostatScraper
     2. Transforms the raw scraped data
     3. Loads it into normalized database tables (GeoArea and GDPData)
+       and into the generic observation store (Dataset/Series/Observation)
     """
     help = 'Scrapes and imports GDP data from Eurostat into normalized database structure'
+    geo_pks = None  # {code: GeoArea pk} of areas known to be up to date (geo cache hit)
+    resource_monitor = None  # ResourceMonitor of the running import, checked between regions
+
+    @cached_property
+    def change_log(self):
+        """ChangeLog receiving every inserted or revised observation"""
+        return ChangeLog()
 
     def add_arguments(self, parser):
         """
@@ -25,6 +52,20 @@ class Command(BaseCommand):
             
         Adds:
             --no-headless: Flag to run browser in visible mode (disabled headless mode)
+            --pipelined: Import rows in a background thread while the browser is still extracting
+            --queue-size: Maximum rows buffered between extraction and import (pipelined mode)
+            --batch-size: Rows written per import transaction (pipelined mode)
+            --chunk-size: Commit the import every N regions and checkpoint completed chunks
+            --no-resume: Ignore existing extraction/import checkpoints and start from scratch
+            --metrics-dir: Directory for the JSON run record and Prometheus textfile
+            --record: Record the rendered page and timings of this run into a directory
+            --replay: Scrape a recording (or the inspector/ snapshots) from a local HTTP stand-in
+            --replay-realtime: Delay the replayed page like the recorded run
+            --incremental: Only scrape the newest years and provisional/estimated cells
+            --url: Dataset page to scrape instead of EUROSTAT_CONFIG["BASE_URL"]
+            --skip-validation: Import without running the data-quality checks
+            --shards: Split the dataset into N filtered pages scraped by parallel browsers
+            --shard-by: Facet the shards are split by (geo or time)
         """
         parser.add_argument(
             '--no-headless',
@@ -32,6 +73,82 @@ class Command(BaseCommand):
             dest='headless',
             help='Run browser in visible mode (not headless)',
         )
+        parser.add_argument(
+            '--pipelined',
+            action='store_true',
+            help='Overlap browser extraction and database import through a bounded queue',
+        )
+        parser.add_argument(
+            '--queue-size',
+            type=int,
+            default=DEFAULT_QUEUE_SIZE,
+            help=f'Maximum rows buffered between extraction and import (default: {DEFAULT_QUEUE_SIZE})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows written per import transaction in pipelined mode (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Commit the import every N regions; a killed run resumes from the last committed chunk',
+        )
+        parser.add_argument(
+            '--no-resume',
+            action='store_false',
+            dest='resume',
+            help='Ignore existing checkpoints: scrape every row and import every chunk again',
+        )
+        parser.add_argument(
+            '--metrics-dir',
+            default=None,
+            help='Directory for run metrics (default: EUROSTAT_CONFIG["METRICS_DIR"])',
+        )
+        parser.add_argument(
+            '--record',
+            metavar='DIR',
+            help='Record the rendered page and phase timings for offline replay',
+        )
+        parser.add_argument(
+            '--replay',
+            metavar='DIR',
+            help='Scrape a recording (or inspector/ snapshots) served locally instead of the live page',
+        )
+        parser.add_argument(
+            '--replay-realtime',
+            action='store_true',
+            help='Delay the replayed page by its recorded load time',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only scrape volatile cells (newest years, p/e flags); a full scrape still runs '
+                 'every EUROSTAT_CONFIG["FULL_REFRESH_DAYS"] days',
+        )
+        parser.add_argument(
+            '--url',
+            help='Dataset page to scrape (default: EUROSTAT_CONFIG["BASE_URL"])',
+        )
+        parser.add_argument(
+            '--skip-validation',
+            action='store_true',
+            help='Import even if the extracted data fails the data-quality checks',
+        )
+        parser.add_argument(
+            '--shards',
+            type=int,
+            default=settings.EUROSTAT_CONFIG.get('SHARDS', 1),
+            help='Scrape the dataset as N pages filtered by --shard-by, in N parallel browsers (default: 1)',
+        )
+        parser.add_argument(
+            '--shard-by',
+            choices=sorted(FACET_PARAMS),
+            default=DEFAULT_FACET,
+            help=f'Facet the shards are split by, through data browser URL parameters (default: {DEFAULT_FACET})',
+        )
 
     def handle(self, *args, **options):
         """
@@ -43,45 +160,230 @@ class Command(BaseCommand):
             
         Process Flow:
         1. Initialize scraper (with context manager for proper cleanup)
-        2. Extract geographic metadata
-        3. Extract GDP values
-        4. Import all data to database
-        5. Handle errors and report results
+        2. Extract geographic metadata, years and GDP values in a single grid pass
+        3. Import all data to database
+        4. Handle errors and report results
         """
+        mode = "pipelined" if options.get('pipelined') else "sequential"
+        start = time.perf_counter()
+        url = options.get('url') or settings.EUROSTAT_CONFIG['BASE_URL']
+        dataset = dataset_key(url) if url else gdp_dataset_code()
+        # GeoArea/GDPData hold the GDP dataset only; any other dataset lives in the observation store
+        gdp_tables = dataset == gdp_dataset_code()
+        metrics = RunMetrics(dataset=dataset)
+        metrics.extra['mode'] = mode
+        status = "failed"
         try:
-            logger.info("0.Starting Eurostat GDP data import process")
+            logger.info(f"0.Starting Eurostat GDP data import process ({mode} mode)")
             
-            # Using context manager ensures proper scraper cleanup
-            with EurostatScraper(headless=options.get('headless', True)) as scraper:
-                # 1. Extract geographic metadata (region/country names and codes)
-                logger.info("1.Getting geographic metadata")
-                geo_title_dict_list = scraper.extract_table_data()
-                
-                if not geo_title_dict_list:
-                    logger.error("1.1.No geographic metadata could be extracted")
-                    raise Exception("No geographic metadata could be extracted")
+            if not gdp_tables and options.get('pipelined'):
+                raise CommandError(f"--pipelined imports into GDPData, which only holds the GDP dataset "
+                                   f"({gdp_dataset_code()}), not {dataset}")
+            if not gdp_tables and not settings.EUROSTAT_CONFIG.get('OBSERVATION_STORE', True):
+                raise CommandError(f"Dataset {dataset} can only be imported into the observation store, "
+                                   f"which is disabled (EUROSTAT_OBSERVATION_STORE)")
+
+            refresh_state = RefreshState(dataset)
+            plan = self.incremental_plan(refresh_state, dataset, gdp_tables) if options.get('incremental') else None
+            metrics.extra['scrape_mode'] = "incremental" if plan else "full"
+            
+            sharded = options.get('shards', 1) > 1
+            if sharded and (plan or options.get('pipelined') or options.get('replay')):
+                raise CommandError("--shards cannot be combined with --incremental, --pipelined or --replay")
+            
+            replay_dir = options.get('replay')
+            if replay_dir:
+                metrics.extra['replay'] = options['replay']
+            
+            # DB queries of this thread are counted for the run; the pipelined importer and the shard
+            # workers count their own connections and merge them in; every log record carries the run ID
+            # Single flight per dataset: overlapping runs (cron, scheduler, manual) would
+            # start a second browser and fight over the same database
+            with RunLock(dataset), run_context(metrics.run_id), metrics.track_queries(), \
+                    ResourceMonitor(metrics) as monitor, \
+                    (ReplayServer(replay_dir, realtime=options.get('replay_realtime')) if replay_dir else nullcontext()) as replay:
+                self.resource_monitor = monitor
+                if sharded:
+                    # One large dataset as filtered pages in parallel browsers, merged by row-id
+                    scraper_context = ShardedScraper(
+                        url,
+                        options['shards'],
+                        facet=options.get('shard_by', DEFAULT_FACET),
+                        headless=options.get('headless', True),
+                        metrics=metrics,
+                        resume=options.get('resume', True),
+                        monitor=monitor,
+                    )
+                else:
+                    scraper_context = EurostatScraper(
+                        headless=options.get('headless', True),
+                        metrics=metrics,
+                        resume=options.get('resume', True),
+                        base_url=replay.url if replay else url,
+                        record_dir=options.get('record'),
+                        accept_consent=not replay,
+                        plan=plan,
+                        monitor=monitor,
+                    )
+                # Using context manager ensures proper scraper cleanup
+                with scraper_context as scraper:
+                    # 1. Render the grid once; geo metadata, years and cells all come from this pass
+                    logger.info("1.Getting geographic metadata")
+                    if options.get('pipelined'):
+                        with metrics.span('extract_table'):
+                            geo_title_dict_list, years = scraper.load_grid()
+                    else:
+                        with metrics.span('extract_grid'):
+                            geo_title_dict_list, years, batch = scraper.extract_grid()
                 
-                # 2. Extract all GDP values by year for each region
-                logger.info("2.Extracting GDP data")
-                gdp_data = scraper.extract_complete_gdp_data()
+                    if not geo_title_dict_list:
+                        logger.error("1.1.No geographic metadata could be extracted")
+                        raise Exception("No geographic metadata could be extracted")
+                    metrics.extra['years'] = len(years)
+                    metrics.extra['geo_cache_hit'] = scraper.geo_cache_hit
+                    if scraper.geo_cache_hit and gdp_tables:
+                        # Geo areas are unchanged: resolve codes to PKs once and skip their upserts
+                        self.geo_pks = resolve_geo_pks(code for geo in geo_title_dict_list for code in geo)
                 
-                if not gdp_data:
-                    logger.error("2.1.No GDP data could be extracted")
-                    raise Exception("No GDP data could be extracted")
+                    if options.get('pipelined'):
+                        # 2-3. Stream GDP rows into the importer thread while extraction continues
+                        logger.info("2.Extracting and importing GDP data (pipelined)")
+                        if not options.get('skip_validation'):
+                            logger.warning("2.2.Data-quality validation needs the whole batch before importing; "
+                                           "not run in pipelined mode")
+                        with metrics.span('extract_and_import'), monitor.trace_allocations('extract_and_import'):
+                            batch = self.import_pipelined(
+                                geo_title_dict_list,
+                                scraper.iter_gdp_rows(),
+                                queue_size=options['queue_size'],
+                                batch_size=options['batch_size'],
+                                metrics=metrics,
+                            )
+                    else:
+                        # 2. GDP values by year for each region were read in the same pass
+                        if not len(batch):
+                            logger.error("2.1.No GDP data could be extracted")
+                            raise Exception("No GDP data could be extracted")
+                    
+                        # 2.2. Data-quality checks over the whole batch; a failure blocks the import
+                        if options.get('skip_validation'):
+                            logger.warning("2.2.Data-quality validation skipped (--skip-validation)")
+                        else:
+                            logger.info("2.2.Validating extracted data")
+                            try:
+                                with metrics.span('validate'):
+                                    self.validate(batch, years, metrics, dataset, incremental=plan is not None)
+                            except ValidationFailed:
+                                # Do not resume from rows that failed validation: the next run scrapes again
+                                scraper.clear_checkpoint()
+                                raise
+                    
+                        # 3. Process and import all data in a transaction
+                        if gdp_tables:
+                            logger.info("3.Importing data to database")
+                            with metrics.span('import'), monitor.trace_allocations('import'):
+                                self.import_observations(
+                                    batch,
+                                    chunk_size=options.get('chunk_size'),
+                                    resume=options.get('resume', True),
+                                )
+                        else:
+                            logger.info(f"3.Dataset {dataset} is not the GDP dataset ({gdp_dataset_code()}): "
+                                        f"importing into the observation store only")
+                        metrics.extra['observations'] = len(batch)
                 
-                # 3. Process and import all data in a transaction
-                logger.info("3.Importing data to database")
-                self.import_data(geo_title_dict_list, gdp_data)
+                    if not gdp_tables or settings.EUROSTAT_CONFIG.get('OBSERVATION_STORE', True):
+                        # 3.5. Same observations into the generic store, dictionary-encoded and bulk upserted
+                        logger.info("3.5.Loading the observation store")
+                        with metrics.span('store'):
+                            metrics.extra['store'] = load_batch(batch, dataset, source_url=url)
                 
-                logger.info(f"3.1.GDP data import completed successfully. Imported data for {len(geo_title_dict_list)} regions/countries")
+                    # Extracted rows are in the database now, the extraction checkpoint is no longer needed
+                    scraper.clear_checkpoint()
+                    scraper.save_geo_cache()
+                    if plan is None:
+                        refresh_state.mark_full_refresh()
+                    logger.info(f"3.1.GDP data import completed successfully. Imported data for {len(geo_title_dict_list)} regions/countries")
+                status = "success"
                 
+        except ResourceLimitExceeded as e:
+            status = "aborted"
+            logger.error(f"3.3.Run aborted: {e}")
+            raise CommandError(str(e))
+        except ValidationFailed as e:
+            status = "rejected"
+            logger.error(f"2.3.Import blocked: {e}")
+            raise CommandError(f"{e} (use --skip-validation to import anyway)")
+        except ShardMergeError as e:
+            logger.error(f"1.2.Shards could not be merged: {e}")
+            raise CommandError(f"Shards could not be merged: {e}")
+        except RunLockHeld as e:
+            status = "skipped"
+            logger.warning(f"0.1.{e}")
+            raise CommandError(str(e))
         except Exception as e:
             logger.error(f"3.3.Error in GDP data import: {str(e)}", exc_info=True)
             raise  # Re-raise exception for Django to handle exit code
+        finally:
+            # End-to-end latency, comparable between sequential and pipelined runs
+            logger.info(f"3.2.End-to-end time ({mode} mode): {time.perf_counter() - start:.2f}s")
+            metrics.finish(status)
+            logger.info(f"3.4.Run {metrics.run_id} phases: {metrics.summary()}")
+            try:
+                metrics.write(options.get('metrics_dir'))
+            except OSError as e:
+                logger.warning(f"Could not write run metrics: {e}")
+            if 'change_log' in self.__dict__:
+                self.change_log.close()
+
+    def incremental_plan(self, refresh_state, dataset, gdp_tables=True):
+        """
+        Decide between an incremental and a full scrape
+        Args:
+            refresh_state (RefreshState): Time of the last full scrape of the dataset
+            dataset (str): Dataset key (see checkpoints.dataset_key)
+            gdp_tables (bool): Dataset stored in GDPData; other datasets are planned from the observation store
+        Returns:
+            IncrementalPlan: Cells to scrape, or None when a full scrape is needed
+        """
+        if refresh_state.full_refresh_due():
+            logger.info("Full refresh due (no full scrape within FULL_REFRESH_DAYS): scraping every cell")
+            return None
+        plan = IncrementalPlan.from_db() if gdp_tables else IncrementalPlan.from_store(dataset)
+        if plan is None:
+            logger.info(f"No data of {dataset} stored yet: scraping every cell")
+            return None
+        logger.info(f"Incremental scrape: {plan!r}")
+        return plan
+
+    def validate(self, batch, years, metrics, dataset=None, incremental=False):
+        """
+        Run the data-quality checks over an extracted batch
+        Args:
+            batch (ObservationBatch): Extracted observations
+            years (list): Year columns of the grid
+            metrics (RunMetrics): Run record receiving the report
+            dataset (str): Dataset key, so the batch is only compared with its own history
+            incremental (bool): Batch of an incremental scrape (coverage and flag drift checks skipped)
+        Raises:
+            ValidationFailed: When a check exceeds its threshold
+        """
+        start = time.perf_counter()
+        history = load_history(batch.geo_codes, dataset)
+        history_seconds = time.perf_counter() - start
+        report = validate_batch(batch, years, history=history, incremental=incremental)
+        report.history_seconds = history_seconds
+        metrics.extra['validation'] = report.as_dict()
+        for check in report.checks:
+            if not check['passed']:
+                logger.error(f"2.2.1.Check {check['check']} failed: {check}")
+        if not report.passed:
+            raise ValidationFailed(report)
+        logger.info(f"2.2.1.Validation {report.summary()}, history loaded in {history_seconds * 1000:.1f} ms")
 
     def import_data(self, geo_dicts, gdp_data):
         """
-        Import scraped data into database within a transaction.
+        Import scraped data in the legacy nested-dict format.
         
         Args:
             geo_dicts (list): List of dictionaries containing geographic metadata
@@ -89,79 +391,207 @@ class Command(BaseCommand):
             gdp_data (dict): Nested dictionary containing GDP values by region and year
                             Format: {'row_id': {'year': {'value': x, 'flag': y, 'is_available': z}}}
                             
-        Process:
-        - Wraps all database operations in a single transaction
-        - Processes each geographic area sequentially
-        - Handles errors per region without failing entire import
-        """
-        with transaction.atomic():  # All or nothing transaction
-            processed = 0  # Counter for successfully processed regions
-
-            # Each geo_dict is a single-item dict like {'CODE': 'Description'}
-            for geo_dict in geo_dicts:
-                # Extract the single key-value pair from each dictionary
-                for row_id, geo_info in geo_dict.items():
-                    try:
-                        self.process_geo_area(row_id, geo_info, gdp_data.get(row_id, {}))
-                        processed += 1
-                    except Exception as e:
-                        # Log error but continue with next region
-                        logger.error(f"Error processing area {row_id}: {str(e)}", exc_info=True)
-                        continue
+        Adapter around import_observations: the dictionaries are converted into
+        an ObservationBatch first (unavailable cells are dropped, as the scraper does).
+        """
+        self.import_observations(ObservationBatch.from_legacy(geo_dicts, gdp_data))
 
+    def import_observations(self, batch, chunk_size=None, resume=True):
+        """
+        Import an ObservationBatch into database.
+        
+        Args:
+            batch (ObservationBatch): Geo areas and their observations
+            chunk_size (int): Regions per transaction; None imports everything in one transaction
+            resume (bool): Skip chunks recorded in a matching checkpoint (chunked mode only)
+                            
+        Process:
+        - Without chunk_size, wraps all database operations in a single transaction
+        - With chunk_size, commits every chunk_size regions and records each committed
+          chunk in an ImportCheckpoint, so a crashed or killed run resumes where it stopped
+        - Each region runs inside its own savepoint, so a database error rolls back
+          only that region instead of poisoning the surrounding transaction
+        """
+        if not chunk_size:
+            with transaction.atomic():  # All or nothing transaction
+                processed = sum(self._process_with_savepoint(*geo) for geo in batch.iter_geos())
             logger.info(f"Successfully processed {processed} geographic areas")
+            return
+
+        checkpoint = ImportCheckpoint(batch_fingerprint(batch, chunk_size))
+        completed = checkpoint.load() if resume else set()
+        processed = 0
+        skipped = 0
+        for chunk_index, chunk in enumerate(_chunks(batch.iter_geos(), chunk_size)):
+            if chunk_index in completed:
+                skipped += len(chunk)
+                continue
+            with transaction.atomic():  # One transaction per chunk keeps write locks short
+                processed += sum(self._process_with_savepoint(*geo) for geo in chunk)
+            checkpoint.mark_done(chunk_index)  # Only reached once the chunk is committed
+            logger.debug(f"Committed import chunk {chunk_index} ({len(chunk)} regions)")
+
+        checkpoint.clear()
+        logger.info(f"Successfully processed {processed} geographic areas ({skipped} skipped from checkpoint)")
+
+    def _process_with_savepoint(self, code, name, observations):
+        """
+        Process one region inside a savepoint
+        
+        Returns:
+            int: 1 if the region was imported, 0 if it failed (error is logged)
+        """
+        if self.resource_monitor:
+            self.resource_monitor.raise_if_exceeded()  # Outside the savepoint: aborts the whole import
+        try:
+            with transaction.atomic():  # Savepoint: a failure only rolls back this region
+                self.process_geo_observations(code, name, observations)
+            return 1
+        except Exception as e:
+            # Log error but continue with next region
+            logger.error(f"Error processing area {code}: {str(e)}", exc_info=True)
+            return 0
+
+    def import_pipelined(self, geo_dicts, rows, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                         metrics=None):
+        """
+        Import GDP rows while they are still being extracted.
+        
+        Args:
+            geo_dicts (list): List of dictionaries containing geographic metadata
+                            Format: [{'CODE1': 'Description1'}, {'CODE2': 'Description2'}, ...]
+            rows (iterable): Stream of (row_id, year_data) tuples, e.g. EurostatScraper.iter_gdp_rows()
+            queue_size (int): Maximum rows buffered between extraction and import
+            batch_size (int): Rows written per import transaction
+            metrics (RunMetrics): Run metrics receiving the DB queries of the importer thread
+        
+        Returns:
+            ObservationBatch: Every imported row, for the observation store
+            
+        Process:
+        - Rows flow through a bounded queue to an importer thread (back-pressure keeps memory flat)
+        - Each batch is written in its own transaction
+        - Regions without any GDP row are created at the end, as in import_data
+        """
+        geo_names = {row_id: geo_info for geo_dict in geo_dicts for row_id, geo_info in geo_dict.items()}
+        seen = set()
+        imported = ObservationBatch()
+        for row_id, geo_info in geo_names.items():
+            imported.add_geo(row_id, geo_info)
+        
+        def import_batch(batch):
+            with transaction.atomic():
+                for row_id, year_data in batch:
+                    self._process_with_savepoint(row_id, geo_names[row_id], _legacy_observations(year_data))
+        
+        with ImportPipeline(import_batch, queue_size=queue_size, batch_size=batch_size, metrics=metrics) as pipeline:
+            for row_id, year_data in rows:
+                # Same rule as import_data: rows of geo areas missing from the headers are skipped
+                if not imported.add_listed_row(row_id, year_data):
+                    continue
+                seen.add(row_id)
+                pipeline.put((row_id, year_data))
+        
+        if not seen:
+            raise Exception("No GDP data could be extracted")
+        
+        # Regions present in the headers but without data rows
+        missing = [(row_id, {}) for row_id in geo_names if row_id not in seen]
+        if missing:
+            import_batch(missing)
+        
+        logger.info(f"Successfully processed {len(seen) + len(missing)} geographic areas")
+        return imported
 
     def process_geo_area(self, row_id, geo_name, year_data):
         """
-        Process a single geographic area and its GDP data across years.
+        Process a single geographic area given its data in the legacy dict format.
         
         Args:
             row_id (str): Unique identifier for the geographic area (e.g. 'AT' for Austria)
             geo_name (str): Descriptive name of the geographic area
             year_data (dict): GDP data for this area by year
                             Format: {'year': {'value': x, 'flag': y, 'is_available': z}}
+        """
+        self.process_geo_observations(row_id, geo_name, _legacy_observations(year_data))
+
+    def process_geo_observations(self, row_id, geo_name, observations):
+        """
+        Process a single geographic area and its GDP data across years.
+        
+        Args:
+            row_id (str): Unique identifier for the geographic area (e.g. 'AT' for Austria)
+            geo_name (str): Descriptive name of the geographic area
+            observations (list): Available GDP values for this area
+                            Format: [(year, value, flag), ...] with year as int
                             
         1. GeoArea Handling:
+           - Skipped when the area's PK is known from the geo cache (self.geo_pks)
            - Uses update_or_create to handle both new and existing regions
            - Sets special flags based on name content (EU, Euro area, Kosovo)
            - Handles Kosovo naming convention with UN resolution note
            
         2. GDPData Handling:
-           - Processes each year's data separately
-           - Uses update_or_create to maintain historical data
-           - Converts year strings to integers
+           - Reads the stored observations of the area with a single query
+           - Uses update_or_create for new and revised observations only
            - Preserves all metadata (flags, availability)
+           
+        3. Change log:
+           - Every inserted or revised observation is recorded in GDPChange
+             (see scraper.changes), in the same transaction
         """
-        # Create or update geographic area with special flags
-        geo_area, created = GeoArea.objects.update_or_create(
-            code=row_id,
-            defaults={
-                'name': geo_name,
-                'is_kosovo': 'Kosovo' in geo_name,  # Special Kosovo handling
-                'is_eu': 'European Union' in geo_name,
-                'is_euro_area': 'Euro area' in geo_name,
-                'notes': 'UNSCR 1244/1999' if 'Kosovo*' in geo_name else None  # UN resolution note
-            }
-        )
+        geo_area_id = self.geo_pks.get(row_id) if self.geo_pks else None
+        if geo_area_id is None:
+            # Create or update geographic area with special flags
+            geo_area, created = GeoArea.objects.update_or_create(code=row_id, defaults=geo_area_defaults(geo_name))
+            geo_area_id = geo_area.pk
+            action = "Created" if created else "Updated"
+            logger.debug(f"{action} geographic area: {row_id} - {geo_name}")
         
-        action = "Created" if created else "Updated"
-        logger.debug(f"{action} geographic area: {row_id} - {geo_name}")
+        existing = {
+            year: (value, flag, is_available)
+            for year, value, flag, is_available in GDPData.objects.filter(geo_area_id=geo_area_id)
+            .values_list('year', 'value', 'flag', 'is_available')
+        }
+        changes = diff_observations(row_id, existing, observations)
         
-        # Process each year's GDP data for this region
-        year_count = 0
-        for year, value_info in year_data.items():
+        # Write only the new and revised years of this region
+        written = []
+        for change in changes:
             try:
                 GDPData.objects.update_or_create(
-                    geo_area=geo_area,
-                    year=int(year),  # Convert year string to integer
+                    geo_area_id=geo_area_id,
+                    year=change.year,
                     defaults={
-                        'value': value_info['value'],
-                        'flag': value_info['flag'],
-                        'is_available': value_info['is_available']
+                        'value': change.new_value,
+                        'flag': change.new_flag,
+                        'is_available': True  # Only available cells are extracted
                     }
                 )
-                year_count += 1
+                written.append(change)
             except Exception as e:
-                logger.warning(f"Error processing year {year} for area {row_id}: {str(e)}")
+                logger.warning(f"Error processing year {change.year} for area {row_id}: {str(e)}")
+        self.change_log.record(written)
         
-        logger.debug(f"Processed {year_count} years for area {row_id}")
\ No newline at end of file
+        logger.debug(f"Processed {len(observations)} years for area {row_id} ({len(written)} changed)")
+
+
+def _legacy_observations(year_data):
+    """Convert {'year': {'value', 'flag', 'is_available'}} into [(year, value, flag), ...]"""
+    return [
+        (int(year), value_info['value'], value_info['flag'])
+        for year, value_info in year_data.items()
+        if value_info['is_available']
+    ]
+
+
+def _chunks(items, size):
+    """Split an iterable into lists of at most size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
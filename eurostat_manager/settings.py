@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 # settings.py
 import os
+import sys
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()  # Load environment variables from .env file
@@ -20,6 +22,51 @@ load_dotenv()  # Load environment variables from .env file
 # Eurostat configuration
 EUROSTAT_CONFIG = {
     'BASE_URL': os.getenv('EUROSTAT_BASE_URL'),
+    # Directory for import/extraction checkpoints used to resume interrupted runs
+    'CHECKPOINT_DIR': os.getenv('EUROSTAT_CHECKPOINT_DIR', 'checkpoints'),
+    # Directory for per-run JSON records and the Prometheus textfiles (eurostat_scrape_<dataset>.prom)
+    'METRICS_DIR': os.getenv('EUROSTAT_METRICS_DIR', 'metrics'),
+    # Screenshots: 'off', 'error' (failures only) or 'info' (also progress snapshots)
+    'SCREENSHOT_LEVEL': os.getenv('EUROSTAT_SCREENSHOT_LEVEL', 'error'),
+    'SCREENSHOT_DIR': os.getenv('EUROSTAT_SCREENSHOT_DIR', 'screenshots'),
+    'SCREENSHOT_KEEP': int(os.getenv('EUROSTAT_SCREENSHOT_KEEP', '10')),  # Ring size, oldest deleted first
+    # Incremental scrapes (--incremental) fall back to a full scrape after this many days
+    'FULL_REFRESH_DAYS': int(os.getenv('EUROSTAT_FULL_REFRESH_DAYS', '30')),
+    # Datasets scraped together in one browser (multi-tab mode): "name=url;name=url"
+    'DATASETS': dict(
+        item.strip().split('=', 1) for item in os.getenv('EUROSTAT_DATASETS', '').split(';') if '=' in item
+    ),
+    # Tabs loading concurrently in multi-tab mode
+    'TABS': int(os.getenv('EUROSTAT_TABS', '4')),
+    # Scheduler (schedule_scrapes): interval per dataset, overrides as "name=minutes;name=minutes", random delay
+    'SCHEDULE_INTERVAL_MINUTES': float(os.getenv('EUROSTAT_SCHEDULE_INTERVAL_MINUTES', '1440')),
+    'SCHEDULE_INTERVALS': dict(
+        item.strip().split('=', 1) for item in os.getenv('EUROSTAT_SCHEDULE_INTERVALS', '').split(';') if '=' in item
+    ),
+    'SCHEDULE_JITTER_MINUTES': float(os.getenv('EUROSTAT_SCHEDULE_JITTER_MINUTES', '30')),
+    # Change log: besides the GDPChange table, append committed changes to this NDJSON file (empty: off)
+    'CHANGE_LOG_FILE': os.getenv('EUROSTAT_CHANGE_LOG_FILE', ''),
+    'CHANGE_LOG_MAX_BYTES': int(os.getenv('EUROSTAT_CHANGE_LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+    'CHANGE_LOG_BACKUPS': int(os.getenv('EUROSTAT_CHANGE_LOG_BACKUPS', '5')),
+    # Resource monitor: sampling interval, tracemalloc of the import phase, RSS limits aborting a run (0: none)
+    'RESOURCE_SAMPLE_SECONDS': float(os.getenv('EUROSTAT_RESOURCE_SAMPLE_SECONDS', '1')),
+    'TRACE_ALLOCATIONS': os.getenv('EUROSTAT_TRACE_ALLOCATIONS', '0') == '1',  # tracemalloc slows the import ~3x
+    'MAX_PYTHON_RSS_MB': float(os.getenv('EUROSTAT_MAX_PYTHON_RSS_MB', '0')),
+    'MAX_BROWSER_RSS_MB': float(os.getenv('EUROSTAT_MAX_BROWSER_RSS_MB', '0')),
+    # Chrome profile kept between runs (consent cookie, local storage, cache; empty: throwaway profile)
+    'BROWSER_PROFILE_DIR': os.getenv('EUROSTAT_BROWSER_PROFILE_DIR', 'browser_profile'),
+    # Cookie whose presence means the consent banner was already accepted in that profile
+    'CONSENT_COOKIE': os.getenv('EUROSTAT_CONSENT_COOKIE', 'cck1'),
+    # Generic observation store (Dataset/Series/Observation) loaded after every import, upsert batch size
+    'OBSERVATION_STORE': os.getenv('EUROSTAT_OBSERVATION_STORE', '1') == '1',
+    'STORE_BATCH_SIZE': int(os.getenv('EUROSTAT_STORE_BATCH_SIZE', '5000')),
+    # Data-quality checks blocking the import, threshold overrides as "name=value;name=value"
+    # (see scraper.validation.DEFAULT_THRESHOLDS)
+    'VALIDATION_THRESHOLDS': dict(
+        item.strip().split('=', 1) for item in os.getenv('EUROSTAT_VALIDATION_THRESHOLDS', '').split(';') if '=' in item
+    ),
+    # Default number of shards (parallel browsers) of scrape_eurostat for one dataset
+    'SHARDS': int(os.getenv('EUROSTAT_SHARDS', '1')),
     # You can add other Eurostat-related settings here
 }
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -133,3 +180,51 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+# Scraper and command loggers write through a QueueHandler: the scraping thread only
+# enqueues records, a QueueListener thread formats them and does the console/file I/O.
+# Per-row debug events (extra={'sample': ...}) are sampled, 1 in EUROSTAT_LOG_SAMPLE.
+
+# Test runs log to a temporary directory, never to the project's logs/
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+LOG_DIR = os.path.join(tempfile.gettempdir(), 'eurostat_test_logs') if TESTING else os.getenv('EUROSTAT_LOG_DIR', 'logs')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'run_id': {'()': 'scraper.logconfig.RunIdFilter'},
+        'sample': {'()': 'scraper.logconfig.SampleFilter', 'rate': int(os.getenv('EUROSTAT_LOG_SAMPLE', '100'))},
+    },
+    'formatters': {
+        'json': {'()': 'scraper.logconfig.JsonFormatter'},
+        'console': {'format': '%(asctime)s - %(name)s - %(levelname)s - [%(run_id)s] %(message)s'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'level': 'INFO',
+            'formatter': 'console',
+        },
+        'file': {
+            'class': 'scraper.logconfig.LazyRotatingFileHandler',
+            'level': 'DEBUG',
+            'formatter': 'json',
+            'filename': os.path.join(LOG_DIR, 'scraper.log'),
+            'maxBytes': 5 * 1024 * 1024,  # 5 MB per file, 3 backups
+            'backupCount': 3,
+        },
+        'queue': {
+            'class': 'logging.handlers.QueueHandler',
+            'filters': ['run_id', 'sample'],
+            'handlers': ['console', 'file'],
+            'respect_handler_level': True,
+        },
+    },
+    'loggers': {
+        'scraper': {'handlers': ['queue'], 'level': 'DEBUG', 'propagate': False},
+        'eurostat_manager': {'handlers': ['queue'], 'level': 'DEBUG', 'propagate': False},
+    },
+}
@@ -17,6 +17,9 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 
+from scraper import views as scraper_views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/geo/lookup/', scraper_views.geo_lookup, name='geo_lookup'),
 ]
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from scraper.models import GDPData, GeoArea
+from scraper.models import Dataset, Dimension, GDPChange, GDPData, GDPObservation, GeoArea
+from scraper.search import filter_geo_areas
 
 @admin.register(GeoArea)
 class GeoAreaAdmin(admin.ModelAdmin):
@@ -18,11 +19,20 @@ class GeoAreaAdmin(admin.ModelAdmin):
     list_display = ('code', 'name', 'is_kosovo', 'is_eu', 'is_euro_area')    
     # Filter options (right sidebar filters)
     list_filter = ('is_kosovo', 'is_eu', 'is_euro_area')    
-    # Searchable fields (search box functionality)
+    # Search box enabled; matching goes through the geo search index (see get_search_results)
     search_fields = ('code', 'name')    
     # Default sorting order
     ordering = ('code',)
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Word-prefix search over folded codes, names and notes (FTS5 / pg_trgm) instead of
+        icontains scans; every match is kept, the changelist paginates them
+        """
+        if not search_term.strip():
+            return queryset, False
+        return filter_geo_areas(queryset, search_term), False
+
 @admin.register(GDPData)
 class GDPDataAdmin(admin.ModelAdmin):
     """
@@ -43,4 +53,70 @@ class GDPDataAdmin(admin.ModelAdmin):
     # Search configuration (includes related GeoArea fields)
     search_fields = ('geo_area__code', 'geo_area__name', 'year')    
     # Default sorting - by geographic code then chronologically
-    ordering = ('geo_area__code', 'year')
\ No newline at end of file
+    ordering = ('geo_area__code', 'year')
+
+@admin.register(GDPChange)
+class GDPChangeAdmin(admin.ModelAdmin):
+    """
+    Read-only admin view of the GDP change log.
+    
+    The log is append-only and written by the importer, so rows can be
+    browsed and filtered but not added, edited or deleted here.
+    """
+    # Fields to display in the list view
+    list_display = ('id', 'kind', 'geo_code', 'year', 'old_value', 'old_flag', 'new_value', 'new_flag', 'run_id', 'created_at')
+    # Filter options by change kind
+    list_filter = ('kind',)
+    # Search by area code or run
+    search_fields = ('geo_code', 'run_id')
+    # Newest changes first
+    ordering = ('-id',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+class DimensionInline(admin.TabularInline):
+    """Dimensions of a dataset, in series key order"""
+    model = Dimension
+    extra = 0
+
+@admin.register(Dataset)
+class DatasetAdmin(admin.ModelAdmin):
+    """
+    Admin interface configuration for the datasets of the generic observation store.
+    
+    Observations are bulk loaded by the importer (see scraper.store), so only
+    dataset metadata and dimensions are edited here.
+    """
+    # Fields to display in the list view
+    list_display = ('code', 'title', 'unit', 'frequency', 'updated_at')
+    # Search by code or title
+    search_fields = ('code', 'title')
+    inlines = [DimensionInline]
+
+@admin.register(GDPObservation)
+class GDPObservationAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the GDP dataset in the generic store, shown like GDPData.
+    """
+    # Fields to display in the list view
+    list_display = ('geo_code', 'year', 'value_text', 'flag_letters')
+    # Search by geo code (series key) or year
+    search_fields = ('series__key', 'period')
+    # Default sorting - by geographic code then chronologically
+    ordering = ('series__key', 'period')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
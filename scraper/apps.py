@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ScraperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scraper'
+
+    def ready(self):
+        # Logging is configured from settings.LOGGING; start its queue listener thread
+        from .logconfig import start_queue_listeners
+        start_queue_listeners()
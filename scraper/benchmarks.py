@@ -0,0 +1,634 @@
+import json
+import logging
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.conf import settings as django_settings
+from django.db import connection
+from django.db.models import FloatField, Q, Sum
+from django.db.models.functions import Cast
+
+from .matrix import GDPMatrix
+from .models import Dataset, GDPData, GeoArea, Observation
+from .pivot import build_wide_table
+from .records import ObservationBatch
+from .eurostat_scraper import EurostatScraper
+from .parsing import find_mismatches, fuzz_corpus, parse_cells
+from .search import search_backend, search_geo_area_ids
+from .store import load_batch
+from .validation import load_history, validate_batch
+from .html_extract import extract_geo_titles_from_html, extract_rows_from_html, extract_years_from_html
+
+logger = logging.getLogger(__name__)
+
+# Synthetic table sizes (number of geo areas) used when none are given
+DEFAULT_GEO_SIZES = (100, 1000)
+DEFAULT_YEARS = 50
+FIRST_YEAR = 1975
+DEFAULT_CELLS = 1_000_000  # Synthetic cells for the parsing suite
+SEARCH_QUERIES = 200  # Prefix lookups per size in the search suite
+# Syllables of synthetic multilingual region names (accents exercise the folding)
+NAME_SYLLABLES = ('bru', 'xel', 'les', 'mün', 'chen', 'bé', 'ziers', 'ło', 'dź', 'ša', 'ba', 'ñe',
+                  'val', 'čes', 'ké', 'ost', 'ró', 'ma', 'gal', 'ícia', 'nord', 'sü', 'den', 'île')
+
+# Saved grid snapshots used by the offline extraction suite (fixture -> extractor)
+HTML_FIXTURES = {
+    'gdp-grid-values.html': extract_rows_from_html,
+    'geo-hs-gdp-values.html': extract_rows_from_html,
+    'geo-headers.html': extract_geo_titles_from_html,
+    'index-time-headers.html': extract_years_from_html,
+}
+
+
+class BenchmarkCheckFailed(RuntimeError):
+    """A benchmark produced wrong results; its timings are meaningless"""
+
+
+# Regression detection: relative slowdown tolerated, and absolute noise floor
+DEFAULT_THRESHOLD = 0.10
+MIN_REGRESSION_SECONDS = 0.001
+
+
+class BenchmarkConfig:
+    """
+    Parameters shared by all benchmark suites.
+
+    Key Attributes:
+    - geo_sizes: synthetic table sizes (number of geo areas)
+    - n_years: number of years per synthetic geo area
+    - repeat: runs per measurement (best one is kept)
+    - cells: number of synthetic cells for the parsing suite
+    """
+
+    def __init__(self, geo_sizes=DEFAULT_GEO_SIZES, n_years=DEFAULT_YEARS, repeat=3, cells=DEFAULT_CELLS):
+        self.geo_sizes = tuple(geo_sizes)
+        self.n_years = n_years
+        self.repeat = repeat
+        self.cells = cells
+
+
+@contextmanager
+def isolated_database():
+    """
+    Run benchmarks against a throwaway test database instead of the project one.
+    Uses Django's test database machinery, so synthetic rows never touch db.sqlite3.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def timed(func, repeat=3):
+    """
+    Time a callable and keep the best of several runs
+    Args:
+        func (callable): Function without arguments to time
+        repeat (int): Number of runs
+    Returns:
+        tuple: (best time in seconds, result of the last call)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def populate_synthetic(n_geos, n_years=DEFAULT_YEARS, seed=42):
+    """
+    Fill GeoArea/GDPData with a synthetic table of n_geos × n_years
+    Args:
+        n_geos (int): Number of geographic areas
+        n_years (int): Number of consecutive years starting at FIRST_YEAR
+        seed (int): Random seed for reproducible values and flags
+    Returns:
+        list: Years created
+    """
+    rng = random.Random(seed)
+    GDPData.objects.all().delete()
+    GeoArea.objects.all().delete()
+    geo_areas = GeoArea.objects.bulk_create(
+        GeoArea(code=f"G{i:05d}", name=f"Synthetic area {i}") for i in range(n_geos)
+    )
+    years = list(range(FIRST_YEAR, FIRST_YEAR + n_years))
+    flags = [None] * 7 + ['b', 'p', 'e']
+    GDPData.objects.bulk_create(
+        (
+            GDPData(
+                geo_area=geo_area,
+                year=year,
+                value=f"{rng.uniform(1_000, 5_000_000):.1f}",
+                flag=rng.choice(flags),
+                is_available=rng.random() > 0.05,
+            )
+            for geo_area in geo_areas
+            for year in years
+        ),
+        batch_size=5000,
+    )
+    return years
+
+
+def synthetic_scrape(n_geos, n_years=DEFAULT_YEARS, seed=42):
+    """
+    Build synthetic scraper output in the format produced by EurostatScraper
+    Args:
+        n_geos (int): Number of geographic areas
+        n_years (int): Number of consecutive years starting at FIRST_YEAR
+        seed (int): Random seed for reproducible values and flags
+    Returns:
+        tuple: (geo_dicts, gdp_data) as returned by extract_table_data / extract_complete_gdp_data
+    """
+    rng = random.Random(seed)
+    flags = [None] * 7 + ['b', 'p', 'e']
+    geo_dicts = [{f"G{i:05d}": f"Synthetic area {i}"} for i in range(n_geos)]
+    gdp_data = {
+        f"G{i:05d}": {
+            str(year): {'value': f"{rng.uniform(1_000, 5_000_000):.1f}", 'flag': rng.choice(flags), 'is_available': True}
+            for year in range(FIRST_YEAR, FIRST_YEAR + n_years)
+        }
+        for i in range(n_geos)
+    }
+    return geo_dicts, gdp_data
+
+
+def bench_matrix(config):
+    """
+    Compare GDPMatrix against the equivalent ORM queries on synthetic tables
+    Args:
+        config (BenchmarkConfig): Table sizes, years and repetitions
+    Returns:
+        list: One result dict per (size, operation)
+    """
+    n_years, repeat = config.n_years, config.repeat
+    results = []
+    for n_geos in config.geo_sizes:
+        years = populate_synthetic(n_geos, n_years)
+        year = years[-1]
+        available = GDPData.objects.filter(is_available=True)
+
+        build_time, matrix = timed(GDPMatrix.from_db, repeat)
+        with tempfile.TemporaryDirectory() as tmp:
+            matrix.save(tmp)
+            load_time, _ = timed(lambda: GDPMatrix.load(tmp), repeat)
+
+        cases = {
+            'sum_per_year': (
+                lambda: dict(
+                    available.values('year')
+                    .annotate(total=Sum(Cast('value', FloatField())))
+                    .values_list('year', 'total')
+                ),
+                lambda: matrix.aggregate('sum', axis='year'),
+            ),
+            'rank_top10': (
+                lambda: list(
+                    available.filter(year=year)
+                    .annotate(numeric=Cast('value', FloatField()))
+                    .order_by('-numeric')
+                    .values_list('geo_area__code', 'numeric')[:10]
+                ),
+                lambda: matrix.rank(year, limit=10),
+            ),
+            'series_one_geo': (
+                lambda: dict(
+                    available.filter(geo_area__code='G00000').values_list('year', 'value')
+                ),
+                lambda: matrix.series('G00000'),
+            ),
+        }
+
+        results.append({'suite': 'matrix', 'case': 'build_from_db', 'geos': n_geos, 'years': n_years,
+                         'seconds': build_time})
+        results.append({'suite': 'matrix', 'case': 'mmap_load', 'geos': n_geos, 'years': n_years,
+                        'seconds': load_time})
+        for case, (orm_query, matrix_query) in cases.items():
+            orm_time, _ = timed(orm_query, repeat)
+            matrix_time, _ = timed(matrix_query, repeat)
+            results.append({
+                'suite': 'matrix', 'case': case, 'geos': n_geos, 'years': n_years,
+                'seconds': matrix_time, 'orm_seconds': orm_time,
+                'speedup': orm_time / matrix_time if matrix_time else None,
+            })
+        logger.info(f"Matrix benchmark finished for {n_geos} geos")
+    return results
+
+
+def bench_pivot(config):
+    """
+    Measure time and peak memory of the wide pivot export on synthetic tables
+    Args:
+        config (BenchmarkConfig): Table sizes, years and repetitions
+    Returns:
+        list: One result dict per (size, flag mode)
+    """
+    n_years, repeat = config.n_years, config.repeat
+    results = []
+    for n_geos in config.geo_sizes:
+        populate_synthetic(n_geos, n_years)
+        for flag_mode in ('none', 'columns'):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "wide.csv")
+                export = lambda: build_wide_table().write_csv(path, flag_mode=flag_mode)
+                seconds, _ = timed(export, repeat)
+                tracemalloc.start()
+                export()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            results.append({
+                'suite': 'pivot', 'case': f"export_{flag_mode}", 'geos': n_geos, 'years': n_years,
+                'seconds': seconds, 'peak_bytes': peak,
+            })
+    return results
+
+
+def bench_pipeline(config, row_delay=0.02):
+    """
+    Compare end-to-end latency of sequential and pipelined scrape + import.
+    Browser extraction is simulated by a fixed delay per row, so the benchmark
+    shows how much import time the pipeline hides behind extraction.
+    Args:
+        config (BenchmarkConfig): Table sizes, years and repetitions
+        row_delay (float): Simulated extraction time per row in seconds
+    Returns:
+        list: One result dict per (size, mode)
+    """
+    # Imported here: the command module pulls in the browser scraper
+    from eurostat_manager.management.commands.scrape_eurostat import Command
+
+    def extracted_rows(gdp_data):
+        for row_id, year_data in gdp_data.items():
+            time.sleep(row_delay)
+            yield row_id, year_data
+
+    n_years, repeat = config.n_years, config.repeat
+    results = []
+    for n_geos in config.geo_sizes:
+        geo_dicts, gdp_data = synthetic_scrape(n_geos, n_years)
+        command = Command()
+
+        def sequential():
+            command.import_data(geo_dicts, dict(extracted_rows(gdp_data)))
+
+        def pipelined():
+            command.import_pipelined(geo_dicts, extracted_rows(gdp_data))
+
+        for mode, run in (('sequential', sequential), ('pipelined', pipelined)):
+            GDPData.objects.all().delete()
+            GeoArea.objects.all().delete()
+            seconds, _ = timed(run, 1)  # Single run: each run already takes seconds
+            results.append({'suite': 'pipeline', 'case': mode, 'geos': n_geos, 'years': n_years, 'seconds': seconds})
+    return results
+
+
+def bench_records(config):
+    """
+    Compare retained memory of the legacy nested dicts and ObservationBatch
+    Args:
+        config (BenchmarkConfig): Table sizes and years (single run per size)
+    Returns:
+        list: One result dict per (size, representation)
+    """
+    n_years = config.n_years
+    results = []
+    for n_geos in config.geo_sizes:
+        tracemalloc.start()
+        start = time.perf_counter()
+        geo_dicts, gdp_data = synthetic_scrape(n_geos, n_years)
+        legacy_seconds = time.perf_counter() - start
+        legacy_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Build the batch row by row, as the scraper does, then drop the dicts
+        tracemalloc.start()
+        start = time.perf_counter()
+        batch = ObservationBatch()
+        for geo_dict in geo_dicts:
+            for code, name in geo_dict.items():
+                batch.add_geo(code, name)
+        for code in list(gdp_data):
+            batch.add_row(code, gdp_data.pop(code))
+        batch_seconds = time.perf_counter() - start
+        del geo_dicts, gdp_data
+        batch_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.append({'suite': 'records', 'case': 'legacy_dicts', 'geos': n_geos, 'years': n_years,
+                        'seconds': legacy_seconds, 'peak_bytes': legacy_bytes})
+        results.append({'suite': 'records', 'case': 'observation_batch', 'geos': n_geos, 'years': n_years,
+                        'seconds': batch_seconds, 'peak_bytes': batch_bytes, 'observations': len(batch)})
+    return results
+
+
+def synthetic_cells(n_cells, seed=42):
+    """
+    Generate raw cell strings as rendered by the Eurostat grid
+    Args:
+        n_cells (int): Number of strings to generate
+        seed (int): Random seed
+    Returns:
+        list: Strings such as '13 628 365.8', '1 234,5 (p)', ':' or ''
+    """
+    rng = random.Random(seed)
+    templates = ['{}', '{}', '{}', '{} (p)', '{} (e)', '{} (b)', '{} (bp)', '{} u', ':', ': c', '']
+    cells = []
+    for _ in range(n_cells):
+        number = f"{rng.uniform(0, 20_000_000):,.1f}".replace(',', ' ')
+        if rng.random() < 0.1:
+            number = number.replace('.', ',')  # Decimal comma variant
+        cells.append(rng.choice(templates).format(number))
+    return cells
+
+
+def bench_parse(config):
+    """
+    Measure cell parsing (scalar and vectorized) and geo title parsing on synthetic input.
+    The vectorized parser is also checked against the scalar one on a fuzz corpus.
+    Args:
+        config (BenchmarkConfig): Number of cells and repetitions
+    Returns:
+        list: One result dict per parser
+    Raises:
+        BenchmarkCheckFailed: If parse_cells and parse_special_value disagree on the fuzz corpus
+    """
+    cells = synthetic_cells(config.cells)
+    titles = [f"[G{i:05d}] Synthetic area {i}" for i in range(max(config.cells // 10, 1))]
+    parse = EurostatScraper.parse_special_value
+
+    mismatches = find_mismatches(fuzz_corpus(min(config.cells, 100_000)))
+    if mismatches:
+        raise BenchmarkCheckFailed(f"parse_cells differs from parse_special_value: {mismatches[:5]}")
+
+    cell_seconds, _ = timed(lambda: [parse(cell) for cell in cells], config.repeat)
+    batch_seconds, _ = timed(lambda: parse_cells(cells), config.repeat)
+    title_seconds, _ = timed(lambda: EurostatScraper._process_gdp_data(titles), config.repeat)
+    return [
+        {'suite': 'parse', 'case': 'parse_special_value', 'cells': len(cells), 'seconds': cell_seconds},
+        {'suite': 'parse', 'case': 'parse_cells', 'cells': len(cells), 'seconds': batch_seconds,
+         'speedup': cell_seconds / batch_seconds if batch_seconds else None},
+        {'suite': 'parse', 'case': 'process_gdp_data', 'cells': len(titles), 'seconds': title_seconds},
+    ]
+
+
+def bench_extract(config):
+    """
+    Measure offline HTML extraction against the inspector/ grid snapshots
+    Args:
+        config (BenchmarkConfig): Repetitions
+    Returns:
+        list: One result dict per fixture
+    """
+    inspector_dir = os.path.join(django_settings.BASE_DIR, 'inspector')
+    results = []
+    for fixture, extractor in HTML_FIXTURES.items():
+        with open(os.path.join(inspector_dir, fixture), encoding='utf-8') as f:
+            html = f.read()
+        seconds, extracted = timed(lambda: extractor(html), config.repeat)
+        results.append({
+            'suite': 'extract', 'case': fixture.removesuffix('.html'), 'bytes': len(html),
+            'items': len(extracted), 'seconds': seconds,
+        })
+    return results
+
+
+def bench_import(config):
+    """
+    Measure import_data on synthetic tables: first load (inserts) and re-import (updates)
+    Args:
+        config (BenchmarkConfig): Table sizes and years (single run per case)
+    Returns:
+        list: One result dict per (size, case)
+    """
+    # Imported here: the command module pulls in the browser scraper
+    from eurostat_manager.management.commands.scrape_eurostat import Command
+
+    results = []
+    for n_geos in config.geo_sizes:
+        geo_dicts, gdp_data = synthetic_scrape(n_geos, config.n_years)
+        GDPData.objects.all().delete()
+        GeoArea.objects.all().delete()
+        command = Command()
+        for case in ('insert', 'update'):
+            seconds, _ = timed(lambda: command.import_data(geo_dicts, gdp_data), 1)
+            results.append({'suite': 'import', 'case': case, 'geos': n_geos, 'years': config.n_years,
+                            'seconds': seconds})
+    return results
+
+
+def result_key(result):
+    """Identify a result across runs: suite, case and input size"""
+    return (result['suite'], result['case'], result.get('geos'), result.get('years'), result.get('cells'))
+
+
+def write_results(path, results, config):
+    """
+    Write results and run metadata as JSON
+    Args:
+        path (str): Output file
+        results (list): Result dicts returned by the suites
+        config (BenchmarkConfig): Configuration used for the run
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'meta': {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': config.repeat,
+            },
+            'results': results,
+        }, f, indent=2)
+
+
+def load_results(path):
+    """
+    Load a results file written by write_results (or a bare list of results)
+    Args:
+        path (str): Results file
+    Returns:
+        list: Result dicts
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data['results'] if isinstance(data, dict) else data
+
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results against a baseline and flag regressions
+    Args:
+        results (list): Current result dicts
+        baseline (list): Baseline result dicts
+        threshold (float): Relative slowdown tolerated (0.10 = 10%)
+    Returns:
+        list: One dict per matched result with baseline/current seconds, ratio and regression flag
+    """
+    baseline_by_key = {result_key(result): result for result in baseline}
+    comparisons = []
+    for result in results:
+        reference = baseline_by_key.get(result_key(result))
+        if reference is None:
+            continue
+        before, after = reference['seconds'], result['seconds']
+        ratio = after / before if before else float('inf')
+        comparisons.append({
+            'key': result_key(result),
+            'baseline_seconds': before,
+            'seconds': after,
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold and after - before > MIN_REGRESSION_SECONDS,
+        })
+    return comparisons
+
+
+def synthetic_geo_names(n_geos, seed=42):
+    """
+    Synthetic NUTS-like areas with accented multilingual names
+    Args:
+        n_geos (int): Number of geographic areas
+        seed (int): Random seed
+    Returns:
+        list: [(code, name), ...]
+    """
+    rng = random.Random(seed)
+    areas = []
+    for i in range(n_geos):
+        words = [''.join(rng.choice(NAME_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        areas.append((f"{'ABCDEFGHIJ'[i % 10]}{'KLMNOPQRST'[i // 10 % 10]}{i:05d}", '-'.join(words).title()))
+    return areas
+
+
+def bench_search(config, n_queries=SEARCH_QUERIES):
+    """
+    Compare prefix lookups through the geo search index with icontains scans
+    Args:
+        config (BenchmarkConfig): Geo set sizes and repetitions
+        n_queries (int): Lookups per size (name and code prefixes of 2-5 characters)
+    Returns:
+        list: One result dict per size
+    """
+    rng = random.Random(7)
+    results = []
+    for n_geos in config.geo_sizes:
+        GDPData.objects.all().delete()
+        GeoArea.objects.all().delete()
+        areas = synthetic_geo_names(n_geos)
+        GeoArea.objects.bulk_create(
+            (GeoArea(code=code, name=name) for code, name in areas),
+            batch_size=2000,
+        )
+        queries = []
+        for _ in range(n_queries):
+            code, name = rng.choice(areas)
+            source = rng.choice((code, rng.choice(name.split('-'))))
+            queries.append(source[:rng.randint(2, 5)])
+
+        def indexed():
+            return [search_geo_area_ids(query, limit=20) for query in queries]
+
+        def scan():
+            return [
+                list(GeoArea.objects.filter(Q(code__icontains=query) | Q(name__icontains=query))
+                     .values_list('pk', flat=True)[:20])
+                for query in queries
+            ]
+
+        index_time, _ = timed(indexed, config.repeat)
+        scan_time, _ = timed(scan, config.repeat)
+        results.append({
+            'suite': 'search', 'case': f"prefix_{search_backend()}", 'geos': n_geos,
+            'seconds': index_time / n_queries, 'orm_seconds': scan_time / n_queries,
+            'speedup': scan_time / index_time if index_time else None,
+        })
+        logger.info(f"Search benchmark finished for {n_geos} geos")
+    return results
+
+
+def database_bytes():
+    """
+    Bytes used by the SQLite database: pages in use, without the free pages that
+    deletes leave in the file for reuse (None on other backends)
+    """
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA page_count")
+        pages = cursor.fetchone()[0]
+        cursor.execute("PRAGMA freelist_count")
+        pages -= cursor.fetchone()[0]
+        cursor.execute("PRAGMA page_size")
+        return pages * cursor.fetchone()[0]
+
+
+def bench_store(config):
+    """
+    Bulk load synthetic tables into the generic observation store: first load and
+    an unchanged reload, with the bytes added per observation (SQLite)
+    Args:
+        config (BenchmarkConfig): Table sizes and years (single run per case)
+    Returns:
+        list: One result dict per (size, case)
+    """
+    results = []
+    for n_geos in config.geo_sizes:
+        batch = ObservationBatch.from_legacy(*synthetic_scrape(n_geos, config.n_years))
+        Dataset.objects.filter(code='bench').delete()
+        size_before = database_bytes()
+        for case in ('load', 'reload'):
+            seconds, _ = timed(lambda: load_batch(batch, 'bench'), 1)
+            result = {'suite': 'store', 'case': case, 'geos': n_geos, 'years': config.n_years,
+                      'observations': len(batch), 'seconds': seconds,
+                      'observations_per_second': len(batch) / seconds if seconds else None}
+            if case == 'load' and size_before is not None:
+                result['bytes_per_observation'] = (database_bytes() - size_before) / len(batch)
+            results.append(result)
+        stored = Observation.objects.filter(series__dataset__code='bench').count()
+        if stored != len(batch):
+            raise BenchmarkCheckFailed(f"Store holds {stored} observations after loading {len(batch)}")
+        logger.info(f"Store benchmark finished for {n_geos} geos")
+    return results
+
+
+def bench_validation(config):
+    """
+    Time the data-quality checks over synthetic batches against a stored history of the same size
+    Args:
+        config (BenchmarkConfig): Table sizes and years
+    Returns:
+        list: One result dict per size (history load reported separately)
+    """
+    results = []
+    for n_geos in config.geo_sizes:
+        years = populate_synthetic(n_geos, config.n_years)
+        batch = ObservationBatch.from_legacy(*synthetic_scrape(n_geos, config.n_years))
+        history_seconds, history = timed(lambda: load_history(batch.geo_codes), 1)
+        seconds, report = timed(lambda: validate_batch(batch, years, history=history), config.repeat)
+        results.append({'suite': 'validate', 'case': 'validate_batch', 'geos': n_geos, 'years': config.n_years,
+                        'seconds': seconds, 'history_seconds': history_seconds, 'passed': report.passed})
+        logger.info(f"Validation benchmark finished for {n_geos} geos")
+    return results
+
+
+# Registry of available benchmark suites (name -> callable returning result dicts)
+SUITES = {
+    'extract': bench_extract,
+    'import': bench_import,
+    'matrix': bench_matrix,
+    'parse': bench_parse,
+    'pipeline': bench_pipeline,
+    'pivot': bench_pivot,
+    'records': bench_records,
+    'search': bench_search,
+    'store': bench_store,
+    'validate': bench_validation,
+}
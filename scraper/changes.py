@@ -0,0 +1,129 @@
+import json
+import logging
+
+from django.db import transaction
+
+from eurostat_manager import settings
+from .logconfig import RUN_ID, LazyRotatingFileHandler
+from .models import GDPChange
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+
+def diff_observations(geo_code, existing, observations):
+    """
+    Compare scraped observations of one geo area with the stored ones
+    Args:
+        geo_code (str): Geo area code
+        existing (dict): {year: (value, flag, is_available)} currently stored
+        observations (list): [(year, value, flag), ...] being imported
+    Returns:
+        list: Unsaved GDPChange for every inserted or revised observation (unchanged ones are left out)
+    """
+    run_id = RUN_ID.get() or ''
+    changes = []
+    for year, value, flag in observations:
+        old = existing.get(year)
+        if old is None:
+            kind, old_value, old_flag = 'insert', None, None
+        elif old == (value, flag, True):
+            continue
+        else:
+            kind, (old_value, old_flag, _) = 'update', old
+        changes.append(GDPChange(
+            run_id=run_id, geo_code=geo_code, year=year,
+            old_value=old_value, old_flag=old_flag, new_value=value, new_flag=flag, kind=kind,
+        ))
+    return changes
+
+
+def change_to_dict(change):
+    """JSON-serializable form of a GDPChange (one NDJSON line / API item)"""
+    return {
+        'id': change.id,
+        'run_id': change.run_id,
+        'geo_code': change.geo_code,
+        'year': change.year,
+        'kind': change.kind,
+        'old_value': change.old_value,
+        'old_flag': change.old_flag,
+        'new_value': change.new_value,
+        'new_flag': change.new_flag,
+        'created_at': change.created_at.isoformat() if change.created_at else None,
+    }
+
+
+def changes_since(cursor=0, limit=DEFAULT_PAGE_SIZE, geo_code=None):
+    """
+    Page of the change log after a cursor (an indexed range scan on the primary key)
+    Args:
+        cursor (int): Last change id already consumed (0 for the whole log)
+        limit (int): Maximum changes returned
+        geo_code (str): Only changes of this geo area
+    Returns:
+        tuple: (list of GDPChange in cursor order, next cursor)
+    """
+    queryset = GDPChange.objects.filter(id__gt=cursor)
+    if geo_code:
+        queryset = queryset.filter(geo_code=geo_code)
+    changes = list(queryset.order_by('id')[:limit])
+    return changes, changes[-1].id if changes else cursor
+
+
+class ChangeLog:
+    """
+    Writes importer changes to the GDPChange table and, when EUROSTAT_CONFIG['CHANGE_LOG_FILE']
+    is set, to a rotating NDJSON file.
+
+    Rows are written in the importer's transaction, so a rolled back region
+    leaves no change behind; file lines are appended only once it commits.
+    Imports are single-flight per dataset (see scheduling.RunLock), so change
+    ids are committed in increasing order and `id > cursor` never skips a change.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): NDJSON file (defaults to EUROSTAT_CONFIG['CHANGE_LOG_FILE']; empty disables the file)
+        """
+        config = settings.EUROSTAT_CONFIG
+        self.path = path if path is not None else config.get('CHANGE_LOG_FILE')
+        self.handler = None
+        if self.path:
+            self.handler = LazyRotatingFileHandler(
+                self.path,
+                maxBytes=config.get('CHANGE_LOG_MAX_BYTES', DEFAULT_MAX_BYTES),
+                backupCount=config.get('CHANGE_LOG_BACKUPS', DEFAULT_BACKUP_COUNT),
+                encoding='utf-8',
+            )
+
+    def record(self, changes):
+        """
+        Store the changes of one geo area (call inside the import transaction)
+        Args:
+            changes (list): Unsaved GDPChange rows (see diff_observations)
+        """
+        if not changes:
+            return
+        created = GDPChange.objects.bulk_create(changes)
+        if self.handler:
+            if created[0].id is None:
+                # Backend without RETURNING: the file needs the ids, re-read the rows just written
+                created = list(GDPChange.objects.order_by('-id')[:len(created)])[::-1]
+            lines = [json.dumps(change_to_dict(change)) for change in created]
+            transaction.on_commit(lambda: self._write(lines))
+
+    def _write(self, lines):
+        """Append committed changes to the NDJSON file"""
+        for line in lines:
+            self.handler.emit(logging.makeLogRecord({'msg': line, 'levelno': logging.INFO}))
+        self.handler.flush()
+
+    def close(self):
+        """Close the NDJSON file"""
+        if self.handler:
+            self.handler.close()
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+from eurostat_manager import settings
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_dir():
+    """Directory where checkpoint files are stored (EUROSTAT_CONFIG['CHECKPOINT_DIR'])"""
+    return settings.EUROSTAT_CONFIG.get('CHECKPOINT_DIR', 'checkpoints')
+
+
+def write_json_atomic(path, data):
+    """
+    Write JSON so that a crash never leaves a truncated file behind
+    Args:
+        path (str): Target file path
+        data: JSON-serializable object
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def batch_fingerprint(batch, chunk_size):
+    """
+    Identify an import by its content and chunking
+    Args:
+        batch (ObservationBatch): Data being imported
+        chunk_size (int): Number of geo areas per chunk
+    Returns:
+        str: SHA-1 hex digest; equal data with equal chunking gives the same fingerprint
+    """
+    digest = hashlib.sha1(f"chunk_size={chunk_size}".encode())
+    digest.update('\x1f'.join(batch.geo_codes).encode())
+    for column in (batch.geo_index, batch.year, batch.value, batch.decimals, batch.flag):
+        digest.update(column.tobytes())
+    digest.update(repr(sorted(batch.text.items())).encode())
+    return digest.hexdigest()
+
+
+class ImportCheckpoint:
+    """
+    Persisted record of the import chunks already committed to the database.
+
+    The checkpoint file is keyed by the batch fingerprint, so a rerun with the
+    same scraped data (e.g. after a crash or kill) skips the committed chunks,
+    while a run with different data starts from scratch.
+    """
+
+    def __init__(self, fingerprint, directory=None):
+        """
+        Args:
+            fingerprint (str): Value returned by batch_fingerprint
+            directory (str): Checkpoint directory (defaults to checkpoint_dir())
+        """
+        self.fingerprint = fingerprint
+        self.path = os.path.join(directory or checkpoint_dir(), f"import_{fingerprint[:16]}.json")
+        self.completed = set()
+
+    def load(self):
+        """
+        Load completed chunks from disk if a matching checkpoint exists
+        Returns:
+            set: Indexes of chunks already committed
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self.completed
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable import checkpoint {self.path}: {e}")
+            return self.completed
+        if data.get('fingerprint') == self.fingerprint:
+            self.completed = set(data.get('completed', []))
+            logger.info(f"Resuming import: {len(self.completed)} chunks already committed ({self.path})")
+        return self.completed
+
+    def mark_done(self, chunk_index):
+        """
+        Record a committed chunk (call only after its transaction commits)
+        Args:
+            chunk_index (int): Index of the committed chunk
+        """
+        self.completed.add(chunk_index)
+        write_json_atomic(self.path, {
+            'fingerprint': self.fingerprint,
+            'completed': sorted(self.completed),
+            'updated_at': datetime.now().isoformat(),
+        })
+
+    def clear(self):
+        """Remove the checkpoint once the whole import has finished"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.completed = set()
+
+
+def dataset_key(url):
+    """
+    Short dataset identifier for checkpoint file names
+    Args:
+        url (str): Data browser URL (e.g. .../databrowser/view/nama_10r_2gdp/default/table)
+    Returns:
+        str: Dataset code after '/view/' or a hash of the URL when there is none
+    """
+    _, view, rest = (url or '').partition('/view/')
+    code = rest.split('/')[0].split('?')[0]
+    if view and code:
+        return code
+    return hashlib.sha1((url or '').encode()).hexdigest()[:12]
+
+
+def grid_version(geo_dicts, years):
+    """
+    Identify the upstream version of a grid by its row and column headers
+    Args:
+        geo_dicts (list): [{'CODE': 'Description'}, ...] as returned by load_grid
+        years (list): Year headers
+    Returns:
+        str: SHA-1 hex digest; a new year or geo area upstream gives a new version
+    """
+    digest = hashlib.sha1('\x1f'.join(years).encode())
+    for geo_dict in geo_dicts:
+        for code, name in geo_dict.items():
+            digest.update(f"\x1e{code}\x1f{name}".encode())
+    return digest.hexdigest()
+
+
+class ExtractionCheckpoint:
+    """
+    Append-only NDJSON log of the rows extracted so far from one grid.
+
+    Every row is written (and flushed) as soon as it is read, so a Chrome crash,
+    timeout or kill loses at most the row being read. The file is keyed by
+    dataset and upstream grid version: a restarted run against the same data
+    reuses the logged rows and only scrapes the missing ones.
+    """
+
+    def __init__(self, dataset, version, directory=None):
+        """
+        Args:
+            dataset (str): Dataset key (see dataset_key)
+            version (str): Upstream version (see grid_version)
+            directory (str): Checkpoint directory (defaults to checkpoint_dir())
+        """
+        self.dataset = dataset
+        self.version = version
+        self.path = os.path.join(directory or checkpoint_dir(), f"extract_{dataset}_{version[:16]}.ndjson")
+        self.rows = {}
+        self._file = None
+
+    def load(self):
+        """
+        Load logged rows; a truncated last line (crash while writing) is ignored
+        Returns:
+            dict: {row_id: row_data} already extracted
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Ignoring truncated line in extraction checkpoint {self.path}")
+                        continue
+                    if 'row_id' in record:
+                        self.rows[record['row_id']] = record['data']
+        except FileNotFoundError:
+            return self.rows
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable extraction checkpoint {self.path}: {e}")
+            return self.rows
+        logger.info(f"Resuming extraction: {len(self.rows)} rows already extracted ({self.path})")
+        return self.rows
+
+    def append(self, row_id, row_data):
+        """
+        Log one extracted row
+        Args:
+            row_id (str): Geo code of the row
+            row_data (dict): Cells of the row keyed by year
+        """
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            new_file = not os.path.exists(self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if new_file:
+                self._write({'dataset': self.dataset, 'version': self.version,
+                             'created_at': datetime.now().isoformat()})
+        self._write({'row_id': row_id, 'data': row_data})
+        self.rows[row_id] = row_data
+
+    def _write(self, record):
+        """Write one line and hand it to the OS right away"""
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """Close the log file, syncing it to disk"""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """Remove the checkpoint once the extracted data has been imported"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.rows = {}
@@ -1,81 +1,129 @@
 import time
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.action_chains import ActionChains
-import pandas as pd
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
-import csv
-from django.db import transaction
+import socket
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException,
+)
+from selenium.webdriver.common.by import By
 
 from eurostat_manager import settings
-from .models import GeoArea, GDPData
+from .records import ObservationBatch
+from .metrics import RunMetrics
+from .screenshots import ScreenshotRecorder
+from .checkpoints import ExtractionCheckpoint, dataset_key, grid_version
+from .parsing import parse_special_value
+from .replay import record_session
+from .geo_cache import ROW_IDS_SCRIPT, GeoCache, headers_hash
+from .scheduling import pid_alive
 
+# Browser automation backends (selenium.webdriver.chrome / support, webdriver_manager)
+# are imported on first use in setup_driver / _expected_conditions: importing this
+# module must stay cheap for management commands, admin and API workers.
+# `python manage.py profile_startup` checks that.
 
-# Configure logs directory
-log_dir = "logs"
-os.makedirs(log_dir, exist_ok=True)  # Create directory if it doesn't exist
+logger = logging.getLogger(__name__)
 
-# Configure logging for both console and rotating file
-log_file = os.path.join(log_dir, "scraper.log")  # Log file in logs directory
+# Browser restarts allowed per extraction, and the bounded exponential backoff between them
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 30
 
-# Create logger
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)  # Global logging level
 
-# Log format
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+def backoff_delay(attempt):
+    """
+    Delay before retry number attempt (0-based): 2s, 4s, 8s, ... capped at BACKOFF_MAX_SECONDS
+    """
+    return min(BACKOFF_BASE_SECONDS * 2 ** attempt, BACKOFF_MAX_SECONDS)
 
-# File handler with rotation
-file_handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3)  # 5 MB per file, 3 backups
-file_handler.setLevel(logging.DEBUG)  # Logging level for file
-file_handler.setFormatter(formatter)
 
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)  # Logging level for console
-console_handler.setFormatter(formatter)
+# Cookie consent banner: its accept button, and the cookie the EC consent kit sets once accepted
+CONSENT_SELECTOR = "a.wt-ecl-button:nth-child(1)"
+DEFAULT_CONSENT_COOKIE = "cck1"
+
+
+def profile_in_use(profile_dir):
+    """
+    Whether a live Chrome on this host holds the profile (its SingletonLock points to 'host-pid')
+    Args:
+        profile_dir (str): Chrome user data directory
+    """
+    try:
+        target = os.readlink(os.path.join(profile_dir, "SingletonLock"))
+    except OSError:
+        return False
+    host, _, pid = target.rpartition('-')
+    return host == socket.gethostname() and pid.isdigit() and pid_alive(int(pid))
 
-# Add handlers to logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
 
 class EurostatScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, metrics=None, resume=True, max_retries=MAX_RETRIES,
+                 base_url=None, record_dir=None, accept_consent=True, plan=None, monitor=None,
+                 profile_dir=None, shard=None):
         """
         Initialize the scraper with default settings.
         Args:
             headless (bool): Whether to run browser in headless mode
+            metrics (RunMetrics): Optional run metrics shared with the caller
+            resume (bool): Reuse rows from a matching extraction checkpoint
+            max_retries (int): Browser restarts allowed when Chrome crashes or times out
+            base_url (str): Page to scrape (defaults to EUROSTAT_CONFIG['BASE_URL'], e.g. a ReplayServer url)
+            record_dir (str): Record the rendered page and timings here for later replay
+            accept_consent (bool): Look for the cookie banner (recorded pages have none)
+            plan (IncrementalPlan): Read only volatile columns and cells (None reads the whole grid)
+            monitor (ResourceMonitor): Samples the browser process tree and aborts runaway runs
+            profile_dir (str): Chrome user data directory kept between runs (consent cookie, local storage, cache);
+                               defaults to EUROSTAT_CONFIG['BROWSER_PROFILE_DIR'], '' for a throwaway profile
+            shard (str): Shard name of a filtered page (see scraper.sharding); keeps its checkpoint and
+                         geo cache apart from the other shards of the dataset
         """
-        self.base_url = settings.EUROSTAT_CONFIG['BASE_URL']
+        self.base_url = base_url or settings.EUROSTAT_CONFIG['BASE_URL']
+        self.record_dir = record_dir
+        self.accept_consent = accept_consent
+        self.plan = plan
+        self.monitor = monitor
+        self.profile_dir = settings.EUROSTAT_CONFIG.get('BROWSER_PROFILE_DIR') if profile_dir is None else profile_dir
+        self.consent_pending = False  # Banner expected but not dismissed yet (probed while the table loads)
+        self.dataset = f"{dataset_key(self.base_url)}_{shard}" if shard else dataset_key(self.base_url)
+        self.geo_cache = GeoCache(self.dataset)
+        self.geo_hash = None  # headers_hash of the rendered grid
+        self.geo_cache_hit = False  # True when geo metadata came from the cache
         self.driver = None
         self.headless = headless
-        self.screenshot_dir = "screenshots"
-        os.makedirs(self.screenshot_dir, exist_ok=True)
+        self.screenshots = ScreenshotRecorder()  # Errors only unless EUROSTAT_SCREENSHOT_LEVEL=info
         self.wait = None
+        self.metrics = metrics or RunMetrics()
+        self._grid = None  # (geo_dicts, years) once the grid has been rendered
+        self.resume = resume
+        self.max_retries = max_retries
+        self.checkpoint = None  # ExtractionCheckpoint of the rendered grid
+        self.page_loaded = False  # True when the caller already navigated to base_url (multi-tab mode)
 
     def __enter__(self):
         """Initialize driver when entering context"""
-        self.setup_driver()
+        with self.metrics.span('driver_setup'):
+            self.setup_driver()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Clean up driver when exiting context"""
+        self.screenshots.close()
+        if self.checkpoint:
+            self.checkpoint.close()
         if self.driver:
             self.driver.quit()
             logger.info("Driver closed.")
+        if self.monitor:
+            self.monitor.detach_driver(owner=self.dataset)
 
     def setup_driver(self):
         """Configure Selenium WebDriver with Chrome options"""
         logger.info("Setting up Selenium driver...")
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.support.ui import WebDriverWait
+        from webdriver_manager.chrome import ChromeDriverManager
         try:
             chrome_options = Options()
             if self.headless:
@@ -87,6 +135,18 @@ class EurostatScraper:
             chrome_options.add_argument("--window-size=1920,1080")
             chrome_options.add_argument("--disable-notifications")
             chrome_options.add_argument("--disable-blink-features=AutomationControlled")  # Disable automation warning
+            # Keep background tabs rendering at full speed (multi-tab mode, see scraper.multitab)
+            chrome_options.add_argument("--disable-background-timer-throttling")
+            chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+            chrome_options.add_argument("--disable-renderer-backgrounding")
+            
+            # Persistent profile: the consent cookie and local storage survive between runs
+            if self.profile_dir:
+                if profile_in_use(self.profile_dir):
+                    logger.warning(f"Browser profile {self.profile_dir} is in use by another Chrome; "
+                                   f"using a throwaway profile")
+                else:
+                    chrome_options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
             
             # Disable image loading for better performance
             chrome_options.add_experimental_option("prefs", {
@@ -100,13 +160,16 @@ class EurostatScraper:
             logger.info(f"ChromeDriver installed at: {chrome_driver_path}")
             
             # Configure ChromeDriver service to save logs in logs directory
-            service = Service(chrome_driver_path)
-            service.log_path = os.path.join("logs", "webdriver.log")
+            os.makedirs(settings.LOG_DIR, exist_ok=True)
+            service = Service(chrome_driver_path, log_output=os.path.join(settings.LOG_DIR, "webdriver.log"))
             
             # Initialize driver with timeout settings
             logger.info("Initializing Chrome driver...")
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             if self.driver:
+                self.metrics.instrument_driver(self.driver)
+                if self.monitor:
+                    self.monitor.attach_driver(self.driver, owner=self.dataset)
                 logger.info("Chrome driver initialized successfully")
                 self.driver.set_page_load_timeout(60)
                 self.wait = WebDriverWait(self.driver, 30)
@@ -118,6 +181,38 @@ class EurostatScraper:
             logger.error(f"Error configuring driver: {e}")
             raise
 
+    def restart_driver(self):
+        """Quit the (possibly crashed) browser and start a fresh one; the grid must be rendered again"""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing crashed driver: {e}")
+        self.driver = None
+        self._grid = None
+        with self.metrics.span('driver_setup'):
+            self.setup_driver()
+
+    def _retrying(self, attempt, error):
+        """
+        Handle a failed browser attempt: give up when retries are exhausted,
+        otherwise wait with bounded backoff and restart the browser
+        Args:
+            attempt (int): 0-based number of the failed attempt
+            error (Exception): Error raised by the attempt
+        Raises:
+            Exception: error itself once max_retries restarts have been used
+        """
+        if attempt >= self.max_retries:
+            logger.error(f"Giving up after {attempt + 1} attempts: {error}")
+            raise error
+        delay = backoff_delay(attempt)
+        logger.warning(f"Browser error ({error.__class__.__name__}: {error}); "
+                       f"restarting in {delay}s (retry {attempt + 1}/{self.max_retries})")
+        self.capture_screenshot("retry_error", level='error')
+        time.sleep(delay)
+        with self.metrics.span('retry'):
+            self.restart_driver()
+
     def _scroll_to_element(self, element):
         """
         Scroll until element is visible in viewport
@@ -128,47 +223,78 @@ class EurostatScraper:
             logger.error("Driver not initialized. Cannot scroll.")
             return            
         try:
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            logger.info("Scrolled to element.")
-            time.sleep(2)  # Wait for page to stabilize after scrolling
+            with self.metrics.span('scroll'):
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+                logger.info("Scrolled to element.")
+                time.sleep(2)  # Wait for page to stabilize after scrolling
         except Exception as e:
             logger.error(f"Error scrolling to element: {e}")
 
+    @staticmethod
+    def _expected_conditions():
+        """selenium expected_conditions, imported on first use"""
+        from selenium.webdriver.support import expected_conditions
+        return expected_conditions
+
+    def consent_needed(self):
+        """False when the consent cookie stored in the browser profile shows the banner was already accepted"""
+        cookie = settings.EUROSTAT_CONFIG.get('CONSENT_COOKIE', DEFAULT_CONSENT_COOKIE)
+        return not (cookie and self.driver.get_cookie(cookie))
+
     def accept_cookies(self):
-        """Accept cookies if banner is present"""
+        """
+        Accept cookies if the banner is on the page right now (non-blocking probe)
+        Returns:
+            bool: True when the banner was dismissed
+        """
         try:
-            logger.info("Looking for cookie accept button...")
-            accept_cookies_button = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "a.wt-ecl-button:nth-child(1)")))
-            accept_cookies_button.click()
+            buttons = [button for button in self.driver.find_elements(By.CSS_SELECTOR, CONSENT_SELECTOR)
+                       if button.is_displayed()]
+            if not buttons:
+                return False
+            buttons[0].click()
             logger.info("Cookies accepted.")
             self.capture_screenshot("cookies_accepted")
-        except TimeoutException:
-            logger.warning("Cookie accept button not found. Continuing without accepting cookies.")
-        except Exception as e:
-            self.capture_screenshot("cookies_error")
+            return True
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False  # Banner re-rendered between lookup and click: probed again on the next poll
+        except WebDriverException as e:
+            self.capture_screenshot("cookies_error", level='error')
             logger.error(f"Error accepting cookies: {e}")
+            return False
+
+    def _table_ready(self, driver):
+        """
+        WebDriverWait condition: table clickable; meanwhile dismiss the consent banner as soon as it shows up
+        Returns:
+            WebElement: The table once clickable, otherwise False
+        """
+        if self.consent_pending and self.accept_cookies():
+            self.consent_pending = False
+        EC = self._expected_conditions()
+        return EC.element_to_be_clickable((By.CSS_SELECTOR, "#estat-content-view-table"))(driver)
 
     def wait_for_table_to_load(self):
-        """Wait for table to be fully loaded and clickable"""
+        """Wait for table to be fully loaded and clickable (probing for the consent banner meanwhile)"""
         try:
             logger.info("Waiting for table to fully load...")            
             # Take screenshot before waiting for table
             self.capture_screenshot("before_wait_for_table")            
-            # Wait for table to be present using ID
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#estat-content-view-table")))            
-            # Wait for table to be clickable
-            self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#estat-content-view-table")))            
+            # Wait for table to be present and clickable using ID
+            self.wait.until(self._table_ready)
             logger.info("Table fully loaded and clickable.")            
+            if self.consent_pending:
+                logger.info("No cookie banner showed up while the table loaded; continuing without it")
+                self.consent_pending = False
             # Take screenshot after table loads
             self.capture_screenshot("after_wait_for_table")
         except TimeoutException as e:
             logger.error(f"Timeout waiting for table to load: {e}")
-            self.capture_screenshot("timeout_error")
+            self.capture_screenshot("timeout_error", level='error')
             raise
         except Exception as e:
             logger.error(f"Error waiting for table to load: {e}")
-            self.capture_screenshot("wait_for_table_error")
+            self.capture_screenshot("wait_for_table_error", level='error')
             raise
 
     def _scroll_horizontal_to_middle(self, scrollable_div):
@@ -194,6 +320,29 @@ class EurostatScraper:
         time.sleep(5)
         logger.info("Horizontal scroll to start completed")
 
+    def _scroll_left_to_year(self, scrollable_div, year):
+        """
+        Scroll left one viewport at a time until the column of year is rendered
+        (generator: yields the seconds to wait after each scroll, see _render_steps)
+        Args:
+            scrollable_div: The scrollable container element (scrolled fully right)
+            year (int): Oldest year column needed
+        Returns:
+            list: Year headers seen while scrolling
+        """
+        seen = self._extract_visible_years()
+        client_width = self.driver.execute_script("return arguments[0].clientWidth", scrollable_div) or 1
+        while seen and int(min(seen)) > year:
+            scroll_left = self.driver.execute_script(
+                "arguments[0].scrollLeft = Math.max(arguments[0].scrollLeft - arguments[1], 0);"
+                "return arguments[0].scrollLeft;", scrollable_div, client_width)
+            yield 1
+            seen += self._extract_visible_years()
+            if not scroll_left:
+                break
+        logger.info(f"Scrolled right-hand part of the grid down to {min(seen, default=None)} (needed {year})")
+        return seen
+
     def _extract_visible_years(self):
         """Extract currently visible year headers from table"""
         year_headers = self.driver.find_elements(By.CSS_SELECTOR, ".ag-header-group-cell .table-header-text")
@@ -223,89 +372,227 @@ class EurostatScraper:
         logger.info(f"Found {len(titles)} titles:")
         return titles
 
-    def extract_table_data(self):
-        """Main method to extract table data with retry logic"""
+    def load_grid(self):
+        """
+        Render the grid once and read its headers: page load, cookies, table wait,
+        scroll into view and a single full horizontal scroll so every year column
+        is rendered. Later calls reuse the rendered grid without scrolling again.
+        Browser crashes and timeouts are retried with bounded backoff.
+        Returns:
+            tuple: (geo_dicts, years) - [{'CODE': 'Description'}, ...] and sorted year strings
+        """
         if not self.driver:
-            logger.error("Driver not initialized. Cannot extract data.")
-            return None
-        try:
-            logger.info("Starting table data extraction...")
-            self.driver.get(self.base_url)
-            logger.info("Page loaded successfully.")            
-            self.accept_cookies()
+            raise RuntimeError("Driver not initialized. Cannot extract data.")
+        attempt = 0
+        while self._grid is None:
+            try:
+                self._render_grid()
+            except WebDriverException as e:
+                self._retrying(attempt, e)
+                attempt += 1
+        if self.record_dir:
+            record_session(self.driver, self.record_dir, self.base_url, self.metrics.phases)
+            self.record_dir = None  # Record the first render only
+        return self._grid
+
+    def _render_grid(self):
+        """Single render pass of the grid (see load_grid); sets self._grid"""
+        for delay in self._render_steps():
+            time.sleep(delay)
+
+    def _render_steps(self):
+        """
+        Render pass of the grid as a generator: every waiting point yields the
+        seconds to wait instead of sleeping, so a caller driving several tabs of
+        one browser (see scraper.multitab) can use the pause for other tabs.
+        Sets self._grid when exhausted.
+        Yields:
+            float: Seconds to wait before the next step
+        """
+        logger.info("Starting table data extraction...")
+        if self.page_loaded:
+            self.page_loaded = False  # Already navigated by the caller; retries load the page again
+        else:
+            with self.metrics.span('page_load'):
+                self.driver.get(self.base_url)
+        logger.info("Page loaded successfully.")
+        if self.accept_consent:
+            with self.metrics.span('accept_cookies'):
+                # Never waits: a banner rendered later is dismissed while waiting for the table
+                self.consent_pending = self.consent_needed() and not self.accept_cookies()
+        with self.metrics.span('wait_for_table'):
             self.wait_for_table_to_load()
-            
-            # Scroll to table
-            logger.info("Scrolling to table...")
+
+        # Scroll to table
+        logger.info("Scrolling to table...")
+        with self.metrics.span('scroll'):
             table_element = self.driver.find_element(By.CSS_SELECTOR, "#estat-content-view-table")
-            self._scroll_to_element(table_element)
-            
-            # Perform full horizontal scroll once to load all data
+            self.driver.execute_script("arguments[0].scrollIntoView(true);", table_element)
+            yield 2  # Wait for page to stabilize after scrolling
+
+        # Perform full horizontal scroll once to load all data
+        with self.metrics.span('scroll'):
             scrollable_div = self.driver.find_element(By.CSS_SELECTOR, ".ag-body-horizontal-scroll-viewport")
             scroll_width = self.driver.execute_script("return arguments[0].scrollWidth", scrollable_div)
             self.driver.execute_script(f"arguments[0].scrollLeft = {scroll_width};", scrollable_div)
-            time.sleep(2)
-            
-            # Return to start
-            self.driver.execute_script("arguments[0].scrollLeft = 0;", scrollable_div)
-            time.sleep(2)
+            yield 2
+
+            if self.plan is None:
+                # Return to start
+                self.driver.execute_script("arguments[0].scrollLeft = 0;", scrollable_div)
+                yield 2
+                visible_years = []
+            else:
+                # Incremental: stay on the right-hand part, only as far left as the oldest volatile year
+                visible_years = yield from self._scroll_left_to_year(scrollable_div, self.plan.first_year)
 
+        with self.metrics.span('extract_headers'):
             # Extract years (should all be visible now)
-            all_years = self._extract_visible_years()
-            print("\nTEST **All-Years**: ", all_years, "\n")
+            years = self._process_years(visible_years, self._extract_visible_years())
+            # Extract GEO titles (unless the cached ones still match the grid)
+            geo_dicts = self._geo_metadata()
 
-            # Extract GEO titles
-            geo_titles = self._extract_geo_titles()
-            print("\nTEST **Geo-Titles**: ", geo_titles, "\n")
-            geo_titles_dicc_list = self._process_gdp_data(geo_titles)
-            print("\nTEST **Geo-Titles-Dicc-List**: ", geo_titles_dicc_list, "\n")
+        self._grid = (geo_dicts, years)
 
-            return geo_titles_dicc_list
+    def _geo_metadata(self):
+        """
+        Geo metadata of the rendered grid, from the geo cache when the row IDs are unchanged
+        Returns:
+            list: [{'CODE': 'Description'}, ...]
+        """
+        row_ids = self.driver.execute_script(ROW_IDS_SCRIPT) or []
+        self.geo_hash = headers_hash(row_ids)
+        cached = self.geo_cache.lookup(self.geo_hash)
+        self.geo_cache_hit = cached is not None
+        if self.geo_cache_hit:
+            logger.info(f"Geo headers unchanged ({len(row_ids)} rows): using cached geo metadata")
+            return cached
+        return self._process_gdp_data(self._extract_geo_titles())
+
+    def save_geo_cache(self):
+        """Cache the geo metadata of the rendered grid (call once its areas are imported)"""
+        if self._grid is not None and not self.geo_cache_hit and self.geo_hash:
+            self.geo_cache.save(self.geo_hash, self._grid[0])
+
+    def extract_grid(self):
+        """
+        Single-pass extraction of the whole grid: geo metadata, year headers and
+        cell values all come from one render of the page
+        Returns:
+            tuple: (geo_dicts, years, ObservationBatch)
+        """
+        geo_dicts, years = self.load_grid()
+        batch = ObservationBatch()
+        for geo_dict in geo_dicts:
+            for code, name in geo_dict.items():
+                batch.add_geo(code, name)
+        for row_id, row_data in self.iter_gdp_rows():
+            batch.add_listed_row(row_id, row_data)
+        logger.info(f"Extracted {batch!r} for {len(years)} years")
+        return geo_dicts, years, batch
+
+    def extract_table_data(self):
+        """
+        Extract geo metadata (thin wrapper around load_grid)
+        Returns:
+            list: [{'CODE': 'Description'}, ...] or None on error
+        """
+        try:
+            geo_dicts, _ = self.load_grid()
+            return geo_dicts
         except Exception as e:
             logger.error(f"Error extracting table data: {e}", exc_info=True)
             return None
 
-    def extract_complete_gdp_data(self):
+    def open_checkpoint(self):
         """
-        Extract all GDP data with horizontal scrolling
+        Open the extraction checkpoint of the rendered grid (keyed by dataset and grid version)
         Returns:
-            dict: Dictionary with row IDs as keys and GDP data as values
+            ExtractionCheckpoint: Checkpoint with the rows already extracted (none when resume is off)
         """
-        gdp_data = {}
-        counter = 0
-        try:
-            # Perform full horizontal scroll once to load all data
-            scroll_container = self.driver.find_element(
-                By.CSS_SELECTOR, 
-                ".ag-body-horizontal-scroll-viewport"
-            )
-            scroll_width = self.driver.execute_script(
-                "return arguments[0].scrollWidth", 
-                scroll_container
-            )
-            self.driver.execute_script(
-                f"arguments[0].scrollLeft = {scroll_width};", 
-                scroll_container
-            )
-            time.sleep(2)
-            
-            # Return to start
-            self.driver.execute_script("arguments[0].scrollLeft = 0;", scroll_container)
-            time.sleep(2)
+        if self.checkpoint is None:
+            geo_dicts, years = self.load_grid()
+            dataset = self.dataset
+            if self.plan is not None:
+                dataset = f"{dataset}_{self.plan.key()}"  # Incremental rows hold a subset of the cells
+            self.checkpoint = ExtractionCheckpoint(dataset, grid_version(geo_dicts, years))
+            if self.resume:
+                self.checkpoint.load()
+            else:
+                self.checkpoint.clear()
+        return self.checkpoint
 
-            # Get all rows
-            rows = self.driver.find_elements(By.CSS_SELECTOR, "div[role='row'][row-id]")            
-            print("TEST **Rows**: ", len(rows))
-            
-            for row in rows:
+    def clear_checkpoint(self):
+        """Drop the extraction checkpoint once its rows are safely imported"""
+        if self.checkpoint:
+            self.checkpoint.clear()
+
+    def iter_gdp_rows(self):
+        """
+        Stream GDP rows one at a time from the rendered grid (see load_grid).
+
+        Rows found in the extraction checkpoint are yielded first without touching
+        the browser; every newly read row is appended to the checkpoint. If Chrome
+        crashes or times out, the browser is restarted with bounded backoff and
+        extraction continues with the rows not read yet.
+        Yields:
+            tuple: (row_id, row_data) for every row that has available data
+        """
+        checkpoint = self.open_checkpoint()
+        done = set(checkpoint.rows)
+        yield from checkpoint.rows.copy().items()
+
+        attempt = 0
+        while True:
+            try:
+                for row_id, row_data in self._iter_rendered_rows(skip=done):
+                    checkpoint.append(row_id, row_data)
+                    done.add(row_id)
+                    yield row_id, row_data
+                return
+            except WebDriverException as e:
+                self._retrying(attempt, e)
+                attempt += 1
+                self.load_grid()
+
+    def _iter_rendered_rows(self, skip=()):
+        """
+        Read the rows of the rendered grid
+        Args:
+            skip (set): Row IDs already extracted
+        Yields:
+            tuple: (row_id, row_data) for every row that has available data
+        """
+        self.load_grid()
+
+        # Get all rows
+        with self.metrics.span('find_rows'):
+            rows = self.driver.find_elements(By.CSS_SELECTOR, "div[role='row'][row-id]")
+        logger.info(f"Found {len(rows)} rows ({len(skip)} already extracted)")
+        
+        for row in rows:
+            if self.monitor:
+                self.monitor.raise_if_exceeded()
+            # Timed per row so that consumer time (e.g. pipelined import) is not counted
+            with self.metrics.span('extract_cells'):
                 row_id = row.get_attribute('row-id')
+                if row_id in skip:
+                    continue
                 row_data = self.extract_row_data(row)  # Simplified method
-                if row_data:  # Only add if data exists
-                    gdp_data[row_id] = row_data
-                    print("TEST **Row-Data**: ", row_data)
-                    print(counter)
-                    counter += 1              
-            return gdp_data            
+                if self.plan is not None:
+                    row_data = self.plan.filter_row(row_id, row_data)
+            logger.debug(f"Row {row_id}: {len(row_data or ())} available cells", extra={'sample': 'row'})
+            if row_data:  # Only yield if data exists
+                yield row_id, row_data
+
+    def extract_complete_gdp_data(self):
+        """
+        Extract all GDP data (thin wrapper around iter_gdp_rows)
+        Returns:
+            dict: Dictionary with row IDs as keys and GDP data as values
+        """
+        try:
+            return dict(self.iter_gdp_rows())
         except Exception as e:
             logger.error(f"Error extracting complete GDP data: {str(e)}", exc_info=True)
             return {}
@@ -320,7 +607,7 @@ class EurostatScraper:
         """
         row_data = {}
         try:
-            cells = row.find_elements(By.CSS_SELECTOR, "div[role='gridcell'][col-id]")
+            cells = row.find_elements(By.CSS_SELECTOR, self._cell_selector())
             for cell in cells:
                 year = cell.get_attribute('col-id')
                 if year and year.isdigit():
@@ -328,10 +615,22 @@ class EurostatScraper:
                     if value_info['is_available']:  # Only add if data is available
                         row_data[year] = value_info
             return row_data if row_data else None  # Return None if no data
+        except (NoSuchElementException, StaleElementReferenceException) as e:
+            logger.warning(f"Error processing row: {str(e)}")
+            return None
+        except WebDriverException:
+            raise  # Browser crash or timeout: let iter_gdp_rows restart and resume
         except Exception as e:
             logger.warning(f"Error processing row: {str(e)}")
             return None
 
+    def _cell_selector(self):
+        """CSS selector of the cells to read: all year cells, or only the volatile columns in incremental mode"""
+        if self.plan is None or self._grid is None:
+            return "div[role='gridcell'][col-id]"
+        columns = [year for year in self._grid[1] if self.plan.wants_column(year)]
+        return ", ".join(f"div[role='gridcell'][col-id='{year}']" for year in columns) or "div[role='gridcell'][col-id]"
+
     def process_cell(self, cell):
         """
         Process individual cell and return normalized data
@@ -347,40 +646,28 @@ class EurostatScraper:
             )
             raw_value = value_element.text.strip()            
             return self.parse_special_value(raw_value)
+        except (NoSuchElementException, StaleElementReferenceException) as e:
+            logger.warning(f"Error processing cell: {str(e)}")
+            return {'value': None, 'flag': None, 'is_available': False}
+        except WebDriverException:
+            raise  # Browser crash or timeout: let iter_gdp_rows restart and resume
         except Exception as e:
             logger.warning(f"Error processing cell: {str(e)}")
             return {'value': None, 'flag': None, 'is_available': False}
 
-    def parse_special_value(self, raw_value):
+    @staticmethod
+    def parse_special_value(raw_value):
         """
-        Parse special values in cell data
+        Parse special values in cell data (see scraper.parsing.parse_special_value)
         Args:
             raw_value (str): Raw text from cell
         Returns:
             dict: Processed value with flags and availability
         """
-        if not raw_value or raw_value == ":":
-            return {'value': None, 'flag': None, 'is_available': False}        
-        flag = None
-        value = raw_value
-        
-        # Check for special flags like (b), (p), (e)
-        for special_flag in ['(b)', '(p)', '(e)']:
-            if special_flag in raw_value:
-                flag = special_flag[1]  # Get single letter flag
-                value = raw_value.replace(special_flag, '')
-                break        
-        clean_value = value.strip()
-        if any(c.isdigit() for c in clean_value):
-            clean_value = clean_value.replace(' ', '').replace(',', '.')
-        
-        return {
-            'value': clean_value,
-            'flag': flag,
-            'is_available': True
-        }
+        return parse_special_value(raw_value)
 
-    def _process_gdp_data(self, gdp_data):
+    @staticmethod
+    def _process_gdp_data(gdp_data):
         """
         Process GDP string list into dictionary list
         Args:
@@ -402,30 +689,19 @@ class EurostatScraper:
         
         return gdp_data_dicc_list
             
-    def capture_screenshot(self, filename):
+    def capture_screenshot(self, filename, level='info'):
         """
-        Capture screenshot of current page with timestamp
+        Queue a screenshot of the data grid (full page when the grid is absent).
+        Only levels enabled by EUROSTAT_CONFIG['SCREENSHOT_LEVEL'] are captured;
+        the file is written and rotated by a background thread.
         Args:
             filename (str): Base filename for screenshot
+            level (str): 'error' for failures, 'info' for progress snapshots
         """
-        if not self.driver:
-            logger.error("Cannot capture screenshot: driver not initialized.")
-            return            
+        if not self.driver or not self.screenshots.enabled(level):
+            return
         try:
-            # Limit number of stored screenshots
-            max_screenshots = 10
-            screenshots = sorted(
-                [f for f in os.listdir(self.screenshot_dir) if f.endswith(".png")],
-                key=lambda x: os.path.getctime(os.path.join(self.screenshot_dir, x)))
-            if len(screenshots) >= max_screenshots:
-                oldest_screenshot = screenshots[0]
-                os.remove(os.path.join(self.screenshot_dir, oldest_screenshot))
-                logger.info(f"Removed oldest screenshot: {oldest_screenshot}")
-            # Add timestamp to filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename_with_timestamp = f"{filename}_{timestamp}.png"
-            filepath = os.path.join(self.screenshot_dir, filename_with_timestamp)
-            self.driver.save_screenshot(filepath)
-            logger.info(f"Screenshot saved as: {filepath}")
+            with self.metrics.span('screenshot'):
+                self.screenshots.capture(self.driver, filename, level)
         except Exception as e:
-            logger.error(f"Error capturing screenshot: {e}")
\ No newline at end of file
+            logger.error(f"Error capturing screenshot: {e}")
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+
+from .checkpoints import checkpoint_dir, write_json_atomic
+from .models import GeoArea
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = "geo_cache.json"
+
+# Row IDs of the pinned geo column in one WebDriver round trip
+ROW_IDS_SCRIPT = """
+return Array.from(
+    document.querySelectorAll("div.ag-pinned-left-cols-container div[role='row'][row-id]")
+).map(row => row.getAttribute('row-id'));
+"""
+
+
+def geo_area_defaults(name):
+    """
+    GeoArea fields derived from the descriptive name
+    Args:
+        name (str): Geo area name as shown in the grid
+    Returns:
+        dict: defaults for GeoArea.objects.update_or_create
+    """
+    return {
+        'name': name,
+        'is_kosovo': 'Kosovo' in name,  # Special Kosovo handling
+        'is_eu': 'European Union' in name,
+        'is_euro_area': 'Euro area' in name,
+        'notes': 'UNSCR 1244/1999' if 'Kosovo*' in name else None  # UN resolution note
+    }
+
+
+def headers_hash(row_ids):
+    """
+    Identify the geo header list of a grid
+    Args:
+        row_ids (list): Row IDs (geo codes) in grid order
+    Returns:
+        str: SHA-1 hex digest of the list
+    """
+    return hashlib.sha1('\x1f'.join(row_ids).encode()).hexdigest()
+
+
+def resolve_geo_pks(codes):
+    """
+    Map geo codes to GeoArea primary keys with a single query
+    Args:
+        codes (iterable): Geo codes
+    Returns:
+        dict: {code: pk} for the codes already stored
+    """
+    return dict(GeoArea.objects.filter(code__in=list(codes)).values_list('code', 'pk'))
+
+
+class GeoCache:
+    """
+    Persistent geo dictionary per dataset, keyed by a hash of the grid's row IDs.
+
+    The set of geo areas hardly ever changes: when the hash of the row IDs read
+    from the page matches the cached one, the scraper reuses the cached
+    [{'CODE': 'Description'}, ...] list instead of reading every title, and the
+    importer skips the GeoArea upserts.
+    """
+
+    def __init__(self, dataset, directory=None):
+        """
+        Args:
+            dataset (str): Dataset key (see checkpoints.dataset_key)
+            directory (str): Cache directory (defaults to checkpoint_dir())
+        """
+        self.dataset = dataset
+        self.path = os.path.join(directory or checkpoint_dir(), CACHE_FILE)
+
+    def _load(self):
+        """All cached datasets ({} when the file is missing or unreadable)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable geo cache {self.path}: {e}")
+            return {}
+
+    def lookup(self, hash_value):
+        """
+        Args:
+            hash_value (str): headers_hash of the current grid
+        Returns:
+            list: Cached geo_dicts when the hash matches, otherwise None
+        """
+        entry = self._load().get(self.dataset)
+        if entry and entry.get('hash') == hash_value:
+            return entry['geo_dicts']
+        return None
+
+    def cached_geo_dicts(self):
+        """
+        Returns:
+            list: Last cached geo_dicts of the dataset whatever the grid hash ([] when none)
+        """
+        return (self._load().get(self.dataset) or {}).get('geo_dicts', [])
+
+    def save(self, hash_value, geo_dicts):
+        """
+        Store the geo dictionary of a grid (call once its areas are in the database)
+        Args:
+            hash_value (str): headers_hash of the grid
+            geo_dicts (list): [{'CODE': 'Description'}, ...]
+        """
+        cache = self._load()
+        cache[self.dataset] = {
+            'hash': hash_value,
+            'geo_dicts': geo_dicts,
+            'saved_at': datetime.now().isoformat(),
+        }
+        write_json_atomic(self.path, cache)
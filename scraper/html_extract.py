@@ -0,0 +1,67 @@
+import logging
+
+from bs4 import BeautifulSoup
+
+from .eurostat_scraper import EurostatScraper
+
+logger = logging.getLogger(__name__)
+
+# Same selectors as the browser-based extraction in EurostatScraper
+ROW_SELECTOR = "div[role='row'][row-id]"
+CELL_SELECTOR = "div[role='gridcell'][col-id]"
+VALUE_SELECTOR = "span.table-cell.cell-value > span:first-child"
+YEAR_HEADER_SELECTOR = ".ag-header-group-cell .table-header-text"
+GEO_TITLE_SELECTOR = "span.colHeader.header-overflow.table-header-container[title]"
+
+
+def _soup(html):
+    """Parse an HTML snapshot with the standard library parser"""
+    return BeautifulSoup(html, "html.parser")
+
+
+def extract_years_from_html(html):
+    """
+    Extract year headers from a saved grid snapshot
+    Args:
+        html (str): HTML of the grid header (e.g. inspector/index-time-headers.html)
+    Returns:
+        list: Year strings, as _extract_visible_years returns them
+    """
+    headers = (header.get_text().strip() for header in _soup(html).select(YEAR_HEADER_SELECTOR))
+    return [text for text in headers if text.isdigit()]
+
+
+def extract_geo_titles_from_html(html):
+    """
+    Extract GEO titles from a saved grid snapshot
+    Args:
+        html (str): HTML of the pinned left column (e.g. inspector/geo-headers.html)
+    Returns:
+        list: Titles in '[CODE] Description' format
+    """
+    return [element['title'] for element in _soup(html).select(GEO_TITLE_SELECTOR)]
+
+
+def extract_rows_from_html(html):
+    """
+    Extract GDP rows from a saved grid snapshot, mirroring extract_row_data/process_cell
+    Args:
+        html (str): HTML containing grid rows (e.g. inspector/gdp-grid-values.html)
+    Returns:
+        dict: {row_id: {year: {'value', 'flag', 'is_available'}}} with available cells only
+    """
+    gdp_data = {}
+    for row in _soup(html).select(ROW_SELECTOR):
+        row_data = {}
+        for cell in row.select(CELL_SELECTOR):
+            year = cell.get('col-id')
+            if year and year.isdigit():
+                value_element = cell.select_one(VALUE_SELECTOR)
+                raw_value = value_element.get_text().strip() if value_element else ''
+                value_info = EurostatScraper.parse_special_value(raw_value)
+                if value_info['is_available']:
+                    row_data[year] = value_info
+        # Pinned and scrolling containers render the same row-id separately: merge them
+        if row_data:
+            gdp_data.setdefault(row['row-id'], {}).update(row_data)
+    return gdp_data
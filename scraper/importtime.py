@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+# Modules that must not be imported at startup: browser automation and dataframe backends
+HEAVY_MODULES = (
+    'pandas',
+    'selenium.webdriver.remote',
+    'selenium.webdriver.support',
+    'selenium.webdriver.chrome',
+    'webdriver_manager',
+)
+
+# What a command, the admin or an API worker imports after django.setup()
+DEFAULT_TARGETS = (
+    'eurostat_manager.urls',
+    'scraper.admin',
+    'scraper.views',
+    'scraper.eurostat_scraper',
+    'scraper.html_extract',
+)
+
+
+def profile_imports(targets=DEFAULT_TARGETS, executable=None):
+    """
+    Import-time breakdown of a fresh interpreter running django.setup() and importing targets
+    Args:
+        targets (iterable): Dotted module names imported after django.setup()
+        executable (str): Python interpreter (defaults to the current one)
+    Returns:
+        list: One dict per imported module (module, depth, self_us, cumulative_us), in import order
+    Raises:
+        RuntimeError: When the profiled interpreter fails
+    """
+    code = (
+        "import importlib, django; django.setup(); "
+        f"[importlib.import_module(name) for name in {list(targets)!r}]"
+    )
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'eurostat_manager.settings'))
+    # A separate interpreter: modules already imported here would not show up
+    result = subprocess.run(
+        [executable or sys.executable, '-X', 'importtime', '-c', code],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Profiled interpreter failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def parse_importtime(output):
+    """
+    Parse the stderr of `python -X importtime`
+    Args:
+        output (str): Lines like 'import time:       405 |       9097 |   selenium.webdriver.common.by'
+    Returns:
+        list: One dict per module (module, depth, self_us, cumulative_us)
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+    return entries
+
+
+def heavy_imports(entries, heavy=HEAVY_MODULES):
+    """
+    Modules from the profile that belong to a heavy package
+    Args:
+        entries (list): Result of profile_imports
+        heavy (tuple): Package names that must stay lazy
+    Returns:
+        list: Entries whose module is one of heavy or a submodule of it, without their own submodules
+    """
+    found = [entry for entry in entries
+             if any(entry['module'] == name or entry['module'].startswith(f"{name}.") for name in heavy)]
+    names = {entry['module'] for entry in found}
+    return [entry for entry in found if not any(entry['module'].startswith(f"{name}.") for name in names)]
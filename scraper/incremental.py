@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from django.db.models import F, Max, Q
+
+from eurostat_manager import settings
+from .checkpoints import checkpoint_dir, write_json_atomic
+from .models import GDPData, Observation
+from .records import FLAG_BITS
+
+logger = logging.getLogger(__name__)
+
+# Flags marking cells that Eurostat still revises (provisional, estimated)
+VOLATILE_FLAGS = ('p', 'e')
+DEFAULT_FULL_REFRESH_DAYS = 30
+STATE_FILE = "incremental_state_{dataset}.json"
+
+
+def full_refresh_days():
+    """Maximum days between full scrapes (EUROSTAT_CONFIG['FULL_REFRESH_DAYS'])"""
+    return settings.EUROSTAT_CONFIG.get('FULL_REFRESH_DAYS', DEFAULT_FULL_REFRESH_DAYS)
+
+
+class IncrementalPlan:
+    """
+    Which cells an incremental scrape reads and imports.
+
+    Final years are never revised, so only two kinds of cells are volatile:
+    - every cell from the newest stored year onwards (new data arrives there)
+    - older cells currently flagged provisional or estimated
+    """
+
+    def __init__(self, newest_year, volatile_cells):
+        """
+        Args:
+            newest_year (int): Newest year stored for the dataset
+            volatile_cells (set): {(geo code, year)} of older cells flagged p or e
+        """
+        self.newest_year = newest_year
+        self.volatile_cells = volatile_cells
+        self.volatile_years = {year for _, year in volatile_cells}
+
+    def __repr__(self):
+        return (f"<IncrementalPlan years>={self.newest_year}, {len(self.volatile_cells)} p/e cells "
+                f"in {sorted(self.volatile_years)}>")
+
+    @classmethod
+    def from_db(cls, queryset=None):
+        """
+        Build the plan from the stored observations
+        Args:
+            queryset (QuerySet): GDPData rows to consider (defaults to all)
+        Returns:
+            IncrementalPlan: Plan, or None when there is nothing stored yet (a full scrape is needed)
+        """
+        queryset = queryset if queryset is not None else GDPData.objects.all()
+        newest_year = queryset.aggregate(newest=Max('year'))['newest']
+        if newest_year is None:
+            return None
+        volatile = Q()
+        for flag in VOLATILE_FLAGS:
+            volatile |= Q(flag__contains=flag)  # Combined flags, e.g. 'bp'
+        cells = set(
+            queryset.filter(volatile, year__lt=newest_year)
+            .values_list('geo_area__code', 'year')
+            .iterator()
+        )
+        return cls(newest_year, cells)
+
+    @classmethod
+    def from_store(cls, dataset_code):
+        """
+        Build the plan from one dataset of the generic observation store
+        (datasets other than the GDP one are not in GDPData)
+        Args:
+            dataset_code (str): Store dataset code (see checkpoints.dataset_key)
+        Returns:
+            IncrementalPlan: Plan, or None when the dataset has nothing stored yet
+        """
+        queryset = Observation.objects.filter(series__dataset__code=dataset_code)
+        newest_year = queryset.aggregate(newest=Max('period'))['newest']
+        if newest_year is None:
+            return None
+        volatile = sum(FLAG_BITS[flag] for flag in VOLATILE_FLAGS)
+        cells = set(
+            queryset.filter(period__lt=newest_year)
+            .annotate(volatile=F('flag').bitand(volatile))
+            .filter(volatile__gt=0)
+            .values_list('series__key', 'period')
+            .iterator()
+        )
+        return cls(newest_year, cells)
+
+    @property
+    def first_year(self):
+        """Left-most year column the scrape needs"""
+        return min(self.volatile_years | {self.newest_year})
+
+    def wants_column(self, year):
+        """
+        Whether a year column can hold volatile cells
+        Args:
+            year (str | int): Column year
+        """
+        year = int(year)
+        return year >= self.newest_year or year in self.volatile_years
+
+    def wants_cell(self, code, year):
+        """
+        Whether a single cell is volatile
+        Args:
+            code (str): Geo code (row-id)
+            year (str | int): Column year
+        """
+        year = int(year)
+        return year >= self.newest_year or (code, year) in self.volatile_cells
+
+    def filter_row(self, code, row_data):
+        """
+        Keep only the volatile cells of a scraped row
+        Args:
+            code (str): Geo code (row-id)
+            row_data (dict): {year: cell} as returned by extract_row_data
+        Returns:
+            dict: Volatile cells, or None when none is left
+        """
+        cells = {year: cell for year, cell in (row_data or {}).items() if self.wants_cell(code, year)}
+        return cells or None
+
+    def key(self):
+        """Short identifier of the plan, used to keep its extraction checkpoint apart"""
+        return f"inc{self.newest_year}_{len(self.volatile_cells)}"
+
+
+class RefreshState:
+    """
+    Persisted time of the last full scrape of one dataset, to force a full refresh
+    periodically so that drift from incremental runs (e.g. revised final years) is corrected.
+    """
+
+    def __init__(self, dataset, directory=None):
+        """
+        Args:
+            dataset (str): Dataset key (see checkpoints.dataset_key)
+            directory (str): State directory (defaults to checkpoint_dir())
+        """
+        self.path = os.path.join(directory or checkpoint_dir(), STATE_FILE.format(dataset=dataset))
+
+    def last_full_refresh(self):
+        """
+        Returns:
+            datetime: Time of the last successful full scrape, or None
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return datetime.fromisoformat(json.load(f)['last_full_refresh'])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable incremental state {self.path}: {e}")
+            return None
+
+    def full_refresh_due(self, days=None, now=None):
+        """
+        Args:
+            days (int): Maximum days between full scrapes (defaults to full_refresh_days())
+            now (datetime): Current time (for tests)
+        Returns:
+            bool: True when no full scrape happened within the interval
+        """
+        last = self.last_full_refresh()
+        days = full_refresh_days() if days is None else days
+        return last is None or (now or datetime.now()) - last >= timedelta(days=days)
+
+    def mark_full_refresh(self, when=None):
+        """Record a successful full scrape"""
+        write_json_atomic(self.path, {'last_full_refresh': (when or datetime.now()).isoformat()})
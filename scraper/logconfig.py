@@ -0,0 +1,102 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+# Run ID attached to every log record emitted while a scrape run is active
+RUN_ID = contextvars.ContextVar('run_id', default=None)
+
+# Attributes of a plain LogRecord; anything else was passed through extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'run_id'}
+
+
+@contextmanager
+def run_context(run_id):
+    """
+    Tag log records emitted inside the block (and threads started from it) with run_id
+    Args:
+        run_id (str): Identifier of the run, e.g. RunMetrics.run_id
+    """
+    token = RUN_ID.set(run_id)
+    try:
+        yield
+    finally:
+        RUN_ID.reset(token)
+
+
+class RunIdFilter(logging.Filter):
+    """Copy the current run ID onto the record (runs on the logging thread, before queueing)"""
+
+    def filter(self, record):
+        record.run_id = RUN_ID.get()
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """
+    Keep one in every `rate` DEBUG records logged with extra={'sample': key}.
+    Other records always pass, so per-row debug events can stay in hot loops.
+    """
+
+    def __init__(self, rate=100):
+        super().__init__()
+        self.rate = max(int(rate), 1)
+        self.counts = {}
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        if key is None or record.levelno > logging.DEBUG:
+            return True
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        if count % self.rate:
+            return False
+        record.sampled = f"1/{self.rate}"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, run ID, message and extra fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'run_id': getattr(record, 'run_id', None),
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that creates its directory on first write instead of at configuration"""
+
+    def __init__(self, filename, **kwargs):
+        kwargs['delay'] = True
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def start_queue_listeners():
+    """
+    Start the QueueListener of every QueueHandler configured through LOGGING.
+    dictConfig creates the listeners (Python 3.12+) but leaves starting them to the application.
+    """
+    for name in getattr(logging, 'getHandlerNames', lambda: ())():
+        handler = logging.getHandlerByName(name)
+        listener = getattr(handler, 'listener', None)
+        if isinstance(handler, QueueHandler) and listener is not None and listener._thread is None:
+            listener.start()
+            atexit.register(listener.stop)
@@ -0,0 +1,372 @@
+import csv
+import json
+import logging
+import os
+import warnings
+
+import numpy as np
+
+from .models import GDPData, GeoArea, Observation
+from .parsing import parse_cells
+from .records import FLAG_BITS, FLAG_LETTERS
+
+logger = logging.getLogger(__name__)
+
+# File names used when the matrix is persisted to disk
+META_FILE = "meta.json"
+VALUES_FILE = "values.npy"
+AVAILABLE_FILE = "available.npy"
+FLAGS_FILE = "flags.npy"
+
+# Aggregations supported by GDPMatrix.aggregate (NaN-aware NumPy reductions)
+AGGREGATIONS = {
+    'sum': np.nansum,
+    'mean': np.nanmean,
+    'min': np.nanmin,
+    'max': np.nanmax,
+    'median': np.nanmedian,
+}
+
+
+def to_float(value):
+    """
+    Convert a stored GDP value string into a float
+    Args:
+        value (str): Normalized value as stored in GDPData.value
+    Returns:
+        float: Parsed value or NaN when the string is not numeric
+    """
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class GDPMatrix:
+    """
+    Dense in-memory representation of the GDP table (geo × year).
+
+    Key Attributes:
+    - values: float64 matrix of shape (n_geos, n_years), NaN where no value exists
+    - available: boolean mask of cells marked as available
+    - flags: boolean masks of shape (n_flags, n_geos, n_years), one per flag letter
+    - codes / names: geo area codes and names in row order
+    - years: reporting years in column order
+
+    Index maps (code -> row, year -> column) are built on construction so lookups
+    never scan the arrays. Matrices loaded with load() are memory-mapped read-only,
+    so several worker processes can share the same pages without copying.
+    """
+
+    def __init__(self, codes, years, values, available, flags, names=None, flag_letters=FLAG_LETTERS):
+        self.codes = list(codes)
+        self.names = list(names) if names is not None else list(self.codes)
+        self.years = [int(year) for year in years]
+        self.values = values
+        self.available = available
+        self.flags = flags
+        self.flag_letters = tuple(flag_letters)
+        self.code_index = {code: i for i, code in enumerate(self.codes)}
+        self.year_index = {year: j for j, year in enumerate(self.years)}
+        self.flag_index = {flag: k for k, flag in enumerate(self.flag_letters)}
+
+    def __repr__(self):
+        return f"<GDPMatrix {len(self.codes)} geos × {len(self.years)} years>"
+
+    @property
+    def shape(self):
+        """Shape of the value matrix as (n_geos, n_years)"""
+        return self.values.shape
+
+    @classmethod
+    def empty(cls, codes, years, names=None, flag_letters=FLAG_LETTERS):
+        """
+        Allocate an empty matrix for the given axes
+        Args:
+            codes (list): Geo area codes (rows)
+            years (list): Years (columns)
+            names (list): Optional geo area names aligned with codes
+            flag_letters (tuple): Flag letters to allocate masks for
+        Returns:
+            GDPMatrix: Matrix filled with NaN and all masks cleared
+        """
+        shape = (len(codes), len(years))
+        return cls(
+            codes, years,
+            values=np.full(shape, np.nan, dtype=np.float64),
+            available=np.zeros(shape, dtype=bool),
+            flags=np.zeros((len(flag_letters),) + shape, dtype=bool),
+            names=names,
+            flag_letters=flag_letters,
+        )
+
+    @classmethod
+    def from_db(cls, queryset=None):
+        """
+        Build the matrix from the normalized GeoArea/GDPData tables
+        Args:
+            queryset: Optional GDPData queryset to restrict the rows loaded
+        Returns:
+            GDPMatrix: Matrix with one row per geo area and one column per year
+        """
+        if queryset is None:
+            queryset = GDPData.objects.all()
+        geo_rows = list(GeoArea.objects.order_by('code').values_list('id', 'code', 'name'))
+        years = sorted(queryset.order_by().values_list('year', flat=True).distinct())
+        matrix = cls.empty([code for _, code, _ in geo_rows], years, names=[name for _, _, name in geo_rows])
+
+        # Map primary keys to rows once, then stream the observations straight into the arrays
+        row_by_pk = {pk: i for i, (pk, _, _) in enumerate(geo_rows)}
+        records = queryset.order_by().values_list('geo_area_id', 'year', 'value', 'flag', 'is_available')
+        for geo_id, year, value, flag, is_available in records.iterator(chunk_size=5000):
+            i = row_by_pk[geo_id]
+            j = matrix.year_index[year]
+            matrix.values[i, j] = to_float(value)
+            matrix.available[i, j] = is_available
+            for letter in flag or '':  # Combined flags (e.g. 'bp') set several masks
+                k = matrix.flag_index.get(letter)
+                if k is not None:
+                    matrix.flags[k, i, j] = True
+
+        logger.info(f"Built {matrix!r} from database")
+        return matrix
+
+    @classmethod
+    def from_store(cls, dataset_code, codes=None):
+        """
+        Build the matrix from one geo-only dataset of the generic observation store
+        Args:
+            dataset_code (str): Store dataset code (see checkpoints.dataset_key)
+            codes (list): Optional geo codes (series keys) to restrict the rows loaded
+        Returns:
+            GDPMatrix: Matrix with one row per series and one column per period
+        """
+        queryset = Observation.objects.filter(series__dataset__code=dataset_code).order_by()
+        if codes is not None:
+            queryset = queryset.filter(series__key__in=list(codes))
+        keys = sorted(queryset.values_list('series__key', flat=True).distinct())
+        years = sorted(queryset.values_list('period', flat=True).distinct())
+        matrix = cls.empty(keys, years)
+
+        records = queryset.values_list('series__key', 'period', 'value', 'flag')
+        for key, period, value, flag in records.iterator(chunk_size=5000):
+            i = matrix.code_index[key]
+            j = matrix.year_index[period]
+            matrix.values[i, j] = np.nan if value is None else value
+            matrix.available[i, j] = True  # The store only holds available cells
+            for letter, bit in FLAG_BITS.items():
+                k = matrix.flag_index.get(letter)
+                if flag & bit and k is not None:
+                    matrix.flags[k, i, j] = True
+
+        logger.info(f"Built {matrix!r} from store dataset {dataset_code}")
+        return matrix
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Build the matrix from a wide CSV snapshot (geo_area, year_2015, ..., year_2024)
+        Args:
+            path (str): Path to the snapshot CSV (e.g. data/gdp_data_latest.csv),
+                        optionally with inline flags as written by export_gdp_wide --flags inline
+        Returns:
+            GDPMatrix: Matrix keyed by the geo_area column
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = list(reader)
+
+        years = [int(column.removeprefix('year_')) for column in header[1:] if column.startswith('year_')]
+        labels = [row[0] for row in rows]
+        matrix = cls.empty(labels, years)
+
+        # Parse every cell of the snapshot in one vectorized pass
+        cells = [(row[1:len(years) + 1] + [''] * len(years))[:len(years)] for row in rows]
+        values, flag_codes, available = parse_cells([cell for row in cells for cell in row])
+        shape = matrix.shape
+        matrix.values[:] = values.reshape(shape)
+        matrix.available[:] = available.reshape(shape)
+        flag_codes = flag_codes.reshape(shape)
+        for k, letter in enumerate(matrix.flag_letters):
+            matrix.flags[k] = (flag_codes & FLAG_BITS[letter]) != 0
+
+        logger.info(f"Built {matrix!r} from snapshot {path}")
+        return matrix
+
+    def save(self, directory):
+        """
+        Persist the matrix as .npy files plus a JSON index so it can be memory-mapped
+        Args:
+            directory (str): Target directory (created if missing)
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, VALUES_FILE), np.ascontiguousarray(self.values))
+        np.save(os.path.join(directory, AVAILABLE_FILE), np.ascontiguousarray(self.available))
+        np.save(os.path.join(directory, FLAGS_FILE), np.ascontiguousarray(self.flags))
+        with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({
+                'codes': self.codes,
+                'names': self.names,
+                'years': self.years,
+                'flag_letters': list(self.flag_letters),
+            }, f)
+        logger.info(f"Saved {self!r} to {directory}")
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Load a persisted matrix, memory-mapping the arrays by default
+        Args:
+            directory (str): Directory written by save()
+            mmap_mode (str): NumPy mmap mode ('r' shares pages read-only, None loads into RAM)
+        Returns:
+            GDPMatrix: Matrix backed by the files in directory
+        """
+        with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(
+            meta['codes'], meta['years'],
+            values=np.load(os.path.join(directory, VALUES_FILE), mmap_mode=mmap_mode),
+            available=np.load(os.path.join(directory, AVAILABLE_FILE), mmap_mode=mmap_mode),
+            flags=np.load(os.path.join(directory, FLAGS_FILE), mmap_mode=mmap_mode),
+            names=meta['names'],
+            flag_letters=meta['flag_letters'],
+        )
+
+    def _rows(self, codes):
+        """Translate geo codes into row indices (all rows when codes is None)"""
+        if codes is None:
+            return slice(None)
+        return np.array([self.code_index[code] for code in codes], dtype=np.intp)
+
+    def _columns(self, years):
+        """Translate years into column indices (all columns when years is None)"""
+        if years is None:
+            return slice(None)
+        return np.array([self.year_index[int(year)] for year in years], dtype=np.intp)
+
+    def select(self, codes=None, years=None):
+        """
+        Slice the matrix by geo codes and/or years
+        Args:
+            codes (list): Geo codes to keep (None keeps all)
+            years (list): Years to keep (None keeps all)
+        Returns:
+            GDPMatrix: New matrix restricted to the selected rows and columns
+        """
+        rows = self._rows(codes)
+        columns = self._columns(years)
+        row_ids = np.arange(len(self.codes))[rows]
+        col_ids = np.arange(len(self.years))[columns]
+        grid = np.ix_(row_ids, col_ids)
+        return GDPMatrix(
+            [self.codes[i] for i in row_ids],
+            [self.years[j] for j in col_ids],
+            values=self.values[grid],
+            available=self.available[grid],
+            flags=self.flags[(slice(None),) + grid],
+            names=[self.names[i] for i in row_ids],
+            flag_letters=self.flag_letters,
+        )
+
+    def series(self, code):
+        """
+        Return the time series of one geo area
+        Args:
+            code (str): Geo area code
+        Returns:
+            dict: Mapping year -> value for available cells
+        """
+        i = self.code_index[code]
+        mask = self.available[i]
+        return dict(zip(np.asarray(self.years)[mask].tolist(), self.values[i, mask].tolist()))
+
+    def masked_values(self, flag=None):
+        """
+        Values with unavailable cells (and, optionally, cells without flag) set to NaN
+        Args:
+            flag (str): Optional flag letter that cells must carry
+        Returns:
+            numpy.ndarray: Copy of the value matrix with masked cells as NaN
+        """
+        mask = np.asarray(self.available)
+        if flag is not None:
+            mask = mask & self.flags[self.flag_index[flag]]
+        return np.where(mask, self.values, np.nan)
+
+    def flag_mask(self, flag):
+        """Boolean mask of cells carrying the given flag letter"""
+        return self.flags[self.flag_index[flag]]
+
+    def aggregate(self, func='sum', axis='year', codes=None, years=None):
+        """
+        Aggregate available values along one axis
+        Args:
+            func (str): One of AGGREGATIONS ('sum', 'mean', 'min', 'max', 'median')
+            axis (str): 'year' to aggregate across geos per year, 'geo' to aggregate across years per geo
+            codes (list): Optional geo codes to restrict the aggregation
+            years (list): Optional years to restrict the aggregation
+        Returns:
+            dict: Mapping year (or geo code) -> aggregated value
+        """
+        subset = self.select(codes, years) if (codes is not None or years is not None) else self
+        data = subset.masked_values()
+        reducer = AGGREGATIONS[func]
+        # All-NaN slices are expected (e.g. years without data) and simply yield NaN
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if axis == 'year':
+                result = reducer(data, axis=0) if func != 'sum' else _nansum_or_nan(data, axis=0)
+                return dict(zip(subset.years, result.tolist()))
+            if axis == 'geo':
+                result = reducer(data, axis=1) if func != 'sum' else _nansum_or_nan(data, axis=1)
+                return dict(zip(subset.codes, result.tolist()))
+        raise ValueError(f"Unknown axis '{axis}' (expected 'year' or 'geo')")
+
+    def rank(self, year, descending=True, limit=None, codes=None):
+        """
+        Rank geo areas by their value in a given year
+        Args:
+            year (int): Year column to rank by
+            descending (bool): Highest values first when True
+            limit (int): Maximum number of results (None returns all)
+            codes (list): Optional geo codes to restrict the ranking
+        Returns:
+            list: List of (code, value) tuples, unavailable cells excluded
+        """
+        j = self.year_index[int(year)]
+        rows = np.arange(len(self.codes))[self._rows(codes)]
+        column = np.where(self.available[rows, j], self.values[rows, j], np.nan)
+        valid = ~np.isnan(column)
+        rows, column = rows[valid], column[valid]
+        order = np.argsort(-column if descending else column, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return [(self.codes[rows[i]], float(column[i])) for i in order]
+
+    def growth(self, year_from, year_to):
+        """
+        Relative change between two years for every geo area
+        Args:
+            year_from (int): Base year
+            year_to (int): Target year
+        Returns:
+            dict: Mapping geo code -> relative growth (NaN where either value is missing)
+        """
+        data = self.masked_values()
+        base = data[:, self.year_index[int(year_from)]]
+        target = data[:, self.year_index[int(year_to)]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = (target - base) / base
+        return dict(zip(self.codes, result.tolist()))
+
+
+def _nansum_or_nan(data, axis):
+    """np.nansum that returns NaN (not 0) for slices without any available value"""
+    result = np.nansum(data, axis=axis)
+    result[np.isnan(data).all(axis=axis)] = np.nan
+    return result
+
@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from django.db import connection
+
+from eurostat_manager import settings
+from .checkpoints import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every metric written to the Prometheus textfile
+METRIC_PREFIX = "eurostat_scrape"
+
+
+def metrics_dir():
+    """Directory where run metrics are written (EUROSTAT_CONFIG['METRICS_DIR'])"""
+    return settings.EUROSTAT_CONFIG.get('METRICS_DIR', 'metrics')
+
+
+class RunMetrics:
+    """
+    Lightweight per-phase timers and counters for one scrape run.
+
+    Each phase accumulates wall time, number of entries, WebDriver commands
+    and DB queries issued while it was open. Phases can be entered many times
+    (e.g. once per extracted row) and nested; a nested phase's counters are
+    also included in its parent.
+
+    Usage:
+        metrics = RunMetrics()
+        with metrics.track_queries(), metrics.span('import'):
+            ...
+        metrics.write()
+    """
+
+    def __init__(self, run_id=None, dataset=None):
+        """
+        Args:
+            run_id (str): Identifier of the run (random when omitted)
+            dataset (str): Optional dataset name recorded with the metrics
+        """
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.dataset = dataset
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.webdriver_calls = 0
+        self.db_queries = 0
+        self.status = "running"
+        self.extra = {}  # Free-form values attached to the run record (e.g. row counts)
+        self.resources = {}  # RSS/CPU peaks and allocators (see scraper.resources.ResourceMonitor)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Time a phase and attribute WebDriver calls and DB queries to it
+        Args:
+            name (str): Phase name (e.g. 'page_load', 'extract_cells', 'import')
+        """
+        start = time.perf_counter()
+        webdriver_calls = self.webdriver_calls
+        db_queries = self.db_queries
+        try:
+            yield
+        finally:
+            phase = self.phases.setdefault(name, {'seconds': 0.0, 'count': 0, 'webdriver_calls': 0, 'db_queries': 0})
+            phase['seconds'] += time.perf_counter() - start
+            phase['count'] += 1
+            phase['webdriver_calls'] += self.webdriver_calls - webdriver_calls
+            phase['db_queries'] += self.db_queries - db_queries
+
+    def instrument_driver(self, driver):
+        """
+        Count every WebDriver command sent by driver (and its elements)
+        Args:
+            driver: Selenium WebDriver instance
+        """
+        execute = driver.execute
+
+        def counting_execute(*args, **kwargs):
+            self.webdriver_calls += 1
+            return execute(*args, **kwargs)
+
+        driver.execute = counting_execute  # WebElements call back into driver.execute
+        return driver
+
+    def merge(self, other):
+        """
+        Add the counters and phases of another run's metrics, e.g. a shard scraped in a
+        worker thread with its own RunMetrics (phase seconds add up across parallel workers)
+        Args:
+            other (RunMetrics): Metrics to add
+        """
+        self.webdriver_calls += other.webdriver_calls
+        self.db_queries += other.db_queries
+        for name, counters in other.phases.items():
+            phase = self.phases.setdefault(name, {'seconds': 0.0, 'count': 0, 'webdriver_calls': 0, 'db_queries': 0})
+            for key, value in counters.items():
+                phase[key] = phase.get(key, 0) + value
+
+    @contextmanager
+    def track_queries(self):
+        """Count DB queries run on this thread's connection while the block is open"""
+        def counting_wrapper(execute, sql, params, many, context):
+            self.db_queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counting_wrapper):
+            yield
+
+    def finish(self, status="success"):
+        """Mark the run as finished with the given status"""
+        self.status = status
+        self.extra['total_seconds'] = time.perf_counter() - self.start
+
+    def as_dict(self):
+        """JSON run record"""
+        return {
+            'run_id': self.run_id,
+            'dataset': self.dataset,
+            'started_at': self.started_at.isoformat(),
+            'status': self.status,
+            'total_seconds': self.extra.get('total_seconds', time.perf_counter() - self.start),
+            'webdriver_calls': self.webdriver_calls,
+            'db_queries': self.db_queries,
+            'phases': self.phases,
+            'resources': self.resources,
+            'extra': {key: value for key, value in self.extra.items() if key != 'total_seconds'},
+        }
+
+    def to_prometheus(self):
+        """
+        Render the run as Prometheus text exposition format
+        Returns:
+            str: Text suitable for the node_exporter textfile collector
+        """
+        record = self.as_dict()
+        labels = f'dataset="{self.dataset or "default"}"'
+        lines = [
+            f"# HELP {METRIC_PREFIX}_phase_seconds Wall time spent per scrape phase in the last run",
+            f"# TYPE {METRIC_PREFIX}_phase_seconds gauge",
+        ]
+        lines += [f'{METRIC_PREFIX}_phase_seconds{{{labels},phase="{name}"}} {phase["seconds"]:.6f}'
+                  for name, phase in self.phases.items()]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_phase_webdriver_calls WebDriver commands per phase in the last run",
+            f"# TYPE {METRIC_PREFIX}_phase_webdriver_calls gauge",
+        ]
+        lines += [f'{METRIC_PREFIX}_phase_webdriver_calls{{{labels},phase="{name}"}} {phase["webdriver_calls"]}'
+                  for name, phase in self.phases.items()]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_phase_db_queries DB queries per phase in the last run",
+            f"# TYPE {METRIC_PREFIX}_phase_db_queries gauge",
+        ]
+        lines += [f'{METRIC_PREFIX}_phase_db_queries{{{labels},phase="{name}"}} {phase["db_queries"]}'
+                  for name, phase in self.phases.items()]
+        for process in ('python', 'browser'):
+            peak = self.resources.get(process, {}).get('rss_bytes', {}).get('peak')
+            if peak is not None:
+                lines += [
+                    f"# HELP {METRIC_PREFIX}_{process}_peak_rss_bytes Peak resident memory of the {process} "
+                    f"process{' tree' if process == 'browser' else ''} in the last run",
+                    f"# TYPE {METRIC_PREFIX}_{process}_peak_rss_bytes gauge",
+                    f"{METRIC_PREFIX}_{process}_peak_rss_bytes{{{labels}}} {peak}",
+                ]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_duration_seconds Total duration of the last run",
+            f"# TYPE {METRIC_PREFIX}_duration_seconds gauge",
+            f"{METRIC_PREFIX}_duration_seconds{{{labels}}} {record['total_seconds']:.6f}",
+            f"# HELP {METRIC_PREFIX}_success Whether the last run succeeded (1) or failed (0)",
+            f"# TYPE {METRIC_PREFIX}_success gauge",
+            f"{METRIC_PREFIX}_success{{{labels}}} {1 if self.status == 'success' else 0}",
+            f"# HELP {METRIC_PREFIX}_last_run_timestamp_seconds Start time of the last run",
+            f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_last_run_timestamp_seconds{{{labels}}} {self.started_at.timestamp():.0f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory=None):
+        """
+        Write the JSON run record and the Prometheus textfile of the dataset
+        Args:
+            directory (str): Output directory (defaults to metrics_dir())
+        Returns:
+            tuple: (json path, prom path)
+        """
+        directory = directory or metrics_dir()
+        timestamp = self.started_at.strftime('%Y%m%d_%H%M%S')
+        json_path = os.path.join(directory, "runs", f"{timestamp}_{self.run_id}.json")
+        # One textfile per dataset: the collector merges them, a run never hides another dataset's last run
+        prom_name = f"{METRIC_PREFIX}_{self.dataset}.prom" if self.dataset else f"{METRIC_PREFIX}.prom"
+        prom_path = os.path.join(directory, prom_name)
+        write_json_atomic(json_path, self.as_dict())
+
+        # Textfile collectors may read at any time: write to a temp file and rename
+        tmp_path = f"{prom_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, prom_path)
+
+        logger.info(f"Run metrics written to {json_path} and {prom_path}")
+        return json_path, prom_path
+
+    def summary(self):
+        """One-line human readable summary of the slowest phases"""
+        slowest = sorted(self.phases.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        return ", ".join(f"{name}={phase['seconds']:.2f}s" for name, phase in slowest)
+
+
+def load_run_records(directory=None):
+    """
+    Load all JSON run records, oldest first, for trending
+    Args:
+        directory (str): Metrics directory (defaults to metrics_dir())
+    Returns:
+        list: Run record dictionaries
+    """
+    runs_dir = os.path.join(directory or metrics_dir(), "runs")
+    if not os.path.isdir(runs_dir):
+        return []
+    records = []
+    for filename in sorted(os.listdir(runs_dir)):
+        if filename.endswith(".json"):
+            with open(os.path.join(runs_dir, filename), encoding='utf-8') as f:
+                records.append(json.load(f))
+    return records
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0006_gdpdata_geoarea_delete_gdptabledata_gdpdata_geo_area_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gdpdata',
+            name='flag',
+            field=models.CharField(blank=True, choices=[('b', 'Break in time series'), ('p', 'Provisional'), ('e', 'Estimated'), ('c', 'Confidential'), ('d', 'Definition differs'), ('n', 'Not significant'), ('s', 'Eurostat estimate'), ('u', 'Low reliability'), ('z', 'Not applicable'), (None, 'No flag')], max_length=9, null=True),
+        ),
+    ]
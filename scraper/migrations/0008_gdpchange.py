@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-19 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0007_gdpdata_flag_eurostat_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GDPChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('run_id', models.CharField(blank=True, default='', max_length=32)),
+                ('geo_code', models.CharField(max_length=20)),
+                ('year', models.IntegerField()),
+                ('old_value', models.CharField(blank=True, max_length=50, null=True)),
+                ('old_flag', models.CharField(blank=True, max_length=9, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=50, null=True)),
+                ('new_flag', models.CharField(blank=True, max_length=9, null=True)),
+                ('kind', models.CharField(choices=[('insert', 'Insert'), ('update', 'Update')], max_length=6)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'GDP Change',
+                'verbose_name_plural': 'GDP Changes',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['geo_code', 'id'], name='scraper_gdp_geo_cod_6d3d65_idx')],
+            },
+        ),
+    ]
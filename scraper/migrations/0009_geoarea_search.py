@@ -0,0 +1,99 @@
+# Generated by Django 5.1.7 on 2026-10-19 01:51
+
+import unicodedata
+
+from django.db import migrations, models
+
+# Frozen copies of scraper.search as of this migration: migrations must not import app code
+FTS_TABLE = "scraper_geoarea_fts"
+
+
+def fold(text):
+    """Accents removed, case folded, punctuation as spaces (scraper.search.fold)"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(''.join(char if char.isalnum() else ' ' for char in stripped.casefold()).split())
+
+
+def search_document(code, name, notes=None):
+    """Indexed search text of a geo area (scraper.search.search_document)"""
+    return ' ' + ' '.join(part for part in (fold(code), fold(name), fold(notes)) if part)
+
+
+# Note: Django rebuilds SQLite tables for most AlterField operations, which drops these
+# triggers; a later migration altering GeoArea must run SQLITE_INDEX's triggers again.
+SQLITE_INDEX = [
+    # External-content FTS5 table over scraper_geoarea.search_text, kept in sync by triggers
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"search_text, content='scraper_geoarea', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON scraper_geoarea BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON scraper_geoarea BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF search_text ON scraper_geoarea BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+        INSERT INTO {FTS_TABLE}(rowid, search_text) VALUES (new.id, new.search_text);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_INDEX = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX scraper_geoarea_search_trgm ON scraper_geoarea USING gin (search_text gin_trgm_ops)",
+]
+POSTGRES_DROP = ["DROP INDEX IF EXISTS scraper_geoarea_search_trgm"]
+
+
+def fill_search_text(apps, schema_editor):
+    """Fold the code, name and notes of the existing areas"""
+    GeoArea = apps.get_model('scraper', 'GeoArea')
+    areas = list(GeoArea.objects.all())
+    for area in areas:
+        area.search_text = search_document(area.code, area.name, area.notes)
+    GeoArea.objects.bulk_update(areas, ['search_text'], batch_size=500)
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """FTS5 on SQLite, pg_trgm GIN index on Postgres; other backends scan search_text"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_INDEX)
+    elif vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_DROP)
+    elif vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_DROP)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0008_gdpchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geoarea',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,188 @@
+# Generated by Django 5.1.7 on 2026-10-19 01:57
+
+import hashlib
+import math
+import os
+import django.db.models.deletion
+from itertools import islice
+from django.db import migrations, models
+
+# Frozen copies of scraper.records / scraper.store / scraper.checkpoints as of this
+# migration: migrations must not import app code or read the Django settings
+BACKFILL_BATCH_SIZE = 5000
+GEO_DIMENSION = 'geo'
+DEFAULT_GDP_DATASET = 'gdp'
+FLAG_BITS = {letter: 1 << i for i, letter in enumerate('bpecdnsuz')}
+MAX_DECIMALS = 127
+
+
+def encode_flag(flag):
+    """Flag letters as a bitmask (scraper.records.encode_flag)"""
+    code = 0
+    for letter in flag or '':
+        code |= FLAG_BITS.get(letter, 0)
+    return code
+
+
+def parse_number(value):
+    """(float or NaN, decimals) of a plain number text (scraper.records.parse_number)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return math.nan, 0
+    _, dot, fraction = value.partition('.')
+    decimals = len(fraction) if dot else 0
+    if not math.isfinite(number) or decimals > MAX_DECIMALS or f"{number:.{decimals}f}" != value:
+        return math.nan, 0
+    return number, decimals
+
+
+def gdp_dataset_code():
+    """Dataset code of EUROSTAT_BASE_URL (scraper.store.gdp_dataset_code / checkpoints.dataset_key)"""
+    url = os.getenv('EUROSTAT_BASE_URL')
+    if not url:
+        return DEFAULT_GDP_DATASET
+    _, view, rest = url.partition('/view/')
+    code = rest.split('/')[0].split('?')[0]
+    if view and code:
+        return code
+    return hashlib.sha1(url.encode()).hexdigest()[:12]
+
+
+def backfill_gdp(apps, schema_editor):
+    """Copy the available GDPData observations into the GDP dataset of the store"""
+    GDPData = apps.get_model('scraper', 'GDPData')
+    GeoArea = apps.get_model('scraper', 'GeoArea')
+    Dataset = apps.get_model('scraper', 'Dataset')
+    Dimension = apps.get_model('scraper', 'Dimension')
+    Code = apps.get_model('scraper', 'Code')
+    Series = apps.get_model('scraper', 'Series')
+    Observation = apps.get_model('scraper', 'Observation')
+    if not GDPData.objects.exists():
+        return
+    dataset = Dataset.objects.create(code=gdp_dataset_code(), title='GDP')
+    dimension = Dimension.objects.create(dataset=dataset, code=GEO_DIMENSION, position=0)
+    areas = list(GeoArea.objects.values_list('id', 'code', 'name'))
+    Code.objects.bulk_create([Code(dimension=dimension, code=code, label=name) for _, code, name in areas],
+                             batch_size=BACKFILL_BATCH_SIZE)
+    Series.objects.bulk_create([Series(dataset=dataset, key=code) for _, code, _ in areas],
+                               batch_size=BACKFILL_BATCH_SIZE)
+    code_pks = dict(Code.objects.filter(dimension=dimension).values_list('code', 'pk'))
+    series_pks = dict(Series.objects.filter(dataset=dataset).values_list('key', 'pk'))
+    Series.codes.through.objects.bulk_create(
+        [Series.codes.through(series_id=series_pks[code], code_id=code_pks[code]) for code in series_pks],
+        batch_size=BACKFILL_BATCH_SIZE,
+    )
+    area_series = {area_id: series_pks[code] for area_id, code, _ in areas}
+
+    def observations():
+        rows = GDPData.objects.filter(is_available=True).values_list('geo_area_id', 'year', 'value', 'flag')
+        for geo_area_id, year, value, flag in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+            number, decimals = parse_number(value)
+            yield Observation(series_id=area_series[geo_area_id], period=year,
+                              value=None if number != number else number,  # NaN: not numeric
+                              decimals=decimals, flag=encode_flag(flag))
+
+    pending = observations()
+    while chunk := list(islice(pending, BACKFILL_BATCH_SIZE)):
+        Observation.objects.bulk_create(chunk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0009_geoarea_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Dataset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=64, unique=True)),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('unit', models.CharField(blank=True, default='', max_length=64)),
+                ('frequency', models.CharField(blank=True, default='A', max_length=8)),
+                ('source_url', models.URLField(blank=True, default='', max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Observation',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('period', models.SmallIntegerField()),
+                ('value', models.FloatField(null=True)),
+                ('decimals', models.SmallIntegerField(default=0)),
+                ('flag', models.SmallIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Dimension',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=32)),
+                ('label', models.CharField(blank=True, default='', max_length=255)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dimensions', to='scraper.dataset')),
+            ],
+            options={
+                'ordering': ['dataset', 'position'],
+                'unique_together': {('dataset', 'code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Code',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=50)),
+                ('label', models.CharField(blank=True, default='', max_length=255)),
+                ('dimension', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='codes', to='scraper.dimension')),
+            ],
+            options={
+                'ordering': ['dimension', 'code'],
+                'unique_together': {('dimension', 'code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='GDPObservation',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'GDP Observation',
+                'verbose_name_plural': 'GDP Observations',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('scraper.observation',),
+        ),
+        migrations.CreateModel(
+            name='Series',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('codes', models.ManyToManyField(related_name='series', to='scraper.code')),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='scraper.dataset')),
+            ],
+            options={
+                'verbose_name_plural': 'Series',
+                'ordering': ['dataset', 'key'],
+                'unique_together': {('dataset', 'key')},
+            },
+        ),
+        migrations.AddField(
+            model_name='observation',
+            name='series',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='observations', to='scraper.series'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='observation',
+            unique_together={('series', 'period')},
+        ),
+        migrations.RunPython(backfill_gdp, migrations.RunPython.noop),
+    ]
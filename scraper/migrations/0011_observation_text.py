@@ -0,0 +1,67 @@
+# Generated by Django 5.1.7 on 2026-10-19 02:37
+
+import hashlib
+import os
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of scraper.store / scraper.checkpoints as of this migration:
+# migrations must not import app code or read the Django settings
+BACKFILL_BATCH_SIZE = 5000
+DEFAULT_GDP_DATASET = 'gdp'
+
+
+def gdp_dataset_code():
+    """Dataset code of EUROSTAT_BASE_URL (scraper.store.gdp_dataset_code / checkpoints.dataset_key)"""
+    url = os.getenv('EUROSTAT_BASE_URL')
+    if not url:
+        return DEFAULT_GDP_DATASET
+    _, view, rest = url.partition('/view/')
+    code = rest.split('/')[0].split('?')[0]
+    if view and code:
+        return code
+    return hashlib.sha1(url.encode()).hexdigest()[:12]
+
+
+def backfill_texts(apps, schema_editor):
+    """
+    Copy the GDPData text of the observations backfilled by 0010 that their value
+    cannot rebuild: non-numeric cells (NULL value) and '-0' (SQLite drops the sign)
+    """
+    GDPData = apps.get_model('scraper', 'GDPData')
+    Observation = apps.get_model('scraper', 'Observation')
+    ObservationText = apps.get_model('scraper', 'ObservationText')
+    candidates = (Observation.objects.filter(series__dataset__code=gdp_dataset_code())
+                  .filter(models.Q(value__isnull=True) | models.Q(value=0)))
+    observations = {
+        (key, period): (pk, None if value is None else f"{value:.{decimals}f}")
+        for pk, key, period, value, decimals in candidates.values_list('pk', 'series__key', 'period', 'value', 'decimals')
+        .iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    }
+    if not observations:
+        return
+    rows = GDPData.objects.filter(is_available=True, value__isnull=False).values_list('geo_area__code', 'year', 'value')
+    texts = []
+    for code, year, value in rows.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        pk, rebuilt = observations.get((code, year), (None, None))
+        if pk is not None and value != rebuilt:
+            texts.append(ObservationText(observation_id=pk, text=value))
+    ObservationText.objects.bulk_create(texts, batch_size=BACKFILL_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraper', '0010_observation_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObservationText',
+            fields=[
+                ('observation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='text', serialize=False, to='scraper.observation')),
+                ('text', models.CharField(max_length=50)),
+            ],
+        ),
+        migrations.RunPython(backfill_texts, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,47 @@
-from django.db import models
+from django.db import models, transaction
+
+# GeoArea fields the search text is built from
+SEARCH_FIELDS = frozenset(('code', 'name', 'notes'))
+SEARCH_REFRESH_BATCH = 500  # Areas re-read per query when refreshing search_text after update()
+
+class GeoAreaQuerySet(models.QuerySet):
+    """
+    Keeps GeoArea.search_text in sync on the bulk paths that bypass GeoArea.save():
+    update(), bulk_create() and bulk_update(). Raw SQL writes are not covered.
+    """
+
+    def update(self, **kwargs):
+        """update(); when code, name or notes change, the search text of the updated rows is recomputed"""
+        if not SEARCH_FIELDS & kwargs.keys():
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            updated = super().update(**kwargs)
+            # Values may be expressions (F, Concat...): read back what was written
+            for start in range(0, len(pks), SEARCH_REFRESH_BATCH):
+                areas = list(self.model._base_manager.using(self.db)
+                             .filter(pk__in=pks[start:start + SEARCH_REFRESH_BATCH])
+                             .only('pk', *SEARCH_FIELDS))
+                for area in areas:
+                    area.refresh_search_text()
+                self.model._base_manager.using(self.db).bulk_update(areas, ['search_text'])
+        return updated
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create() with the search text of every area filled in"""
+        objs = list(objs)
+        for area in objs:
+            area.refresh_search_text()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """bulk_update(); the search text is written too when code, name or notes are"""
+        objs = list(objs)
+        if SEARCH_FIELDS & set(fields):
+            for area in objs:
+                area.refresh_search_text()
+            fields = [*fields, 'search_text']
+        return super().bulk_update(objs, fields, *args, **kwargs)
 
 class GeoArea(models.Model):
     """
@@ -11,8 +54,12 @@ class GeoArea(models.Model):
     - is_eu: Flag for EU member states
     - is_euro_area: Flag for Eurozone members
     - notes: Additional contextual information
+    - search_text: Accent-folded code, name and notes for the search index
     
     The model automatically tracks creation and modification timestamps.
+    search_text is derived in Python (see scraper.search.fold), so it is refreshed by
+    save() and by the GeoAreaQuerySet bulk methods; writes through raw SQL must call
+    refresh_search_text() and save the field themselves.
     """
     code = models.CharField(max_length=20, unique=True)  # Example: EU27_2020, EA, XK
     name = models.CharField(max_length=255)  # Full descriptive name
@@ -20,9 +67,29 @@ class GeoArea(models.Model):
     is_eu = models.BooleanField(default=False)  # European Union member flag
     is_euro_area = models.BooleanField(default=False)  # Euro area member flag
     notes = models.TextField(blank=True, null=True)  # For special cases like Kosovo's UN status
+    # Folded code, name and notes (see scraper.search); indexed by FTS5 on SQLite, pg_trgm on Postgres
+    search_text = models.TextField(blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)  # Automatic creation timestamp
     updated_at = models.DateTimeField(auto_now=True)  # Automatic update timestamp
     
+    objects = GeoAreaQuerySet.as_manager()
+
+    def refresh_search_text(self):
+        """Recompute search_text from code, name and notes (not saved)"""
+        from .search import search_document
+        self.search_text = search_document(self.code, self.name, self.notes)
+
+    def save(self, *args, **kwargs):
+        """Keep the search text in sync with code, name and notes"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.refresh_search_text()
+        elif SEARCH_FIELDS & set(update_fields):
+            # update_or_create() saves only the changed fields
+            self.refresh_search_text()
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """String representation for admin interface and debugging"""
         return f"{self.code} - {self.name}"
@@ -41,7 +108,7 @@ class GDPData(models.Model):
     - geo_area: ForeignKey to GeoArea (parent region)
     - year: The reporting year
     - value: Original GDP value as string (preserves formatting)
-    - flag: Data quality indicator (b=break, p=provisional, e=estimated)
+    - flag: Data quality flag letters (b=break, p=provisional, e=estimated, ...; may be combined)
     - is_available: Availability status
     
     The model includes automatic timestamps and enforces unique year-area combinations.
@@ -57,15 +124,22 @@ class GDPData(models.Model):
     # Original GDP value stored as string to preserve formatting (e.g., decimals, spaces)
     value = models.CharField(max_length=50, null=True, blank=True)  
     
-    # Data quality flags with predefined choices
+    # Data quality flags with predefined choices (Eurostat flag codes)
     FLAG_CHOICES = [
         ('b', 'Break in time series'),  # Indicates methodological breaks
         ('p', 'Provisional'),  # Preliminary data subject to revision
         ('e', 'Estimated'),  # Expert estimation
+        ('c', 'Confidential'),  # Value withheld for confidentiality
+        ('d', 'Definition differs'),  # See metadata for the national definition
+        ('n', 'Not significant'),  # Value rounded to zero
+        ('s', 'Eurostat estimate'),  # Estimated by Eurostat
+        ('u', 'Low reliability'),  # Use with caution
+        ('z', 'Not applicable'),  # Concept not applicable
         (None, 'No flag'),  # Default case
     ]
+    # Combined flags (e.g. 'bp') are stored as their letters in FLAG_CHOICES order
     flag = models.CharField(
-        max_length=1, 
+        max_length=9, 
         choices=FLAG_CHOICES, 
         null=True, 
         blank=True
@@ -87,4 +161,229 @@ class GDPData(models.Model):
         """Human-readable representation showing availability/status"""
         status = ("unavailable" if not self.is_available 
                  else f"{self.value}{f'({self.flag})' if self.flag else ''}")
-        return f"{self.geo_area.code} [{self.year}]: {status}"
\ No newline at end of file
+        return f"{self.geo_area.code} [{self.year}]: {status}"
+
+class GDPChange(models.Model):
+    """
+    Append-only change log of GDPData, written by the importer in the same
+    transaction as the observation it describes.
+
+    Key Attributes:
+    - id: Auto-increment cursor; consumers pull changes with id > last seen id
+    - run_id: Scrape run that made the change (RunMetrics.run_id)
+    - geo_code / year: Observation that changed
+    - old_value / old_flag: Previous value and flag (None for inserts)
+    - new_value / new_flag: Value and flag written
+    - kind: 'insert' for a new observation, 'update' for a revised one
+
+    Unchanged observations produce no rows, so the log grows with the change volume.
+    """
+    KIND_CHOICES = [
+        ('insert', 'Insert'),  # Observation seen for the first time
+        ('update', 'Update'),  # Value, flag or availability revised
+    ]
+    id = models.BigAutoField(primary_key=True)  # Change cursor (indexed as primary key)
+    run_id = models.CharField(max_length=32, blank=True, default='')
+    geo_code = models.CharField(max_length=20)
+    year = models.IntegerField()
+    old_value = models.CharField(max_length=50, null=True, blank=True)
+    old_flag = models.CharField(max_length=9, null=True, blank=True)
+    new_value = models.CharField(max_length=50, null=True, blank=True)
+    new_flag = models.CharField(max_length=9, null=True, blank=True)
+    kind = models.CharField(max_length=6, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Metadata options for the GDPChange model"""
+        verbose_name = "GDP Change"  # Singular name in admin
+        verbose_name_plural = "GDP Changes"  # Plural name in admin
+        ordering = ['id']  # Log order is cursor order
+        indexes = [
+            models.Index(fields=['geo_code', 'id']),  # Changes of one area since a cursor
+        ]
+
+    def __str__(self):
+        """Human-readable representation of the change"""
+        old = f"{self.old_value}{f'({self.old_flag})' if self.old_flag else ''}"
+        new = f"{self.new_value}{f'({self.new_flag})' if self.new_flag else ''}"
+        return f"#{self.id} {self.kind} {self.geo_code} [{self.year}]: {old} -> {new}"
+
+class Dataset(models.Model):
+    """
+    A Eurostat table in the generic observation store (e.g. nama_10_gdp).
+
+    Key Attributes:
+    - code: Dataset code, as in the data browser URL (see checkpoints.dataset_key)
+    - title: Descriptive title
+    - unit / frequency: Unit of measure and frequency ('A' annual) shared by every series
+    - source_url: Data browser page the observations were scraped from
+
+    Time is not a dimension: it is the period of every Observation.
+    """
+    code = models.CharField(max_length=64, unique=True)
+    title = models.CharField(max_length=255, blank=True, default='')
+    unit = models.CharField(max_length=64, blank=True, default='')
+    frequency = models.CharField(max_length=8, blank=True, default='A')
+    source_url = models.URLField(max_length=500, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Metadata options for the Dataset model"""
+        ordering = ['code']
+
+    def __str__(self):
+        """String representation for admin interface and debugging"""
+        return f"{self.code} - {self.title}" if self.title else self.code
+
+class Dimension(models.Model):
+    """
+    A dimension of a dataset other than time (e.g. geo, unit, na_item).
+    position is its place in the series keys of the dataset.
+    """
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='dimensions')
+    code = models.CharField(max_length=32)  # Example: geo
+    label = models.CharField(max_length=255, blank=True, default='')
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        """Metadata options for the Dimension model"""
+        unique_together = ('dataset', 'code')
+        ordering = ['dataset', 'position']
+
+    def __str__(self):
+        """String representation for admin interface and debugging"""
+        return f"{self.dataset.code}.{self.code}"
+
+class Code(models.Model):
+    """
+    Dictionary entry of a dimension: a code and its label (e.g. geo AT - Austria).
+    Series reference codes, so labels are stored once per dimension.
+    """
+    dimension = models.ForeignKey(Dimension, on_delete=models.CASCADE, related_name='codes')
+    code = models.CharField(max_length=50)  # Example: EU27_2020
+    label = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        """Metadata options for the Code model"""
+        unique_together = ('dimension', 'code')
+        ordering = ['dimension', 'code']
+
+    def __str__(self):
+        """String representation for admin interface and debugging"""
+        return f"{self.code} - {self.label}"
+
+class Series(models.Model):
+    """
+    One combination of dimension codes of a dataset; its observations vary only in time.
+
+    Key Attributes:
+    - key: Codes in dimension order joined with '.', as in SDMX keys (e.g. 'AT' for a geo-only dataset)
+    - codes: The Code of every dimension, for filtering series by code
+    """
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='series')
+    key = models.CharField(max_length=255)
+    codes = models.ManyToManyField(Code, related_name='series')
+
+    class Meta:
+        """Metadata options for the Series model"""
+        verbose_name_plural = "Series"
+        unique_together = ('dataset', 'key')
+        ordering = ['dataset', 'key']
+
+    def __str__(self):
+        """String representation for admin interface and debugging"""
+        return f"{self.dataset.code}:{self.key}"
+
+class Observation(models.Model):
+    """
+    Narrow fact table of the generic store: one row per series and period,
+    integer keys and numbers only (no strings, no timestamps), so tens of
+    millions of rows stay compact. Loaded in bulk by scraper.store.
+
+    Key Attributes:
+    - series: Integer key of the series (dataset and dimension codes)
+    - period: Reporting period (year for annual datasets)
+    - value: Numeric value, NULL when the cell text is not numeric (see ObservationText)
+    - decimals: Decimals of the scraped text, so GDPData.value round-trips exactly
+    - flag: Flag bitmask (see records.encode_flag; 0 is no flag)
+    """
+    id = models.BigAutoField(primary_key=True)
+    series = models.ForeignKey(Series, on_delete=models.CASCADE, related_name='observations')
+    period = models.SmallIntegerField()
+    value = models.FloatField(null=True)
+    decimals = models.SmallIntegerField(default=0)
+    flag = models.SmallIntegerField(default=0)
+
+    class Meta:
+        """Metadata options for the Observation model"""
+        unique_together = ('series', 'period')  # Also the index of series lookups
+
+    @property
+    def value_text(self):
+        """Value as scraped: its ObservationText when it has one, else the rebuilt number"""
+        from .records import format_number
+        text = getattr(self, 'text', None)  # No ObservationText: AttributeError subclass
+        if text is not None:
+            return text.text
+        return format_number(self.value, self.decimals) if self.value is not None else None
+
+    def __str__(self):
+        """Human-readable representation: series, period, value and flag"""
+        from .records import decode_flag
+        flag = decode_flag(self.flag)
+        return f"{self.series_id} [{self.period}]: {self.value_text}{f'({flag})' if flag else ''}"
+
+class ObservationText(models.Model):
+    """
+    Original text of an observation that its value cannot rebuild: cells that are not
+    a plain number (value is NULL, e.g. '3,617,450.0' or '1e5') and '-0' (SQLite drops
+    the sign of zero). A sparse side table, so Observation stays numeric; maintained
+    by store.load_batch.
+    """
+    observation = models.OneToOneField(Observation, on_delete=models.CASCADE, primary_key=True, related_name='text')
+    text = models.CharField(max_length=50)  # Same length as GDPData.value
+
+    def __str__(self):
+        """String representation for admin interface and debugging"""
+        return f"{self.observation_id}: {self.text}"
+
+class GDPObservationManager(models.Manager):
+    """Observations of the GDP dataset (see store.gdp_dataset_code)"""
+
+    def get_queryset(self):
+        from .store import gdp_dataset_code
+        return (super().get_queryset().filter(series__dataset__code=gdp_dataset_code())
+                .select_related('series', 'text'))
+
+class GDPObservation(Observation):
+    """
+    Compatibility layer: GDP observations of the generic store with the
+    attributes of GDPData (geo_code, year, value text, flag letters).
+    """
+    objects = GDPObservationManager()
+
+    class Meta:
+        """Metadata options for the GDPObservation proxy"""
+        proxy = True
+        verbose_name = "GDP Observation"
+        verbose_name_plural = "GDP Observations"
+
+    @property
+    def geo_code(self):
+        """Geo code of the series (the GDP dataset has the geo dimension only)"""
+        return self.series.key
+
+    @property
+    def year(self):
+        return self.period
+
+    @property
+    def flag_letters(self):
+        """Flag as stored in GDPData.flag"""
+        from .records import decode_flag
+        return decode_flag(self.flag)
+
+    def __str__(self):
+        """Same rendering as GDPData.__str__"""
+        return f"{self.geo_code} [{self.year}]: {self.value_text}{f'({self.flag_letters})' if self.flag_letters else ''}"
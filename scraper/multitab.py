@@ -0,0 +1,329 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import TimeoutException
+
+from eurostat_manager import settings
+from .eurostat_scraper import EurostatScraper
+from .records import ObservationBatch
+from .resources import driver_pid, process_tree_rss
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABS = 4
+POLL_SECONDS = 0.25       # Readiness polling interval per tab
+READY_TIMEOUT = 60        # Seconds a tab may take until its grid is present
+ROWS_PER_SLICE = 25       # Rows extracted before other tabs get the browser
+RSS_SAMPLE_SECONDS = 0.5  # Browser memory sampling interval in benchmarks
+
+# Grid present and the document fully loaded (checked without blocking the browser)
+READY_SCRIPT = """
+const grid = document.querySelector('#estat-content-view-table');
+return document.readyState === 'complete' && !!grid && !!grid.querySelector("div[role='row'][row-id]");
+"""
+
+
+def configured_datasets():
+    """
+    Datasets to scrape together (EUROSTAT_CONFIG['DATASETS'], or the single BASE_URL)
+    Returns:
+        dict: {name: url}
+    """
+    datasets = settings.EUROSTAT_CONFIG.get('DATASETS') or {}
+    if not datasets and settings.EUROSTAT_CONFIG.get('BASE_URL'):
+        datasets = {'gdp': settings.EUROSTAT_CONFIG['BASE_URL']}
+    return dict(datasets)
+
+
+class MultiTabScraper:
+    """
+    Scrape several datasets with one Chrome instance, one tab per dataset.
+
+    Tabs start loading their dataset URL without blocking the browser, and an
+    asyncio scheduler drives them: each tab is polled until its grid is present,
+    then rendered and extracted in short steps. WebDriver talks to one tab at a
+    time, so every step holds the browser lock and focuses its tab first; the
+    waits between steps (page loads, scroll settling) are spent on other tabs
+    instead of sleeping. Memory is that of one browser plus one renderer per
+    open tab, instead of one full browser per dataset.
+
+    Usage:
+        with MultiTabScraper({'gdp': url1, 'gdp_pc': url2}, tabs=2) as scraper:
+            results = scraper.run()  # {name: (geo_dicts, years, ObservationBatch)}
+    """
+
+    def __init__(self, datasets=None, tabs=None, headless=True, metrics=None, resume=True,
+                 accept_consent=True, ready_timeout=READY_TIMEOUT):
+        """
+        Args:
+            datasets (dict): {name: url} (defaults to configured_datasets())
+            tabs (int): Tabs loading concurrently (defaults to EUROSTAT_CONFIG['TABS'])
+            headless (bool): Whether to run browser in headless mode
+            metrics (RunMetrics): Optional run metrics of the shared browser
+            resume (bool): Reuse rows from matching extraction checkpoints
+            accept_consent (bool): Look for the cookie banner in the first tab (the cookie covers the others)
+            ready_timeout (float): Seconds a tab may take until its grid is present
+        """
+        self.datasets = dict(datasets or configured_datasets())
+        self.tabs = max(1, tabs or settings.EUROSTAT_CONFIG.get('TABS', DEFAULT_TABS))
+        self.resume = resume
+        self.accept_consent = accept_consent
+        self.ready_timeout = ready_timeout
+        self.browser = EurostatScraper(headless=headless, metrics=metrics)
+        self.scrapers = {}  # name -> EurostatScraper working in that dataset's tab
+        self.errors = {}    # name -> exception for datasets that failed
+        self.timings = {}   # name -> seconds from opening the tab to the last row
+        self._lock = None
+        self._slots = None
+
+    def __enter__(self):
+        """Start the shared browser"""
+        self.browser.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Release the tab scrapers and quit the browser"""
+        for scraper in self.scrapers.values():
+            scraper.screenshots.close()
+            if scraper.checkpoint:
+                scraper.checkpoint.close()
+        self.browser.__exit__(exc_type, exc_value, traceback)
+
+    @property
+    def driver(self):
+        return self.browser.driver
+
+    def run(self):
+        """
+        Extract every dataset; a failing dataset does not stop the others
+        Returns:
+            dict: {name: (geo_dicts, years, ObservationBatch)} for the datasets that succeeded
+                  (failures are logged and kept in self.errors)
+        """
+        if not self.driver:
+            raise RuntimeError("Driver not initialized. Use MultiTabScraper as a context manager.")
+        return asyncio.run(self._run_all())
+
+    async def _run_all(self):
+        """Schedule one task per dataset, at most self.tabs open at a time"""
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.tabs)
+        names = list(self.datasets)
+        outcomes = await asyncio.gather(
+            *(self._run_dataset(name, index == 0) for index, name in enumerate(names)),
+            return_exceptions=True)
+        results = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Dataset {name} failed: {outcome.__class__.__name__}: {outcome}")
+                self.errors[name] = outcome
+            else:
+                results[name] = outcome
+        logger.info(f"Multi-tab run: {len(results)} of {len(names)} datasets extracted with {self.tabs} tabs")
+        return results
+
+    async def _run_dataset(self, name, first):
+        """
+        Open a tab for one dataset, wait for its grid, render and extract it, close the tab
+        Args:
+            name (str): Dataset name
+            first (bool): First dataset: works in the browser's initial tab and accepts cookies
+        Returns:
+            tuple: (geo_dicts, years, ObservationBatch)
+        """
+        url = self.datasets[name]
+        scraper = EurostatScraper(resume=self.resume, max_retries=0, base_url=url,
+                                  accept_consent=self.accept_consent and first)
+        scraper.driver, scraper.wait = self.driver, self.browser.wait
+        scraper.page_loaded = True
+        self.scrapers[name] = scraper
+        async with self._slots:
+            start = time.perf_counter()
+            async with self._lock:
+                handle = self._open_tab(url, reuse_current=first)
+            logger.info(f"Tab for {name} opened: {url}")
+            try:
+                await self._drive(handle, self._ready_steps(name))
+                await self._drive(handle, scraper._render_steps())
+                batch = await self._drive(handle, self._extract_steps(scraper))
+            finally:
+                async with self._lock:
+                    self._close_tab(handle)
+            self.timings[name] = time.perf_counter() - start
+        geo_dicts, years = scraper._grid
+        logger.info(f"Dataset {name}: {batch!r} for {len(years)} years in {self.timings[name]:.1f}s")
+        return geo_dicts, years, batch
+
+    async def _drive(self, handle, steps):
+        """
+        Advance a step generator in its tab; the browser is only held during a step
+        Args:
+            handle (str): Window handle of the tab
+            steps (generator): Yields seconds to wait between steps
+        Returns:
+            object: Return value of the generator
+        """
+        while True:
+            async with self._lock:
+                self.driver.switch_to.window(handle)
+                try:
+                    delay = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+            await asyncio.sleep(delay)
+
+    def _ready_steps(self, name):
+        """
+        Poll a tab until its grid is present
+        Yields:
+            float: Polling interval
+        Raises:
+            TimeoutException: When the grid is not there within ready_timeout
+        """
+        deadline = time.monotonic() + self.ready_timeout
+        while not self.driver.execute_script(READY_SCRIPT):
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"Grid of {name} not ready after {self.ready_timeout}s")
+            yield POLL_SECONDS
+
+    @staticmethod
+    def _extract_steps(scraper):
+        """
+        Extract a rendered grid into an ObservationBatch, giving way to other tabs every ROWS_PER_SLICE rows
+        Yields:
+            float: 0 (just let other tabs run)
+        Returns:
+            ObservationBatch: Extracted observations
+        """
+        geo_dicts, _ = scraper._grid
+        batch = ObservationBatch()
+        for geo_dict in geo_dicts:
+            for code, name in geo_dict.items():
+                batch.add_geo(code, name)
+        for count, (row_id, row_data) in enumerate(scraper.iter_gdp_rows(), 1):
+            batch.add_listed_row(row_id, row_data)
+            if count % ROWS_PER_SLICE == 0:
+                yield 0
+        return batch
+
+    def _open_tab(self, url, reuse_current=False):
+        """
+        Start loading url in a new tab without waiting for the page
+        Args:
+            url (str): Dataset URL
+            reuse_current (bool): Use the browser's initial tab instead of opening one
+        Returns:
+            str: Window handle of the tab
+        """
+        if not reuse_current:
+            self.driver.switch_to.new_window('tab')
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        return self.driver.current_window_handle
+
+    def _close_tab(self, handle):
+        """Close a finished tab, keeping the last one so the browser session stays alive"""
+        handles = self.driver.window_handles
+        if len(handles) > 1 and handle in handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+            self.driver.switch_to.window(next(h for h in handles if h != handle))
+
+
+class _RssSampler:
+    """Peak resident memory of the browsers started by a benchmark, sampled from a thread"""
+
+    def __init__(self, drivers):
+        """
+        Args:
+            drivers (callable): Returns the live Selenium drivers to measure
+        """
+        self.drivers = drivers
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            sizes = [process_tree_rss(pid) for pid in map(driver_pid, self.drivers()) if pid]
+            if sizes and None not in sizes:
+                self.peak = max(self.peak or 0, sum(sizes))
+
+
+def _throughput(case, datasets, tabs, seconds, extracted, peak_bytes):
+    """Result dict of one browser benchmark case"""
+    per_minute = extracted * 60 / seconds if seconds else 0.0
+    return {
+        'suite': 'browsers',
+        'case': case,
+        'datasets': datasets,
+        'tabs': tabs,
+        'extracted': extracted,
+        'seconds': seconds,
+        'datasets_per_minute': per_minute,
+        'peak_bytes': peak_bytes,
+        'datasets_per_minute_per_gb': per_minute / (peak_bytes / 1024 ** 3) if peak_bytes else None,
+    }
+
+
+def bench_browsers(datasets, tabs=DEFAULT_TABS, headless=True, accept_consent=True):
+    """
+    Compare one browser with N tabs against one browser process per dataset (N at a time).
+    Needs Chrome; point the datasets at a ReplayServer to run without network.
+    Extraction checkpoints are disabled so both cases read every row.
+    Args:
+        datasets (dict): {name: url}
+        tabs (int): Tabs in multi-tab mode, and concurrent browsers in process-per-browser mode
+        headless (bool): Whether to run browsers in headless mode
+        accept_consent (bool): Look for the cookie banner (recorded pages have none)
+    Returns:
+        list: One result dict per mode, with datasets per minute and peak browser RSS
+    """
+    results = []
+
+    # Multi-tab: a single browser
+    start = time.perf_counter()
+    with MultiTabScraper(datasets, tabs=tabs, headless=headless, resume=False,
+                         accept_consent=accept_consent) as multitab:
+        with _RssSampler(lambda: [multitab.driver]) as sampler:
+            extracted = multitab.run()
+        for scraper in multitab.scrapers.values():
+            scraper.clear_checkpoint()
+    results.append(_throughput('multi_tab', len(datasets), tabs, time.perf_counter() - start,
+                               len(extracted), sampler.peak))
+
+    # Process per browser: every dataset starts its own Chrome, `tabs` of them at a time
+    live = []
+
+    def scrape_one(url):
+        # Throwaway profiles: concurrent browsers cannot share one user data directory
+        with EurostatScraper(headless=headless, resume=False, max_retries=0, base_url=url,
+                             accept_consent=accept_consent, profile_dir='') as scraper:
+            live.append(scraper.driver)
+            try:
+                scraper.extract_grid()
+                scraper.clear_checkpoint()
+                return True
+            except Exception as e:
+                logger.error(f"Process-per-browser extraction of {url} failed: {e}")
+                return False
+            finally:
+                live.remove(scraper.driver)
+
+    start = time.perf_counter()
+    with _RssSampler(lambda: list(live)) as sampler:
+        with ThreadPoolExecutor(max_workers=tabs, thread_name_prefix="browser") as pool:
+            extracted = sum(pool.map(scrape_one, datasets.values()))
+    results.append(_throughput('process_per_browser', len(datasets), tabs, time.perf_counter() - start,
+                               extracted, sampler.peak))
+    return results
@@ -0,0 +1,327 @@
+import math
+import sys
+
+import numpy as np
+
+from .records import FLAG_BITS, FLAG_LETTERS, encode_flag
+
+# Cell text grammar shared by the scalar and the batch parser:
+#   <value> [ '(' flags ')' | whitespace flags ]
+# where flags is one or more Eurostat flag letters (e.g. 'p', 'bp').
+FLAG_SET = frozenset(FLAG_LETTERS)
+
+# Values meaning "not available" once flags are removed
+MISSING_VALUES = ('', ':')
+
+# Rows parsed per block by parse_cells; bounds the size of the code-point matrix
+PARSE_BLOCK_ROWS = 65536
+
+# Lookup tables indexed by Unicode code point (every whitespace character is below U+3001)
+_SPACE_TABLE = np.array([chr(code).isspace() for code in range(0x3001)])
+_FLAG_TABLE = np.zeros(0x80, dtype=np.uint16)
+for _letter, _bit in FLAG_BITS.items():
+    _FLAG_TABLE[ord(_letter)] = _bit
+
+
+def canonical_flags(letters):
+    """
+    Normalize flag letters: known letters only, no duplicates, canonical order
+    Args:
+        letters (str): Flag letters as found in the cell (e.g. 'pb')
+    Returns:
+        str: Canonical flag string (e.g. 'bp') or None when empty
+    """
+    if not letters:
+        return None
+    return ''.join(letter for letter in FLAG_LETTERS if letter in letters) or None
+
+
+def split_flags(text):
+    """
+    Split stripped cell text into its value and flag letters
+    Args:
+        text (str): Cell text without surrounding whitespace (e.g. '1 234,5 (p)')
+    Returns:
+        tuple: (value text, flag letters) - letters is '' when the cell has no flag
+    """
+    if text.endswith(')'):
+        open_at = text.rfind('(')
+        letters = text[open_at + 1:-1]
+        if open_at >= 0 and letters and FLAG_SET.issuperset(letters):
+            return text[:open_at], letters
+    parts = text.rsplit(None, 1)
+    if len(parts) == 2 and FLAG_SET.issuperset(parts[1]):
+        return parts[0], parts[1]
+    return text, ''
+
+
+def normalize_number(text):
+    """
+    Normalize the numeric part of a cell (thousands separators, decimal comma)
+    Args:
+        text (str): Value text without flags
+    Returns:
+        str: Normalized text ('13 628 365,8' -> '13628365.8'); non-numeric text is returned unchanged
+    """
+    if not any(c.isdigit() for c in text):
+        return text
+    # Whitespace is a thousands separator (including no-break and narrow no-break spaces)
+    text = ''.join(text.split())
+    if ',' in text and '.' in text:
+        # Both separators: the right-most one is the decimal separator
+        if text.rfind(',') > text.rfind('.'):
+            return text.replace('.', '').replace(',', '.')
+        return text.replace(',', '')
+    return text.replace(',', '.')
+
+
+def is_plain_number(text):
+    """
+    Whether normalized text is a plain decimal number: [+-]digits[.digits]
+    Args:
+        text (str): Normalized value
+    Returns:
+        bool: True when to_float can convert the text
+    """
+    body = text[1:] if text[:1] in '+-' else text
+    return body.count('.') <= 1 and body.replace('.', '', 1).isdecimal() and body.isascii()
+
+
+def to_float(text):
+    """
+    Convert normalized value text to float
+    Args:
+        text (str): Normalized value (see normalize_number)
+    Returns:
+        float: Parsed number, NaN when the text is not a plain decimal number
+    """
+    if not text or not is_plain_number(text):
+        return math.nan
+    return float(text)
+
+
+def cell_text(raw_value):
+    """
+    Text of a raw cell, with missing values (None, NaN, pd.NA) as ''
+    Args:
+        raw_value: Raw cell as read from the grid or a DataFrame column
+    Returns:
+        str: Cell text
+    """
+    if raw_value is None:
+        return ''
+    if isinstance(raw_value, str):
+        return raw_value
+    if isinstance(raw_value, (float, np.floating)) and math.isnan(raw_value):
+        return ''
+    # pd.NA / pd.NaT can only come from pandas when it is already loaded (never imported here: startup cost)
+    pandas = sys.modules.get('pandas')
+    if pandas is not None and np.ndim(raw_value) == 0 and pandas.isna(raw_value):
+        return ''
+    return str(raw_value)
+
+
+def parse_special_value(raw_value):
+    """
+    Parse special values in cell data
+    Args:
+        raw_value (str): Raw text from cell (e.g. '13 628 365.8', '1 234,5 (p)', '12.3 bp', ':')
+    Returns:
+        dict: Processed value with flags and availability
+    """
+    text = cell_text(raw_value).strip()
+    if not text:
+        return {'value': None, 'flag': None, 'is_available': False}
+    value, letters = split_flags(text)
+    value = value.strip()
+    flag = canonical_flags(letters)
+    if value in MISSING_VALUES:
+        # Flags may still be present on missing cells (e.g. ': c' for confidential)
+        return {'value': None, 'flag': flag, 'is_available': False}
+    return {
+        'value': normalize_number(value),
+        'flag': flag,
+        'is_available': True
+    }
+
+
+def parse_cells(raw_values):
+    """
+    Parse a whole column of raw cell strings in one vectorized pass.
+
+    Uses the same grammar as parse_special_value, so for every cell:
+    value == to_float(parse_special_value(cell)['value']),
+    flag == encode_flag(parse_special_value(cell)['flag']) and
+    available == parse_special_value(cell)['is_available'].
+
+    Args:
+        raw_values (array-like): Raw cell strings (list, numpy array or pandas Series);
+                                 None and NaN count as empty
+    Returns:
+        tuple: (values float64 array, flag codes uint16 array, availability bool array)
+    """
+    if isinstance(raw_values, np.ndarray) and raw_values.dtype.kind == 'U':
+        cells = raw_values.ravel()
+    else:
+        cells = [cell_text(value) for value in raw_values]
+    n_cells = len(cells)
+    values = np.full(n_cells, np.nan, dtype=np.float64)
+    flags = np.zeros(n_cells, dtype=np.uint16)
+    available = np.zeros(n_cells, dtype=bool)
+    for start in range(0, n_cells, PARSE_BLOCK_ROWS):
+        block = slice(start, start + PARSE_BLOCK_ROWS)
+        values[block], flags[block], available[block] = _parse_block(np.asarray(cells[block], dtype=str))
+    return values, flags, available
+
+
+def _last_index(mask, width):
+    """Index of the last True per row, -1 for rows without any"""
+    last = width - 1 - mask[:, ::-1].argmax(axis=1)
+    return np.where(mask.any(axis=1), last, -1)
+
+
+def _parse_block(block):
+    """
+    Vectorized parse of a block of cells as a (cells x characters) code-point matrix.
+    Every step of parse_special_value becomes a mask or a per-row index over that matrix.
+    """
+    n_rows = len(block)
+    width = block.dtype.itemsize // 4
+    if width == 0:
+        return np.full(n_rows, np.nan), np.zeros(n_rows, dtype=np.uint16), np.zeros(n_rows, dtype=bool)
+    codes = block.view(np.uint32).reshape(n_rows, width)
+    columns = np.arange(width)
+    rows = np.arange(n_rows)
+
+    space = np.zeros(codes.shape, dtype=bool)
+    small = codes < len(_SPACE_TABLE)
+    space[small] = _SPACE_TABLE[codes[small]]
+    solid = ~space & (codes != 0)  # NumPy pads short strings with NUL
+
+    # strip(): [text_start, text_end)
+    has_text = solid.any(axis=1)
+    text_start = solid.argmax(axis=1)
+    text_end = _last_index(solid, width) + 1
+    in_text = (columns >= text_start[:, None]) & (columns < text_end[:, None])
+
+    flag_bits = np.zeros(codes.shape, dtype=np.uint16)
+    ascii_chars = codes < len(_FLAG_TABLE)
+    flag_bits[ascii_chars] = _FLAG_TABLE[codes[ascii_chars]]
+    is_flag = flag_bits != 0
+
+    # '(' flags ')' suffix
+    last_char = codes[rows, np.maximum(text_end - 1, 0)]
+    open_at = _last_index((codes == ord('(')) & in_text, width)
+    paren_zone = (columns > open_at[:, None]) & (columns < (text_end - 1)[:, None])
+    paren = (has_text & (last_char == ord(')')) & (open_at >= 0) & (text_end - open_at > 2)
+             & ~(paren_zone & ~is_flag).any(axis=1))
+
+    # whitespace flags suffix
+    space_at = _last_index(space & in_text, width)
+    bare_zone = (columns > space_at[:, None]) & (columns < text_end[:, None])
+    bare = ~paren & (space_at >= 0) & ~(bare_zone & ~is_flag).any(axis=1)
+
+    letters_zone = np.where(paren[:, None], paren_zone, bare_zone & bare[:, None])
+    flags = np.bitwise_or.reduce(np.where(letters_zone, flag_bits, 0), axis=1).astype(np.uint16)
+    value_end = np.where(paren, open_at, np.where(bare, space_at, text_end))
+
+    # value.strip() and the missing markers
+    keep = solid & (columns >= text_start[:, None]) & (columns < value_end[:, None])
+    n_solid = keep.sum(axis=1)
+    colon_only = (n_solid == 1) & (codes[rows, keep.argmax(axis=1)] == ord(':'))
+    available = has_text & (n_solid > 0) & ~colon_only
+    flags[~has_text] = 0
+
+    # normalize_number(): drop whitespace, resolve decimal separator
+    is_comma = keep & (codes == ord(','))
+    is_dot = keep & (codes == ord('.'))
+    last_comma = _last_index(is_comma, width)
+    last_dot = _last_index(is_dot, width)
+    both = (last_comma >= 0) & (last_dot >= 0)
+    keep &= ~(is_dot & (both & (last_comma > last_dot))[:, None])
+    keep &= ~(is_comma & (both & (last_dot > last_comma))[:, None])
+    codes = np.where(is_comma, np.uint32(ord('.')), codes)
+
+    # is_plain_number(): optional leading sign, digits, at most one dot
+    digit = keep & (codes >= ord('0')) & (codes <= ord('9'))
+    dot = keep & (codes == ord('.'))
+    sign = keep & ((codes == ord('+')) | (codes == ord('-')))
+    n_sign = sign.sum(axis=1)
+    leading_sign = sign[rows, keep.argmax(axis=1)]
+    plain = (available & digit.any(axis=1) & (dot.sum(axis=1) <= 1)
+             & ((n_sign == 0) | ((n_sign == 1) & leading_sign))
+             & ((digit | dot | sign).sum(axis=1) == keep.sum(axis=1)))
+
+    values = np.full(n_rows, np.nan)
+    if plain.any():
+        # Left-align the kept characters and let NumPy's string cast parse them exactly like float()
+        keep &= plain[:, None]
+        packed = np.zeros(codes.shape, dtype=np.uint32)
+        row_idx, col_idx = np.nonzero(keep)
+        packed[row_idx, keep.cumsum(axis=1)[row_idx, col_idx] - 1] = codes[row_idx, col_idx]
+        values[plain] = packed[plain].view(f'U{width}').ravel().astype(np.float64)
+    return values, flags, available
+
+
+def scalar_reference(raw_value):
+    """
+    Result of the scalar parser in the batch parser's representation
+    Args:
+        raw_value (str): Raw cell text
+    Returns:
+        tuple: (float value or NaN, flag code, availability)
+    """
+    parsed = parse_special_value(raw_value)
+    value = to_float(parsed['value']) if parsed['is_available'] else math.nan
+    return value, encode_flag(parsed['flag']), parsed['is_available']
+
+
+def find_mismatches(raw_values):
+    """
+    Compare parse_cells against parse_special_value cell by cell
+    Args:
+        raw_values (list): Corpus of raw cell strings
+    Returns:
+        list: (raw value, scalar result, batch result) for every cell that differs
+    """
+    values, flags, available = parse_cells(raw_values)
+    mismatches = []
+    for i, raw_value in enumerate(raw_values):
+        expected = scalar_reference(raw_value)
+        actual = (float(values[i]), int(flags[i]), bool(available[i]))
+        same_value = (math.isnan(expected[0]) and math.isnan(actual[0])) or expected[0] == actual[0]
+        if not (same_value and expected[1:] == actual[1:]):
+            mismatches.append((raw_value, expected, actual))
+    return mismatches
+
+
+def fuzz_corpus(n_cells, seed=0):
+    """
+    Generate adversarial cell strings for find_mismatches
+    Args:
+        n_cells (int): Number of strings
+        seed (int): Random seed
+    Returns:
+        list: Mix of realistic and malformed cell strings
+    """
+    import random
+
+    rng = random.Random(seed)
+    alphabet = "0123456789 .,:()" + ''.join(FLAG_LETTERS) + "  x-"
+    corpus = []
+    for _ in range(n_cells):
+        kind = rng.random()
+        if kind < 0.5:
+            number = f"{rng.uniform(-1e7, 1e7):,.{rng.randint(0, 3)}f}"
+            number = rng.choice([number.replace(',', ' '), number.replace(',', ' '), number,
+                                 number.replace(',', '#').replace('.', ',').replace('#', '.')])
+            flags = ''.join(rng.sample(FLAG_LETTERS, rng.randint(0, 3)))
+            if flags:
+                corpus.append(rng.choice(['{} ({})', '{}({})', '{} {}', '{}  ({}) ']).format(number, flags))
+            else:
+                corpus.append(rng.choice([number, f" {number} "]))
+        elif kind < 0.6:
+            corpus.append(rng.choice([':', ': c', ':(z)', '', ' ', '(p)', 'p']))
+        else:
+            corpus.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))))
+    return corpus
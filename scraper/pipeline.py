@@ -0,0 +1,135 @@
+import contextvars
+import logging
+import queue
+import threading
+import time
+
+from django.db import connection
+
+from .metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the producer/consumer import pipeline
+DEFAULT_QUEUE_SIZE = 200  # Maximum rows waiting for the importer (back-pressure bound)
+DEFAULT_BATCH_SIZE = 50   # Rows written per importer transaction
+
+# Sentinel telling the importer thread that no more rows will arrive
+_END_OF_STREAM = object()
+
+
+class ImportPipeline:
+    """
+    Producer/consumer pipeline that overlaps extraction with database import.
+
+    The scraper (producer) puts rows into a bounded queue while an importer
+    thread (consumer) drains it in batches and hands each batch to import_batch.
+    When the importer falls behind, put() blocks, so memory stays bounded by
+    queue_size rows no matter how large the table is.
+
+    Usage:
+        with ImportPipeline(import_batch) as pipeline:
+            for row in rows:
+                pipeline.put(row)
+    """
+
+    def __init__(self, import_batch, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE, metrics=None):
+        """
+        Args:
+            import_batch (callable): Function receiving a list of rows to write
+            queue_size (int): Maximum number of rows buffered between threads
+            batch_size (int): Maximum number of rows per import_batch call
+            metrics (RunMetrics): Run metrics receiving the DB queries of the importer thread
+        """
+        self.import_batch = import_batch
+        self.metrics = metrics
+        # Queries are counted per connection, i.e. per thread: the importer counts its own,
+        # merged into the run's metrics once it has finished
+        self.thread_metrics = RunMetrics(run_id=metrics.run_id) if metrics else None
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        # Run in a copy of the caller's context so log records keep the run ID
+        self.thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._consume,), name="gdp-importer", daemon=True,
+        )
+        self.error = None
+        self.rows_imported = 0
+        self.batches_imported = 0
+        self.blocked_seconds = 0.0  # Time the producer spent waiting on a full queue
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """Start the importer thread"""
+        self.thread.start()
+        logger.info(f"Import pipeline started (queue={self.queue.maxsize}, batch={self.batch_size})")
+
+    def put(self, row):
+        """
+        Hand a row to the importer, blocking while the queue is full
+        Args:
+            row: Item passed through unchanged to import_batch
+        """
+        if self.error:
+            raise RuntimeError("Importer thread failed") from self.error
+        start = time.perf_counter()
+        self.queue.put(row)
+        self.blocked_seconds += time.perf_counter() - start
+
+    def close(self):
+        """Signal end of stream, wait for the importer and re-raise its error if any"""
+        if self.thread.is_alive():
+            self.queue.put(_END_OF_STREAM)
+            self.thread.join()
+        if self.thread_metrics:
+            self.metrics.merge(self.thread_metrics)
+            self.thread_metrics = None
+        logger.info(
+            f"Import pipeline finished: {self.rows_imported} rows in {self.batches_imported} batches, "
+            f"producer blocked {self.blocked_seconds:.2f}s"
+        )
+        if self.error:
+            raise RuntimeError("Importer thread failed") from self.error
+
+    def _consume(self):
+        """Importer thread body: count its DB queries, drain the queue and import in batches"""
+        if self.thread_metrics:
+            with self.thread_metrics.track_queries():
+                self._drain()
+        else:
+            self._drain()
+
+    def _drain(self):
+        """Drain the queue and import in batches until the end of the stream"""
+        batch = []
+        try:
+            while True:
+                row = self.queue.get()
+                if row is _END_OF_STREAM:
+                    break
+                batch.append(row)
+                # Write as soon as a batch is full or the producer is momentarily idle
+                if len(batch) >= self.batch_size or self.queue.empty():
+                    self._flush(batch)
+                    batch = []
+            if batch:
+                self._flush(batch)
+        except Exception as e:
+            logger.error(f"Importer thread failed: {e}", exc_info=True)
+            self.error = e
+            # Keep draining so a blocked producer can finish and see the error
+            while self.queue.get() is not _END_OF_STREAM:
+                pass
+        finally:
+            connection.close()  # Connections are per thread; release this one
+
+    def _flush(self, batch):
+        """Import one batch and update counters"""
+        self.import_batch(batch)
+        self.rows_imported += len(batch)
+        self.batches_imported += 1
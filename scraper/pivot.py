@@ -0,0 +1,121 @@
+import csv
+import logging
+
+import numpy as np
+
+from .models import GDPData, GeoArea
+
+logger = logging.getLogger(__name__)
+
+# Supported ways of rendering data quality flags in the wide table
+FLAG_MODES = ('none', 'inline', 'columns')
+
+# Geo area attribute used as the first column (gdp_data_latest.csv uses names)
+LABEL_FIELDS = ('name', 'code')
+
+
+class WideTable:
+    """
+    Wide GDP table (one row per geo area, one column per year) backed by NumPy arrays.
+
+    Key Attributes:
+    - labels: geo area labels (names or codes) in row order
+    - years: years discovered in the data, in column order
+    - values: object array (n_geos, n_years) of value strings, '' where missing
+    - flags: object array of the same shape with flag letters, '' where none
+    """
+
+    def __init__(self, labels, years, values, flags):
+        self.labels = labels
+        self.years = years
+        self.values = values
+        self.flags = flags
+
+    def header(self, flag_mode='none'):
+        """
+        Build the CSV header for the given flag mode
+        Args:
+            flag_mode (str): One of FLAG_MODES
+        Returns:
+            list: Column names (geo_area, year_2015, ..., [flag_2015, ...])
+        """
+        header = ['geo_area'] + [f"year_{year}" for year in self.years]
+        if flag_mode == 'columns':
+            header += [f"flag_{year}" for year in self.years]
+        return header
+
+    def rows(self, flag_mode='none'):
+        """
+        Yield CSV rows one geo area at a time
+        Args:
+            flag_mode (str): One of FLAG_MODES
+        Yields:
+            list: Row values matching header(flag_mode)
+        """
+        if flag_mode not in FLAG_MODES:
+            raise ValueError(f"Unknown flag mode '{flag_mode}' (expected one of {FLAG_MODES})")
+        for i, label in enumerate(self.labels):
+            values = self.values[i].tolist()
+            flags = self.flags[i].tolist()
+            if flag_mode == 'inline':
+                # Same rendering as GDPData.__str__: value followed by (flag)
+                values = [f"{value}({flag})" if value and flag else value for value, flag in zip(values, flags)]
+                yield [label] + values
+            elif flag_mode == 'columns':
+                yield [label] + values + flags
+            else:
+                yield [label] + values
+
+    def write_csv(self, path, flag_mode='none'):
+        """
+        Write the wide table as CSV
+        Args:
+            path (str): Output file path
+            flag_mode (str): One of FLAG_MODES
+        """
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.header(flag_mode))
+            writer.writerows(self.rows(flag_mode))
+        logger.info(f"Wide table with {len(self.labels)} rows written to {path}")
+
+
+def build_wide_table(queryset=None, label='name', include_unavailable=False):
+    """
+    Pivot the normalized GDPData table into a wide geo × year table.
+
+    The years are discovered from the data, both arrays are preallocated and
+    filled straight from a values_list stream, so no model instances are built.
+
+    Args:
+        queryset: Optional GDPData queryset to restrict the export
+        label (str): Geo attribute used as row label ('name' or 'code')
+        include_unavailable (bool): Whether to export values of cells marked unavailable
+    Returns:
+        WideTable: Table ready to be written as CSV
+    """
+    if label not in LABEL_FIELDS:
+        raise ValueError(f"Unknown label field '{label}' (expected one of {LABEL_FIELDS})")
+    if queryset is None:
+        queryset = GDPData.objects.all()
+
+    geo_rows = list(GeoArea.objects.order_by('code').values_list('id', label))
+    years = sorted(queryset.order_by().values_list('year', flat=True).distinct())
+    row_by_pk = {pk: i for i, (pk, _) in enumerate(geo_rows)}
+    column_by_year = {year: j for j, year in enumerate(years)}
+
+    shape = (len(geo_rows), len(years))
+    values = np.full(shape, '', dtype=object)
+    flags = np.full(shape, '', dtype=object)
+
+    records = queryset.order_by().values_list('geo_area_id', 'year', 'value', 'flag', 'is_available')
+    for geo_id, year, value, flag, is_available in records.iterator(chunk_size=5000):
+        if not is_available and not include_unavailable:
+            continue
+        i = row_by_pk[geo_id]
+        j = column_by_year[year]
+        values[i, j] = value or ''
+        flags[i, j] = flag or ''
+
+    logger.info(f"Pivoted {shape[0]} geo areas × {shape[1]} years")
+    return WideTable([row_label for _, row_label in geo_rows], years, values, flags)
@@ -0,0 +1,288 @@
+import logging
+import math
+from array import array
+
+import numpy as np
+
+from .models import GDPData
+
+# Flag letters known to the data model, each one mapped to a bit of the flag code
+FLAG_LETTERS = tuple(flag for flag, _ in GDPData.FLAG_CHOICES if flag)
+FLAG_BITS = {letter: 1 << i for i, letter in enumerate(FLAG_LETTERS)}
+
+logger = logging.getLogger(__name__)
+
+MAX_DECIMALS = 127  # Range of the int8 decimals column
+
+
+def encode_flag(flag):
+    """
+    Encode a flag string ('p', 'bp', None, ...) into an integer bitmask
+    Args:
+        flag (str): Flag letters as scraped, or None
+    Returns:
+        int: Bitmask with one bit per flag letter (0 when no flag)
+    """
+    code = 0
+    for letter in flag or '':
+        code |= FLAG_BITS.get(letter, 0)
+    return code
+
+
+def decode_flag(code):
+    """
+    Decode an integer bitmask back into its flag string
+    Args:
+        code (int): Bitmask produced by encode_flag
+    Returns:
+        str: Flag letters in canonical order, or None when no bit is set
+    """
+    if not code:
+        return None
+    return ''.join(letter for letter in FLAG_LETTERS if code & FLAG_BITS[letter]) or None
+
+
+def parse_number(value):
+    """
+    Split a normalized value string into a float and its number of decimals
+    Args:
+        value (str): Normalized value (e.g. '13628365.8')
+    Returns:
+        tuple: (float value or NaN, decimals) so the original text can be rebuilt;
+               NaN when the text is not a plain number that format_number rebuilds exactly
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return math.nan, 0
+    _, dot, fraction = value.partition('.')
+    decimals = len(fraction) if dot else 0
+    if not math.isfinite(number) or decimals > MAX_DECIMALS or format_number(number, decimals) != value:
+        return math.nan, 0  # '3,617,450.0', '1e5', ' 12', 'inf'... are kept as text by ObservationBatch
+    return number, decimals
+
+
+def format_number(number, decimals):
+    """
+    Rebuild the normalized value string stored in GDPData.value
+    Args:
+        number (float): Parsed value
+        decimals (int): Number of decimals of the original text
+    Returns:
+        str: Value formatted like the scraped text, or None for NaN
+    """
+    if math.isnan(number):
+        return None
+    return f"{number:.{decimals}f}"
+
+
+class ObservationBatch:
+    """
+    Compact columnar batch of GDP observations shared by scraper and importer.
+
+    Every available cell is one entry across parallel typed arrays:
+    - geo_index (int32): position of the geo area in geo_codes / geo_names
+    - year (int16): reporting year
+    - value (float64): numeric value, NaN when the text is not numeric
+    - decimals (int8): decimals of the original text, so values round-trip exactly
+    - flag (uint16): flag bitmask (see encode_flag)
+
+    Cells whose text is not a plain number are stored as NaN and their original
+    text is kept in the sparse `text` dict (observation index -> text), so the
+    importer still receives exactly what was scraped.
+
+    This replaces the nested {row_id: {year: {'value', 'flag', 'is_available'}}}
+    dictionaries; from_legacy() / to_legacy() convert between both formats.
+    """
+
+    def __init__(self):
+        self.geo_codes = []
+        self.geo_names = []
+        self.geo_lookup = {}
+        self.geo_index = array('i')
+        self.year = array('h')
+        self.value = array('d')
+        self.decimals = array('b')
+        self.flag = array('H')
+        self.text = {}
+
+    def __len__(self):
+        return len(self.year)
+
+    def __repr__(self):
+        return f"<ObservationBatch {len(self.geo_codes)} geos, {len(self)} observations>"
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the observation columns"""
+        columns = (self.geo_index, self.year, self.value, self.decimals, self.flag)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def add_geo(self, code, name=None):
+        """
+        Register a geo area (idempotent)
+        Args:
+            code (str): Geo area code (row-id in the grid)
+            name (str): Descriptive name, defaults to the code
+        Returns:
+            int: Index of the geo area in this batch
+        """
+        index = self.geo_lookup.get(code)
+        if index is None:
+            index = len(self.geo_codes)
+            self.geo_lookup[code] = index
+            self.geo_codes.append(code)
+            self.geo_names.append(name if name is not None else code)
+        elif name is not None:
+            self.geo_names[index] = name
+        return index
+
+    def append(self, geo_index, year, value, flag=None):
+        """
+        Append one observation
+        Args:
+            geo_index (int): Index returned by add_geo
+            year (int | str): Reporting year
+            value (str): Normalized value text
+            flag (str): Flag letters or None
+        """
+        number, decimals = parse_number(value)
+        if math.isnan(number) and value is not None:
+            self.text[len(self.year)] = value
+        self.geo_index.append(geo_index)
+        self.year.append(int(year))
+        self.value.append(number)
+        self.decimals.append(decimals)
+        self.flag.append(encode_flag(flag))
+
+    def add_row(self, code, row_data, name=None):
+        """
+        Append a scraped row in the legacy {year: {'value', 'flag', 'is_available'}} format
+        Args:
+            code (str): Geo area code
+            row_data (dict): Cells of the row keyed by year string
+            name (str): Optional descriptive name of the geo area
+        """
+        geo_index = self.add_geo(code, name)
+        for year, cell in row_data.items():
+            if cell.get('is_available', True):
+                self.append(geo_index, year, cell['value'], cell['flag'])
+
+    def add_listed_row(self, code, row_data):
+        """
+        Append a scraped row only when its geo area was registered from the grid headers
+        Args:
+            code (str): Geo area code
+            row_data (dict): Cells of the row keyed by year string
+        Returns:
+            bool: False when the row was skipped (geo area not in the headers)
+        """
+        if code not in self.geo_lookup:
+            logger.warning(f"Skipping row {code}: geo area not in the grid headers")
+            return False
+        self.add_row(code, row_data)
+        return True
+
+    def extend(self, other):
+        """
+        Append every geo area and observation of another batch (geo areas are matched by code)
+        Args:
+            other (ObservationBatch): Batch to append, e.g. one shard of a dataset
+        """
+        remap = np.array([self.add_geo(code, name) for code, name in zip(other.geo_codes, other.geo_names)],
+                         dtype=np.int32)
+        columns = other.as_numpy()
+        offset = len(self)
+        self.text.update({offset + i: text for i, text in other.text.items()})
+        if len(other):
+            self.geo_index.frombytes(remap[columns['geo_index']].tobytes())
+        self.year.extend(other.year)
+        self.value.extend(other.value)
+        self.decimals.extend(other.decimals)
+        self.flag.extend(other.flag)
+
+    @classmethod
+    def from_legacy(cls, geo_dicts, gdp_data):
+        """
+        Build a batch from the legacy scraper output
+        Args:
+            geo_dicts (list): [{'CODE': 'Description'}, ...] as returned by extract_table_data
+            gdp_data (dict): {'row_id': {'year': {...}}} as returned by extract_complete_gdp_data
+        Returns:
+            ObservationBatch: Batch with every geo area and its available cells
+                              (rows of geo areas missing from geo_dicts are skipped)
+        """
+        batch = cls()
+        for geo_dict in geo_dicts:
+            for code, name in geo_dict.items():
+                batch.add_geo(code, name)
+        for code, row_data in gdp_data.items():
+            batch.add_listed_row(code, row_data)
+        return batch
+
+    def to_legacy(self):
+        """
+        Convert the batch back to the legacy scraper output
+        Returns:
+            tuple: (geo_dicts, gdp_data) in the format of extract_table_data / extract_complete_gdp_data
+        """
+        geo_dicts = [{code: name} for code, name in zip(self.geo_codes, self.geo_names)]
+        gdp_data = {}
+        for code, year, value, flag in self.iter_observations():
+            gdp_data.setdefault(code, {})[str(year)] = {'value': value, 'flag': flag, 'is_available': True}
+        return geo_dicts, gdp_data
+
+    def value_text(self, i):
+        """
+        Value text of one observation, as scraped
+        Args:
+            i (int): Observation index
+        Returns:
+            str: Rebuilt number, the original text of a non-numeric cell, or None
+        """
+        text = self.text.get(i)
+        return text if text is not None else format_number(self.value[i], self.decimals[i])
+
+    def iter_observations(self):
+        """
+        Iterate over observations with decoded values
+        Yields:
+            tuple: (geo code, year, value text, flag string)
+        """
+        for i in range(len(self)):
+            yield (
+                self.geo_codes[self.geo_index[i]],
+                self.year[i],
+                self.value_text(i),
+                decode_flag(self.flag[i]),
+            )
+
+    def iter_geos(self):
+        """
+        Group observations by geo area, including areas without observations
+        Yields:
+            tuple: (code, name, [(year, value text, flag string), ...])
+        """
+        grouped = [[] for _ in self.geo_codes]
+        for i in range(len(self)):
+            grouped[self.geo_index[i]].append((
+                self.year[i],
+                self.value_text(i),
+                decode_flag(self.flag[i]),
+            ))
+        for code, name, observations in zip(self.geo_codes, self.geo_names, grouped):
+            yield code, name, observations
+
+    def as_numpy(self):
+        """
+        Zero-copy NumPy views of the observation columns
+        Returns:
+            dict: Column name -> numpy.ndarray
+        """
+        return {
+            'geo_index': np.frombuffer(self.geo_index, dtype=np.int32),
+            'year': np.frombuffer(self.year, dtype=np.int16),
+            'value': np.frombuffer(self.value, dtype=np.float64),
+            'decimals': np.frombuffer(self.decimals, dtype=np.int8),
+            'flag': np.frombuffer(self.flag, dtype=np.uint16),
+        }
@@ -0,0 +1,234 @@
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from .checkpoints import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Files of a recording directory
+PAGE_FILE = "index.html"     # Rendered page, scripts removed; served at '/'
+GRID_FILE = "grid.html"      # outerHTML of the data grid, as read by the scraper
+MANIFEST_FILE = "manifest.json"
+
+# Inspector snapshots combined into a seed recording (see seed_from_inspector)
+INSPECTOR_FRAGMENTS = ("index-time-headers.html", "geo-hs-gdp-values.html")
+
+# Elements dropped from recorded pages so the replay is static and never reaches the network
+_LIVE_TAGS = ("script", "noscript", "iframe", "base")
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<div id="estat-content-view-table">
+{grid}
+<div class="ag-body-horizontal-scroll-viewport" style="overflow-x: auto"><div style="width: 100%"></div></div>
+</div>
+</body>
+</html>
+"""
+
+
+def sanitize_page(html):
+    """
+    Make a rendered page safe to replay offline
+    Args:
+        html (str): driver.page_source after the grid was rendered
+    Returns:
+        str: Same DOM without scripts, iframes and <base>, so nothing re-renders or loads remotely
+    """
+    from bs4 import BeautifulSoup  # Only needed when recording
+
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup.find_all(_LIVE_TAGS):
+        element.decompose()
+    return str(soup)
+
+
+def record_session(driver, directory, url, phases=None, grid_selector="#estat-content-view-table"):
+    """
+    Record the rendered page of a scrape session for later replay
+    Args:
+        driver: Selenium WebDriver with the grid fully rendered (after EurostatScraper.load_grid)
+        directory (str): Recording directory, created if needed
+        url (str): Page URL that was scraped
+        phases (dict): Phase timings so far (RunMetrics.phases), stored in the manifest
+        grid_selector (str): CSS selector of the data grid
+    Returns:
+        str: Path of the manifest
+    """
+    os.makedirs(directory, exist_ok=True)
+    grid_html = driver.execute_script(
+        "const grid = document.querySelector(arguments[0]); return grid ? grid.outerHTML : null;", grid_selector)
+    with open(os.path.join(directory, PAGE_FILE), 'w', encoding='utf-8') as f:
+        f.write(sanitize_page(driver.page_source))
+    if grid_html:
+        with open(os.path.join(directory, GRID_FILE), 'w', encoding='utf-8') as f:
+            f.write(grid_html)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    write_json_atomic(manifest_path, {
+        'source': 'browser',
+        'url': url,
+        'recorded_at': datetime.now().isoformat(),
+        'phases': phases or {},
+    })
+    logger.info(f"Session recorded to {directory}")
+    return manifest_path
+
+
+def seed_from_inspector(inspector_dir, directory):
+    """
+    Build a recording from the saved inspector/ snapshots (headers, pinned geo column and values)
+    Args:
+        inspector_dir (str): Directory with the inspector HTML fragments
+        directory (str): Recording directory, created if needed
+    Returns:
+        str: Path of the manifest
+    """
+    fragments = []
+    for name in INSPECTOR_FRAGMENTS:
+        with open(os.path.join(inspector_dir, name), encoding='utf-8') as f:
+            fragments.append(f.read())
+    grid = "\n".join(fragments)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, PAGE_FILE), 'w', encoding='utf-8') as f:
+        f.write(_PAGE_TEMPLATE.format(title="Eurostat GDP (inspector seed)", grid=grid))
+    with open(os.path.join(directory, GRID_FILE), 'w', encoding='utf-8') as f:
+        f.write(grid)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    write_json_atomic(manifest_path, {
+        'source': 'inspector',
+        'url': None,
+        'recorded_at': datetime.now().isoformat(),
+        'phases': {},
+    })
+    logger.info(f"Seed recording built from {inspector_dir} in {directory}")
+    return manifest_path
+
+
+def load_manifest(directory):
+    """
+    Read the manifest of a recording
+    Args:
+        directory (str): Recording directory
+    Returns:
+        dict: Manifest (source, url, recorded_at, phases)
+    Raises:
+        FileNotFoundError: When directory is not a recording
+    """
+    with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_recording(directory):
+    """
+    Accept either a recording or an inspector/ snapshot directory
+    Args:
+        directory (str): Recording directory, or a directory with the INSPECTOR_FRAGMENTS
+    Returns:
+        tuple: (recording directory, TemporaryDirectory holding the seed recording of an
+               inspector snapshot or None); the caller cleans the temporary directory up
+    Raises:
+        FileNotFoundError: When directory is neither
+    """
+    if os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        return directory, None
+    if all(os.path.exists(os.path.join(directory, name)) for name in INSPECTOR_FRAGMENTS):
+        seed = tempfile.TemporaryDirectory(prefix="eurostat_replay_")
+        try:
+            seed_from_inspector(directory, seed.name)
+        except BaseException:
+            seed.cleanup()
+            raise
+        return seed.name, seed
+    raise FileNotFoundError(f"{directory} is neither a recording ({MANIFEST_FILE}) nor an inspector snapshot directory")
+
+
+class _ReplayHandler(SimpleHTTPRequestHandler):
+    """Static file handler for a recording; optionally delays the page like the recorded run"""
+
+    page_delay = 0.0
+
+    def do_GET(self):
+        if self.page_delay and self.path.split('?')[0] in ('/', f"/{PAGE_FILE}"):
+            time.sleep(self.page_delay)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        logger.debug(f"Replay server: {format % args}")
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for the Eurostat page, serving a recording directory.
+
+    The scraper is pointed at `url` instead of EUROSTAT_CONFIG['BASE_URL'], so the
+    whole scrape_eurostat pipeline (browser, extraction, import) runs offline and
+    reads exactly the recorded grid on every run.
+
+    An inspector/ snapshot directory is accepted too: it is seeded into a
+    temporary recording (see resolve_recording) that is removed on stop().
+
+    Usage:
+        with ReplayServer("recordings/2025-03-25") as server:
+            scraper = EurostatScraper(base_url=server.url)
+    """
+
+    def __init__(self, directory, realtime=False, host="127.0.0.1", port=0):
+        """
+        Args:
+            directory (str): Recording or inspector snapshot directory (see resolve_recording)
+            realtime (bool): Delay the page by its recorded page_load time
+            host (str): Interface to bind
+            port (int): Port to bind, 0 picks a free one
+        """
+        self.directory, self.seed = resolve_recording(directory)
+        try:
+            self.manifest = load_manifest(self.directory)
+            page_delay = self.manifest.get('phases', {}).get('page_load', {}).get('seconds', 0.0) if realtime else 0.0
+            handler = type('ReplayHandler', (_ReplayHandler,), {'page_delay': page_delay})
+            self.server = ThreadingHTTPServer((host, port), functools.partial(handler, directory=self.directory))
+        except BaseException:
+            self.cleanup()
+            raise
+        self.thread = None
+
+    @property
+    def url(self):
+        """URL of the recorded page"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Serve the recording from a background thread"""
+        self.thread = threading.Thread(target=self.server.serve_forever, name="replay-server", daemon=True)
+        self.thread.start()
+        logger.info(f"Replaying {self.directory} ({self.manifest.get('source')}) at {self.url}")
+
+    def stop(self):
+        """Shut the server down and remove the seed recording of an inspector snapshot"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+        self.cleanup()
+
+    def cleanup(self):
+        """Remove the temporary seed recording, if any"""
+        if self.seed is not None:
+            self.seed.cleanup()
+            self.seed = None
@@ -0,0 +1,336 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from eurostat_manager import settings
+
+try:
+    import psutil
+except ImportError:  # Optional: /proc is read directly on Linux
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 1.0      # Seconds between samples
+TOP_ALLOCATIONS = 10        # tracemalloc statistics kept per traced phase
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+class ResourceLimitExceeded(RuntimeError):
+    """A run went over one of the configured memory limits and was aborted"""
+
+
+def _children_map():
+    """{ppid: [pid, ...]} of every process, read from /proc"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # Field 4 is the parent pid; the command name (field 2) may contain spaces
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _proc_usage(pid):
+    """(rss bytes, cpu seconds) of one process from /proc, or None when it is gone"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return rss, (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS  # utime + stime
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def usage_available():
+    """Whether process trees can be measured (psutil installed or Linux /proc)"""
+    return psutil is not None or os.path.isdir('/proc')
+
+
+def process_tree_usage(pid, include_children=True):
+    """
+    Resident memory and CPU time of a process and its descendants
+    Args:
+        pid (int): Root process, e.g. chromedriver or os.getpid()
+        include_children (bool): Add every descendant (Chrome's browser, GPU and renderer processes)
+    Returns:
+        tuple: (rss bytes, cpu seconds, process count), or None when it cannot be measured
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + (root.children(recursive=True) if include_children else [])
+        except psutil.Error:
+            return None
+        rss = cpu = count = 0
+        for process in processes:
+            try:
+                times = process.cpu_times()
+                rss += process.memory_info().rss
+                cpu += times.user + times.system
+                count += 1
+            except psutil.Error:
+                continue  # Exited while sampling
+        return rss, cpu, count
+    if not os.path.isdir('/proc'):
+        return None
+    children = _children_map() if include_children else {}
+    rss = cpu = count = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        usage = _proc_usage(current)
+        if usage is None:
+            continue
+        rss += usage[0]
+        cpu += usage[1]
+        count += 1
+        pending.extend(children.get(current, ()))
+    return (rss, cpu, count) if count else None
+
+
+def process_tree_rss(pid):
+    """
+    Resident memory of a process and all its descendants
+    Args:
+        pid (int): Root process, e.g. chromedriver
+    Returns:
+        int: RSS in bytes, or None when it cannot be measured
+    """
+    usage = process_tree_usage(pid)
+    return usage[0] if usage else None
+
+
+def driver_pid(driver):
+    """chromedriver pid of a Selenium driver (None when unknown)"""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def memory_limits():
+    """
+    RSS limits in bytes from EUROSTAT_CONFIG (0 or missing disables a limit)
+    Returns:
+        dict: {'python': bytes or None, 'browser': bytes or None}
+    """
+    config = settings.EUROSTAT_CONFIG
+    return {
+        'python': int(config.get('MAX_PYTHON_RSS_MB', 0) * 1024 ** 2) or None,
+        'browser': int(config.get('MAX_BROWSER_RSS_MB', 0) * 1024 ** 2) or None,
+    }
+
+
+class _Series:
+    """Peak and running average of one sampled quantity"""
+
+    def __init__(self):
+        self.peak = None
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, value):
+        self.peak = value if self.peak is None else max(self.peak, value)
+        self.total += value
+        self.count += 1
+
+    def as_dict(self):
+        return {'peak': self.peak, 'avg': self.total / self.count if self.count else None}
+
+
+class _ProcessStats:
+    """RSS and CPU series of one process tree, CPU derived from cpu-time deltas between samples"""
+
+    def __init__(self):
+        self.rss = _Series()
+        self.cpu_percent = _Series()
+        self.processes = _Series()
+        self._last = None  # (wall time, cpu seconds) of the previous sample
+
+    def add(self, usage, now):
+        rss, cpu, count = usage
+        self.rss.add(rss)
+        self.processes.add(count)
+        if self._last is not None and now > self._last[0]:
+            self.cpu_percent.add(max(cpu - self._last[1], 0.0) / (now - self._last[0]) * 100)
+        self._last = (now, cpu)
+
+    def reset_cpu(self):
+        """Forget the previous sample (the measured process tree was replaced, e.g. browser restart)"""
+        self._last = None
+
+    def as_dict(self):
+        return {
+            'rss_bytes': self.rss.as_dict(),
+            'cpu_percent': self.cpu_percent.as_dict(),
+            'processes': self.processes.as_dict(),
+        }
+
+
+class ResourceMonitor:
+    """
+    Background sampler of RSS and CPU for the Python process and the
+    chromedriver/Chrome process tree of a run.
+
+    Peak and average values, plus the top tracemalloc allocators of traced
+    phases (see trace_allocations), are stored in RunMetrics.resources and so
+    end up in the run record. When a memory limit is exceeded the monitor
+    flags the run; the scraper and the importer call raise_if_exceeded() at
+    row and region boundaries, which aborts the run with ResourceLimitExceeded.
+
+    Uses psutil when installed, otherwise /proc (Linux); elsewhere only the
+    tracemalloc part is recorded.
+
+    Usage:
+        with ResourceMonitor(metrics) as monitor:
+            with EurostatScraper(metrics=metrics, monitor=monitor) as scraper:
+                ...
+            with monitor.trace_allocations('import'):
+                ...
+    """
+
+    def __init__(self, metrics, interval=None, limits=None, trace=None):
+        """
+        Args:
+            metrics (RunMetrics): Run record receiving the results
+            interval (float): Seconds between samples (defaults to EUROSTAT_CONFIG['RESOURCE_SAMPLE_SECONDS'])
+            limits (dict): {'python': bytes, 'browser': bytes} RSS limits (defaults to memory_limits())
+            trace (bool): Record tracemalloc allocators in trace_allocations
+                          (defaults to EUROSTAT_CONFIG['TRACE_ALLOCATIONS'])
+        """
+        config = settings.EUROSTAT_CONFIG
+        self.metrics = metrics
+        self.interval = interval or config.get('RESOURCE_SAMPLE_SECONDS', DEFAULT_INTERVAL)
+        self.limits = limits if limits is not None else memory_limits()
+        self.trace = config.get('TRACE_ALLOCATIONS', False) if trace is None else trace
+        self.python = _ProcessStats()
+        self.browser = _ProcessStats()
+        self.browser_pids = {}  # Owner (e.g. scraper dataset or shard) -> chromedriver pid
+        self.exceeded = None  # Message of the first limit exceeded
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def attach_driver(self, driver, owner=None):
+        """
+        Measure the process tree of this Selenium driver from now on (call after every browser start).
+        Browsers of different owners (e.g. parallel shards) are measured together, as one browser total.
+        Args:
+            driver: Selenium WebDriver instance
+            owner (str): Name of the scraper the driver belongs to; a new driver replaces its previous one
+        """
+        self.browser_pids[owner] = driver_pid(driver)
+        self.browser.reset_cpu()
+
+    def detach_driver(self, owner=None):
+        """Stop measuring the browser of an owner (call when it quits)"""
+        if self.browser_pids.pop(owner, None) is not None:
+            self.browser.reset_cpu()
+
+    def start(self):
+        """Start sampling from a background thread"""
+        if not usage_available():
+            logger.warning("Resource sampling unavailable (install psutil); only allocations are traced")
+            return
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._loop,), name="resource-monitor", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and store the results in the run record"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self.sample()  # Final sample so short runs still have one
+        self.metrics.resources.update({
+            'interval_seconds': self.interval,
+            'samples': self.samples,
+            'python': self.python.as_dict(),
+            'browser': self.browser.as_dict(),
+            'limits_bytes': self.limits,
+            'exceeded': self.exceeded,
+        })
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Take one sample of both process trees and check the limits"""
+        now = time.perf_counter()
+        # Python alone: chromedriver is one of its children and is measured as the browser tree
+        python = process_tree_usage(os.getpid(), include_children=False)
+        if python:
+            self.python.add(python, now)
+            self._check('python', python[0])
+        usages = [process_tree_usage(pid) for pid in list(self.browser_pids.values()) if pid]
+        usages = [usage for usage in usages if usage]
+        if usages:
+            # Every attached browser together: the limit bounds the memory of all of them
+            browser = tuple(sum(values) for values in zip(*usages))
+            self.browser.add(browser, now)
+            self._check('browser', browser[0])
+        self.samples += 1
+
+    def _check(self, name, rss):
+        """Flag the run when a process tree is over its limit"""
+        limit = self.limits.get(name)
+        if limit and rss > limit and self.exceeded is None:
+            self.exceeded = f"{name} RSS {rss / 1024 ** 2:.0f} MiB over the {limit / 1024 ** 2:.0f} MiB limit"
+            logger.error(f"Aborting run: {self.exceeded}")
+
+    def raise_if_exceeded(self):
+        """
+        Raises:
+            ResourceLimitExceeded: When a memory limit has been exceeded
+        """
+        if self.exceeded:
+            raise ResourceLimitExceeded(self.exceeded)
+
+    @contextmanager
+    def trace_allocations(self, phase):
+        """
+        Record the top tracemalloc allocators of a phase in the run record
+        (no-op when tracing is disabled or tracemalloc is already running)
+        Args:
+            phase (str): Phase name, e.g. 'import'
+        """
+        if not self.trace or tracemalloc.is_tracing():
+            yield
+            return
+        tracemalloc.start()
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            statistics = snapshot.filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            )).statistics('lineno')
+            self.metrics.resources.setdefault('allocations', {})[phase] = {
+                'traced_peak_bytes': peak,
+                'top': [
+                    {'where': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                     'bytes': stat.size, 'count': stat.count}
+                    for stat in statistics[:TOP_ALLOCATIONS]
+                ],
+            }
@@ -0,0 +1,284 @@
+import json
+import logging
+import os
+import random
+import socket
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from eurostat_manager import settings
+from .checkpoints import checkpoint_dir, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+LOCK_DIR = "locks"
+STATE_FILE = "schedule_state.json"
+DEFAULT_INTERVAL_MINUTES = 24 * 60
+DEFAULT_JITTER_MINUTES = 30
+
+
+class RunLockHeld(RuntimeError):
+    """Another process is already scraping the dataset"""
+
+
+def pid_alive(pid):
+    """Whether a process with this pid exists on this host"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def lock_fd(fd):
+    """
+    Take a non-blocking exclusive lock on an open file
+    Returns:
+        bool: False when another open file (of any process) holds it
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def unlock_fd(fd):
+    """Release a lock taken with lock_fd"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class RunLock:
+    """
+    Cross-process single-flight lock for one dataset: an OS lock (flock, or
+    msvcrt.locking on Windows) on checkpoints/locks/<dataset>.lock, held on an
+    open file descriptor for the whole run. The file holds the pid, host and
+    start time of its owner, for diagnostics only.
+
+    The OS releases the lock when its owner exits, crashed or not, so there is
+    no stale lock to detect or break: a live run keeps its lock however long it
+    takes, and a crashed one never blocks the next. The lock file itself is
+    never removed (a competitor may already have it open), only emptied.
+    The lock directory must be on a local filesystem.
+
+    Usage:
+        with RunLock(dataset_key(url)):
+            ...  # scrape and import
+    """
+
+    def __init__(self, dataset, directory=None):
+        """
+        Args:
+            dataset (str): Dataset key (see checkpoints.dataset_key)
+            directory (str): Lock directory (defaults to <checkpoint_dir()>/locks)
+        """
+        self.dataset = dataset
+        self.path = os.path.join(directory or os.path.join(checkpoint_dir(), LOCK_DIR), f"{dataset}.lock")
+        self.fd = None
+
+    @property
+    def acquired(self):
+        """Whether this instance holds the lock"""
+        return self.fd is not None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise RunLockHeld(f"Dataset {self.dataset} is already being scraped ({self.describe(self.holder())})")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def read_owner(self):
+        """
+        Returns:
+            dict: Owner written in the lock file ({} when empty, unreadable or being written),
+                  None when there is no lock file
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.loads(f.read() or '{}')
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            return {}
+
+    def holder(self):
+        """
+        Returns:
+            dict: {'pid', 'host', 'started_at'} of the current owner ({} when unknown),
+                  or None when nobody holds the lock
+        """
+        try:
+            fd = os.open(self.path, os.O_RDWR)
+        except FileNotFoundError:
+            return None
+        try:
+            if lock_fd(fd):
+                unlock_fd(fd)
+                return None
+        finally:
+            os.close(fd)
+        return self.read_owner() or {}
+
+    @staticmethod
+    def describe(holder):
+        """Human readable owner of a lock"""
+        if not holder:
+            return "unknown owner"
+        return f"pid {holder.get('pid')} on {holder.get('host')} since {holder.get('started_at')}"
+
+    def acquire(self):
+        """
+        Take the lock without waiting
+        Returns:
+            bool: True when acquired, False when another live run holds it
+        """
+        if self.acquired:
+            return True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Not inherited by child processes (PEP 446), so chromedriver cannot outlive us holding it
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if not lock_fd(fd):
+            os.close(fd)
+            return False
+        previous = self.read_owner()
+        if previous:
+            logger.warning(f"Previous run of {self.dataset} did not release its lock ({self.describe(previous)})")
+        owner = json.dumps({'pid': os.getpid(), 'host': socket.gethostname(),
+                            'started_at': datetime.now().isoformat()}).encode()
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, owner)
+        self.fd = fd
+        return True
+
+    def release(self):
+        """Empty the lock file and release the lock if this instance holds it"""
+        if not self.acquired:
+            return
+        fd, self.fd = self.fd, None
+        try:
+            os.ftruncate(fd, 0)
+            unlock_fd(fd)
+        finally:
+            os.close(fd)
+
+
+def schedule_intervals(datasets):
+    """
+    Scrape interval of every dataset
+    (EUROSTAT_CONFIG['SCHEDULE_INTERVALS'] per dataset, else SCHEDULE_INTERVAL_MINUTES)
+    Args:
+        datasets (iterable): Dataset names
+    Returns:
+        dict: {name: timedelta}
+    """
+    config = settings.EUROSTAT_CONFIG
+    default = config.get('SCHEDULE_INTERVAL_MINUTES', DEFAULT_INTERVAL_MINUTES)
+    overrides = config.get('SCHEDULE_INTERVALS') or {}
+    return {name: timedelta(minutes=float(overrides.get(name, default))) for name in datasets}
+
+
+def schedule_jitter():
+    """Maximum random delay added to every interval (EUROSTAT_CONFIG['SCHEDULE_JITTER_MINUTES'])"""
+    return timedelta(minutes=settings.EUROSTAT_CONFIG.get('SCHEDULE_JITTER_MINUTES', DEFAULT_JITTER_MINUTES))
+
+
+class ScheduleState:
+    """
+    Persisted next run time of every scheduled dataset.
+
+    Due times are computed from the end of the last run, never by stepping the
+    old due time forward, so any number of runs missed while the scheduler was
+    down (or while a run overran) collapses into one catch-up run.
+    """
+
+    def __init__(self, intervals, jitter=None, directory=None):
+        """
+        Args:
+            intervals (dict): {name: timedelta} as returned by schedule_intervals
+            jitter (timedelta): Maximum random delay added to every interval (defaults to schedule_jitter())
+            directory (str): State directory (defaults to checkpoint_dir())
+        """
+        self.intervals = intervals
+        self.jitter = schedule_jitter() if jitter is None else jitter
+        self.path = os.path.join(directory or checkpoint_dir(), STATE_FILE)
+        self.state = self._load()
+
+    def _load(self):
+        """Persisted state ({} when the file is missing or unreadable)"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable schedule state {self.path}: {e}")
+            return {}
+
+    def next_run(self, name):
+        """
+        Returns:
+            datetime: When the dataset is due (None: never run, due now)
+        """
+        value = self.state.get(name, {}).get('next_run')
+        return datetime.fromisoformat(value) if value else None
+
+    def due(self, now=None):
+        """
+        Args:
+            now (datetime): Current time (for tests)
+        Returns:
+            list: (name, missed) for every due dataset, oldest due first; missed is the
+                  number of scheduled runs that one catch-up run replaces
+        """
+        now = now or datetime.now()
+        due = []
+        for name, interval in self.intervals.items():
+            next_run = self.next_run(name)
+            if next_run is None:
+                due.append((datetime.min, name, 1))
+            elif next_run <= now:
+                due.append((next_run, name, 1 + int((now - next_run) / interval)))
+        return [(name, missed) for _, name, missed in sorted(due)]
+
+    def record_run(self, name, status, now=None):
+        """
+        Store the outcome of a run and schedule the next one an interval (plus jitter) from now
+        Args:
+            name (str): Dataset name
+            status (str): 'success' or 'failed'
+            now (datetime): End of the run (for tests)
+        Returns:
+            datetime: Next run time
+        """
+        now = now or datetime.now()
+        next_run = now + self.intervals[name] + self.jitter * random.random()
+        self.state[name] = {'last_run': now.isoformat(), 'status': status, 'next_run': next_run.isoformat()}
+        write_json_atomic(self.path, self.state)
+        return next_run
+
+    def seconds_until_next(self, now=None):
+        """
+        Returns:
+            float: Seconds until the earliest due dataset (0 when one is due already)
+        """
+        now = now or datetime.now()
+        times = [self.next_run(name) or now for name in self.intervals]
+        return max(0.0, (min(times) - now).total_seconds()) if times else None
@@ -0,0 +1,130 @@
+import base64
+import contextvars
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+
+from eurostat_manager import settings
+
+logger = logging.getLogger(__name__)
+
+# Screenshot levels: a capture is kept when its level is at or below the configured one
+SCREENSHOT_LEVELS = {'off': 0, 'error': 1, 'info': 2}
+DEFAULT_LEVEL = 'error'
+DEFAULT_KEEP = 10
+
+# Element screenshots are clipped to the data grid when it is on the page
+GRID_SELECTOR = "#estat-content-view-table"
+
+# Sentinel telling the writer thread to stop
+_STOP = object()
+
+
+class ScreenshotRecorder:
+    """
+    Opt-in screenshots written by a background thread.
+
+    Only the capture itself (one WebDriver command returning base64 PNG data)
+    runs on the caller's thread; decoding, writing and retention happen in a
+    writer thread. Retention uses an in-memory ring of the last `keep` files,
+    so the directory is scanned once at startup instead of on every capture.
+
+    Usage:
+        recorder = ScreenshotRecorder(level='info')
+        recorder.capture(driver, "after_wait_for_table", level='info')
+        recorder.close()
+    """
+
+    def __init__(self, directory=None, level=None, keep=None):
+        """
+        Args:
+            directory (str): Output directory (defaults to EUROSTAT_CONFIG['SCREENSHOT_DIR'])
+            level (str): 'off', 'error' or 'info' (defaults to EUROSTAT_CONFIG['SCREENSHOT_LEVEL'])
+            keep (int): Number of screenshots retained (defaults to EUROSTAT_CONFIG['SCREENSHOT_KEEP'])
+        """
+        config = settings.EUROSTAT_CONFIG
+        self.directory = directory or config.get('SCREENSHOT_DIR', 'screenshots')
+        self.level = level or config.get('SCREENSHOT_LEVEL', DEFAULT_LEVEL)
+        if self.level not in SCREENSHOT_LEVELS:
+            raise ValueError(f"Unknown screenshot level {self.level!r}, expected one of {sorted(SCREENSHOT_LEVELS)}")
+        self.ring = deque(maxlen=keep or config.get('SCREENSHOT_KEEP', DEFAULT_KEEP))
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def enabled(self, level):
+        """Whether captures of the given level are recorded"""
+        return 0 < SCREENSHOT_LEVELS[level] <= SCREENSHOT_LEVELS[self.level]
+
+    def capture(self, driver, name, level='info', selector=GRID_SELECTOR):
+        """
+        Capture the grid element (or the full page when it is absent) and queue it for writing
+        Args:
+            driver: Selenium WebDriver instance
+            name (str): Base filename, a timestamp is appended
+            level (str): 'error' for failures, 'info' for progress snapshots
+            selector (str): CSS selector of the element to clip to, None for the full page
+        """
+        if not self.enabled(level):
+            return
+        elements = driver.find_elements("css selector", selector) if selector else []
+        data = elements[0].screenshot_as_base64 if elements else driver.get_screenshot_as_base64()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        self._start()
+        self.queue.put((os.path.join(self.directory, f"{name}_{timestamp}.png"), data))
+
+    def close(self):
+        """Write pending screenshots and stop the writer thread"""
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.thread = None
+
+    def _start(self):
+        """Start the writer thread on first capture"""
+        if self.thread is None:
+            # Run in a copy of the caller's context so log records keep the run ID
+            self.thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(self._write_loop,), name="screenshot-writer", daemon=True,
+            )
+            self.thread.start()
+
+    def _load_ring(self):
+        """Seed the ring with screenshots left by previous runs (oldest first), once"""
+        os.makedirs(self.directory, exist_ok=True)
+        existing = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in existing[:-self.ring.maxlen or None]:
+            self._remove(entry.path)
+        self.ring.extend(entry.path for entry in existing[-self.ring.maxlen:])
+
+    def _write_loop(self):
+        """Writer thread: decode, write and rotate screenshots"""
+        self._load_ring()
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            path, data = item
+            try:
+                with open(path, 'wb') as f:
+                    f.write(base64.b64decode(data))
+            except OSError as e:
+                logger.error(f"Error writing screenshot {path}: {e}")
+                continue
+            if len(self.ring) == self.ring.maxlen:
+                self._remove(self.ring[0])  # Evicted by the append below
+            self.ring.append(path)
+            logger.debug(f"Screenshot saved as: {path}")
+
+    @staticmethod
+    def _remove(path):
+        """Delete a rotated screenshot, ignoring files already gone"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
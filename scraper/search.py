@@ -0,0 +1,129 @@
+import logging
+import unicodedata
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "scraper_geoarea_fts"
+DEFAULT_LIMIT = 20
+
+
+def fold(text):
+    """
+    Normalize text for search: accents removed, case folded, punctuation as spaces
+    Args:
+        text (str): e.g. 'Kosovo* (under United Nations Security Council Resolution 1244/99)'
+    Returns:
+        str: Space separated tokens, e.g. 'kosovo under united nations ... 1244 99'
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(''.join(char if char.isalnum() else ' ' for char in stripped.casefold()).split())
+
+
+def search_document(code, name, notes=None):
+    """
+    Indexed search text of a geo area (GeoArea.search_text)
+    Args:
+        code (str): Geo code, e.g. 'EU27_2020'
+        name (str): Descriptive name
+        notes (str): Optional notes (e.g. the Kosovo UNSCR text)
+    Returns:
+        str: Folded tokens with a leading space, so ' token' matches word prefixes anywhere
+    """
+    return ' ' + ' '.join(part for part in (fold(code), fold(name), fold(notes)) if part)
+
+
+def query_tokens(query):
+    """Folded tokens of a user query"""
+    return fold(query).split()
+
+
+def search_backend():
+    """Index used by search_geo_areas on the default database: 'fts5', 'trigram' or 'scan'"""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            return 'fts5' if cursor.fetchone() else 'scan'
+    if connection.vendor == 'postgresql':
+        return 'trigram'
+    return 'scan'
+
+
+def _fts_match(tokens):
+    """FTS5 MATCH expression: every token as a quoted prefix"""
+    # Tokens are alphanumeric only, so quoting them is enough to keep the MATCH syntax safe
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _filter_tokens(queryset, tokens):
+    """Keep the areas where every token prefixes a word of search_text (no index on SQLite without FTS5)"""
+    for token in tokens:
+        # ' token' is a word prefix; served by the pg_trgm GIN index on Postgres
+        queryset = queryset.filter(search_text__contains=f' {token}')
+    return queryset
+
+
+def search_geo_area_ids(query, limit=DEFAULT_LIMIT):
+    """
+    Prefix search over folded geo codes, names and notes; every query token must
+    prefix a word ('bruss' finds 'Région de Bruxelles-Capitale', 'de1' finds 'DE11')
+    Args:
+        query (str): User input
+        limit (int): Maximum results
+    Returns:
+        list: GeoArea primary keys, best match first
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+    backend = search_backend()
+    if backend == 'fts5':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+                [_fts_match(tokens), limit])
+            return [row[0] for row in cursor.fetchall()]
+
+    from .models import GeoArea
+    queryset = _filter_tokens(GeoArea.objects.all(), tokens)
+    if backend == 'trigram':
+        from django.contrib.postgres.search import TrigramSimilarity
+        queryset = queryset.annotate(similarity=TrigramSimilarity('search_text', ' '.join(tokens)))
+        queryset = queryset.order_by('-similarity', 'code')
+    return list(queryset.values_list('pk', flat=True)[:limit])
+
+
+def filter_geo_areas(queryset, query):
+    """
+    Every match of a prefix search, as a filter of a GeoArea queryset (unranked and
+    unlimited, e.g. for paginated lists)
+    Args:
+        queryset (QuerySet): GeoArea queryset to filter
+        query (str): User input
+    Returns:
+        QuerySet: queryset restricted to the matching areas
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return queryset.none()
+    if search_backend() == 'fts5':
+        from django.db.models.expressions import RawSQL
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [_fts_match(tokens)])
+        return queryset.filter(pk__in=matches)
+    return _filter_tokens(queryset, tokens)
+
+
+def search_geo_areas(query, limit=DEFAULT_LIMIT):
+    """
+    Args:
+        query (str): User input
+        limit (int): Maximum results
+    Returns:
+        list: GeoArea objects, best match first
+    """
+    from .models import GeoArea
+    ids = search_geo_area_ids(query, limit)
+    areas = GeoArea.objects.in_bulk(ids)
+    return [areas[pk] for pk in ids if pk in areas]
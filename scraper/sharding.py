@@ -0,0 +1,362 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from .checkpoints import dataset_key
+from .eurostat_scraper import EurostatScraper
+from .geo_cache import GeoCache
+from .metrics import RunMetrics
+from .records import ObservationBatch
+
+logger = logging.getLogger(__name__)
+
+# Facets a dataset can be split by, and the data browser URL parameter filtering each one
+FACET_PARAMS = {
+    'geo': 'geo',
+    'time': 'time',
+}
+DEFAULT_FACET = 'geo'
+COUNTRY_PREFIX = 2  # NUTS codes start with their country code: shards keep countries together
+
+
+class ShardMergeError(RuntimeError):
+    """Shard results overlap, leave gaps, or a shard page ignored its filter"""
+
+
+def shard_url(url, facet, values):
+    """
+    Data browser URL of one shard: the dataset page filtered to some facet values
+    Args:
+        url (str): Dataset page (e.g. .../databrowser/view/nama_10r_3gdp/default/table?lang=en)
+        facet (str): 'geo' or 'time'
+        values (list): Codes or years kept in the shard
+    Returns:
+        str: url with one repeated filter parameter per value (geo=AT1&geo=AT2...)
+    """
+    param = FACET_PARAMS[facet]
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != param]
+    query += [(param, str(value)) for value in values]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def plan_shards(facet, values, shards):
+    """
+    Split the facet values of a dataset into shards of similar size
+    Args:
+        facet (str): 'geo' (countries kept together, largest first into the smallest shard)
+                     or 'time' (contiguous year ranges)
+        values (list): Every geo code or year of the dataset
+        shards (int): Number of shards
+    Returns:
+        list: One non-empty list of values per shard
+    """
+    values = list(dict.fromkeys(values))
+    shards = max(1, min(shards, len(values)))
+    if facet == 'time':
+        ordered = sorted(values, key=int)
+        return [[str(year) for year in part] for part in np.array_split(np.array(ordered, dtype=object), shards)]
+    groups = {}
+    for code in values:
+        groups.setdefault(code[:COUNTRY_PREFIX], []).append(code)
+    if len(groups) < shards:
+        # Fewer countries than shards: split the codes themselves
+        return [list(part) for part in np.array_split(np.array(values, dtype=object), shards)]
+    planned = [[] for _ in range(shards)]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(planned, key=len).extend(group)
+    return planned
+
+
+def facet_values(url, facet):
+    """
+    Stored geo codes or years of a dataset, without opening a browser: the
+    generic observation store first, then the geo cache (geo only). Only a hint
+    of the last import: new regions or years are only in the live page headers.
+    Args:
+        url (str): Dataset page
+        facet (str): 'geo' or 'time'
+    Returns:
+        list: Codes or year strings (empty when the dataset was never scraped)
+    """
+    from .models import Code, Observation
+    dataset = dataset_key(url)
+    if facet == 'time':
+        periods = (Observation.objects.filter(series__dataset__code=dataset)
+                   .order_by('period').values_list('period', flat=True).distinct())
+        return [str(period) for period in periods]
+    codes = list(Code.objects.filter(dimension__dataset__code=dataset, dimension__code='geo')
+                 .order_by('code').values_list('code', flat=True))
+    if codes:
+        return codes
+    return [code for geo_dict in GeoCache(dataset).cached_geo_dicts() for code in geo_dict]
+
+
+def merge_shards(facet, groups, results, expected=None):
+    """
+    Merge shard results by row-id and check that they partition the dataset
+    Args:
+        facet (str): Facet the shards were split by
+        groups (list): Values assigned to every shard (see plan_shards)
+        results (list): (geo_dicts, years, ObservationBatch) of every shard, in groups order
+        expected (list): Every value of the facet (defaults to the union of groups)
+    Returns:
+        tuple: (geo_dicts, years, ObservationBatch) of the whole dataset
+    Raises:
+        ShardMergeError: When a shard holds values outside its filter, two shards hold the same
+                         (row-id, year) cell, or an expected value is in no shard
+    """
+    problems = []
+    merged = ObservationBatch()
+    years = set()
+    for index, (group, (geo_dicts, shard_years, batch)) in enumerate(zip(groups, results)):
+        for geo_dict in geo_dicts:
+            for code, name in geo_dict.items():
+                merged.add_geo(code, name)
+        years.update(shard_years)
+        # Values outside the shard's filter: the page ignored the URL parameter
+        found = set(batch.geo_codes) if facet == 'geo' else set(shard_years)
+        leaked = found - set(group)
+        if leaked:
+            problems.append(f"shard {index} holds {len(leaked)} {facet} values outside its filter "
+                            f"(e.g. {sorted(leaked)[:5]})")
+        merged.extend(batch)
+
+    # Overlaps: the same (row-id, year) cell read by more than one shard
+    columns = merged.as_numpy()
+    keys = (columns['geo_index'].astype(np.int64) << 16) | columns['year'].astype(np.uint16)
+    unique, counts = np.unique(keys, return_counts=True)
+    overlapping = unique[counts > 1]
+    if len(overlapping):
+        examples = [f"{merged.geo_codes[key >> 16]}/{key & 0xFFFF}" for key in overlapping[:5].tolist()]
+        problems.append(f"{len(overlapping)} cells read by several shards (e.g. {examples})")
+
+    # Gaps: values of the dataset that no shard rendered (headers, so rows without data still count)
+    rendered = set(merged.geo_codes) if facet == 'geo' else years
+    missing = [value for value in (expected or [v for group in groups for v in group]) if str(value) not in rendered]
+    if missing:
+        problems.append(f"{len(missing)} {facet} values in no shard (e.g. {missing[:5]})")
+
+    if problems:
+        raise ShardMergeError('; '.join(problems))
+    geo_dicts = [{code: name} for code, name in zip(merged.geo_codes, merged.geo_names)]
+    return geo_dicts, sorted(years, key=int), merged
+
+
+class ShardedScraper:
+    """
+    Scrape one large dataset as several filtered pages in parallel browsers.
+
+    The geo codes (or years) of the dataset, read from the headers of one
+    unsharded render of the page, are split into shards, each shard
+    is the data browser page filtered through URL parameters (see shard_url)
+    and is rendered and extracted by its own Chrome in a worker thread; the
+    results are merged by row-id (see merge_shards), which fails when shards
+    overlap or leave gaps. Every shard keeps its own extraction checkpoint,
+    so a failed shard is resumed by the next run. Drop-in for EurostatScraper
+    in scrape_eurostat's sequential mode.
+
+    Usage:
+        with ShardedScraper(url, shards=4, facet='geo', metrics=metrics) as scraper:
+            geo_dicts, years, batch = scraper.extract_grid()
+            ...  # import
+            scraper.clear_checkpoint()
+    """
+
+    geo_cache_hit = False  # Merged headers are never served from the geo cache
+
+    def __init__(self, url, shards, facet=DEFAULT_FACET, values=None, headless=True, metrics=None,
+                 resume=True, accept_consent=True, monitor=None):
+        """
+        Args:
+            url (str): Dataset page
+            shards (int): Number of shards, and of browsers running at the same time
+            facet (str): 'geo' or 'time'
+            values (list): Every geo code or year of the dataset as read from the live page headers
+                           (defaults to one unsharded render of the headers, see discover_values)
+            headless (bool): Whether to run browsers in headless mode
+            metrics (RunMetrics): Run record receiving the shard report
+            resume (bool): Reuse rows from matching shard checkpoints
+            accept_consent (bool): Look for the cookie banner
+            monitor (ResourceMonitor): Samples every shard browser (their memory counts against one limit)
+        """
+        if facet not in FACET_PARAMS:
+            raise ValueError(f"Unknown shard facet {facet!r} (expected one of {sorted(FACET_PARAMS)})")
+        self.url = url
+        self.shards = shards
+        self.facet = facet
+        self.values = values
+        self.headless = headless
+        self.metrics = metrics or RunMetrics()
+        self.resume = resume
+        self.accept_consent = accept_consent
+        self.monitor = monitor
+        self.scrapers = []  # EurostatScraper of every shard, kept to clear their checkpoints
+        self.report = None
+
+    def __enter__(self):
+        # Browsers are started by the shard workers, so their start-up runs in parallel too
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def discover_values(self):
+        """Facet values from one render of the unfiltered page's headers (no cells are read)"""
+        logger.info(f"Reading the {self.facet} values of {dataset_key(self.url)} from the page headers")
+        with self.metrics.span('discover_shards'), \
+                EurostatScraper(headless=self.headless, metrics=self.metrics, base_url=self.url,
+                                accept_consent=self.accept_consent, monitor=self.monitor) as scraper:
+            geo_dicts, years = scraper.load_grid()
+        if self.facet == 'time':
+            return list(years)
+        return [code for geo_dict in geo_dicts for code in geo_dict]
+
+    def compare_with_store(self, values):
+        """
+        Changes of the live facet values since the last import (logged only: shards and
+        gap checks always follow the live headers)
+        Returns:
+            dict: {'new': count, 'dropped': count} (None when the dataset was never stored)
+        """
+        stored = facet_values(self.url, self.facet)
+        if not stored:
+            return None
+        live, known = {str(value) for value in values}, {str(value) for value in stored}
+        new, dropped = sorted(live - known), sorted(known - live)
+        if new or dropped:
+            logger.info(f"{len(new)} new {self.facet} values (e.g. {new[:5]}), {len(dropped)} no longer "
+                        f"on the page (e.g. {dropped[:5]}) since the last import")
+        return {'new': len(new), 'dropped': len(dropped)}
+
+    def extract_grid(self):
+        """
+        Extract every shard in parallel and merge them
+        Returns:
+            tuple: (geo_dicts, years, ObservationBatch) of the whole dataset
+        Raises:
+            ShardMergeError: When the shards do not partition the dataset
+        """
+        # Live headers only: stored values would never shard (nor check) regions or years added upstream
+        run_start = time.perf_counter()
+        values = self.values or self.discover_values()
+        discovery_seconds = time.perf_counter() - run_start
+        changes = self.compare_with_store(values)
+        groups = plan_shards(self.facet, values, self.shards)
+        # Every shard counts into its own RunMetrics (the counters are not thread-safe);
+        # they are merged into the run's metrics once the workers are done
+        self.scrapers = [
+            EurostatScraper(headless=self.headless, metrics=RunMetrics(run_id=self.metrics.run_id),
+                            resume=self.resume, base_url=shard_url(self.url, self.facet, group),
+                            accept_consent=self.accept_consent, profile_dir='', shard=f"shard{index}",
+                            monitor=self.monitor)
+            for index, group in enumerate(groups)
+        ]
+        logger.info(f"Scraping {dataset_key(self.url)} in {len(groups)} {self.facet} shards "
+                    f"of {[len(group) for group in groups]} values")
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="shard") as pool:
+                # Every worker carries the run ID context of the caller into its log records
+                futures = [pool.submit(contextvars.copy_context().run, self._extract_shard, scraper)
+                           for scraper in self.scrapers]
+                results = [future.result() for future in futures]
+        finally:
+            # Workers are done (the pool waits for them): failed runs keep their WebDriver calls too
+            for scraper in self.scrapers:
+                self.metrics.merge(scraper.metrics)
+        seconds = time.perf_counter() - start
+
+        with self.metrics.span('merge_shards'):
+            geo_dicts, years, batch = merge_shards(self.facet, groups, [result[:3] for result in results], values)
+        total_seconds = time.perf_counter() - run_start
+        shard_seconds = [result[3] for result in results]
+        self.report = {
+            'facet': self.facet,
+            'shards': len(groups),
+            'values': [len(group) for group in groups],
+            'observations': [len(result[2]) for result in results],
+            'webdriver_calls': [scraper.metrics.webdriver_calls for scraper in self.scrapers],
+            'shard_seconds': shard_seconds,
+            'discovery_seconds': discovery_seconds,
+            'seconds': seconds,
+            'total_seconds': total_seconds,
+            # Average number of shards busy at once (overlap, not a speedup: each shard renders
+            # a smaller page than an unsharded run would; see bench_shards for the speedup)
+            'parallelism': sum(shard_seconds) / seconds if seconds else None,
+            'changes_since_store': changes,
+        }
+        self.metrics.extra['shards'] = self.report
+        logger.info(f"Merged {len(groups)} shards into {batch!r} in {total_seconds:.1f}s "
+                    f"(discovery {discovery_seconds:.1f}s, shards {seconds:.1f}s, "
+                    f"parallelism x{self.report['parallelism']:.2f})")
+        return geo_dicts, years, batch
+
+    @staticmethod
+    def _extract_shard(scraper):
+        """
+        Render and extract one shard in its own browser
+        Returns:
+            tuple: (geo_dicts, years, ObservationBatch, seconds)
+        """
+        start = time.perf_counter()
+        # Queries run on this worker's own connection: counted in the shard's metrics, merged afterwards
+        with scraper.metrics.track_queries(), scraper:
+            geo_dicts, years, batch = scraper.extract_grid()
+        seconds = time.perf_counter() - start
+        logger.info(f"Shard {scraper.dataset}: {batch!r} in {seconds:.1f}s")
+        return geo_dicts, years, batch, seconds
+
+    def clear_checkpoint(self):
+        """Drop the checkpoints of every shard once the merged data is imported"""
+        for scraper in self.scrapers:
+            scraper.clear_checkpoint()
+
+    def save_geo_cache(self):
+        """Shard headers are partial: nothing is cached"""
+
+
+def bench_shards(url, shard_counts=(1, 2, 4), facet=DEFAULT_FACET, headless=True, accept_consent=True):
+    """
+    Wall time of a dataset extracted with different shard counts, and the speedup over one shard.
+    Sharded runs are timed end to end, discovery of the facet values and merge included.
+    Needs Chrome and a page that honors the facet URL parameter.
+    Args:
+        url (str): Dataset page
+        shard_counts (tuple): Shard counts to compare (the unsharded baseline, 1, always runs first)
+        facet (str): 'geo' or 'time'
+        headless (bool): Whether to run browsers in headless mode
+        accept_consent (bool): Look for the cookie banner
+    Returns:
+        list: One result dict per shard count
+    """
+    results = []
+    baseline = None
+    for count in sorted(set(shard_counts) | {1}):
+        start = time.perf_counter()
+        discovery_seconds = 0.0
+        if count == 1:
+            with EurostatScraper(headless=headless, resume=False, base_url=url, accept_consent=accept_consent,
+                                 profile_dir='') as scraper:
+                _, _, batch = scraper.extract_grid()
+                scraper.clear_checkpoint()
+        else:
+            # No values handed over: a real sharded run pays for reading the live headers first
+            scraper = ShardedScraper(url, count, facet=facet, headless=headless, resume=False,
+                                     accept_consent=accept_consent)
+            _, _, batch = scraper.extract_grid()
+            scraper.clear_checkpoint()
+            discovery_seconds = scraper.report['discovery_seconds']
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        results.append({
+            'suite': 'shards', 'case': f"{facet}_x{count}", 'shards': count, 'observations': len(batch),
+            'seconds': seconds, 'discovery_seconds': discovery_seconds, 'speedup': baseline / seconds,
+        })
+        logger.info(f"{count} shard(s): {len(batch)} observations in {seconds:.1f}s")
+    return results
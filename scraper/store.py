@@ -0,0 +1,192 @@
+import logging
+from itertools import islice
+
+import numpy as np
+from django.db import connection, transaction
+
+from eurostat_manager import settings
+from .checkpoints import dataset_key
+from .models import Code, Dataset, Dimension, Observation, ObservationText, Series
+
+logger = logging.getLogger(__name__)
+
+GEO_DIMENSION = 'geo'
+DEFAULT_GDP_DATASET = 'gdp'     # Dataset code of the GDP tables when no BASE_URL is configured
+DEFAULT_LOAD_BATCH_SIZE = 5000  # Observations per upsert statement batch
+
+
+def gdp_dataset_code():
+    """Store dataset holding the GDPData observations (the dataset of EUROSTAT_CONFIG['BASE_URL'])"""
+    url = settings.EUROSTAT_CONFIG.get('BASE_URL')
+    return dataset_key(url) if url else DEFAULT_GDP_DATASET
+
+
+def ensure_dataset(code, title='', source_url='', dimensions=(GEO_DIMENSION,)):
+    """
+    Get or create a dataset and its dimensions
+    Args:
+        code (str): Dataset code (e.g. 'nama_10_gdp')
+        title (str): Descriptive title (only set when the dataset is created)
+        source_url (str): Data browser page
+        dimensions (tuple): Dimension codes in series key order
+    Returns:
+        tuple: (Dataset, {dimension code: Dimension})
+    """
+    source_url = source_url or ''  # e.g. a replayed recording without EUROSTAT_BASE_URL
+    dataset, created = Dataset.objects.get_or_create(code=code, defaults={'title': title, 'source_url': source_url})
+    if not created and source_url and dataset.source_url != source_url:
+        dataset.source_url = source_url
+        dataset.save(update_fields=['source_url', 'updated_at'])
+    found = {dimension.code: dimension for dimension in dataset.dimensions.all()}
+    for position, name in enumerate(dimensions):
+        if name not in found:
+            found[name] = Dimension.objects.create(dataset=dataset, code=name, position=position)
+    return dataset, found
+
+
+def ensure_codes(dimension, labels):
+    """
+    Dictionary-encode codes of a dimension: create missing codes, refresh changed labels
+    Args:
+        dimension (Dimension): Dimension of the codes
+        labels (dict): {code: label}
+    Returns:
+        dict: {code: Code pk}
+    """
+    existing = {code: (pk, label) for pk, code, label in dimension.codes.values_list('pk', 'code', 'label')}
+    Code.objects.bulk_create(
+        [Code(dimension=dimension, code=code, label=label) for code, label in labels.items() if code not in existing],
+        batch_size=DEFAULT_LOAD_BATCH_SIZE,
+    )
+    relabeled = [Code(pk=existing[code][0], label=label) for code, label in labels.items()
+                 if code in existing and existing[code][1] != label]
+    Code.objects.bulk_update(relabeled, ['label'], batch_size=DEFAULT_LOAD_BATCH_SIZE)
+    return dict(dimension.codes.filter(code__in=list(labels)).values_list('code', 'pk'))
+
+
+def ensure_series(dataset, keys):
+    """
+    Get or create the series of a dataset with a single dimension code each
+    Args:
+        dataset (Dataset): Dataset of the series
+        keys (dict): {series key: Code pk}
+    Returns:
+        dict: {series key: Series pk}
+    """
+    existing = dict(dataset.series.filter(key__in=list(keys)).values_list('key', 'pk'))
+    missing = [key for key in keys if key not in existing]
+    if missing:
+        Series.objects.bulk_create([Series(dataset=dataset, key=key) for key in missing],
+                                   batch_size=DEFAULT_LOAD_BATCH_SIZE)
+        existing = dict(dataset.series.filter(key__in=list(keys)).values_list('key', 'pk'))
+        Series.codes.through.objects.bulk_create(
+            [Series.codes.through(series_id=existing[key], code_id=keys[key]) for key in missing],
+            batch_size=DEFAULT_LOAD_BATCH_SIZE,
+        )
+    return existing
+
+
+def _upsert_sql():
+    """
+    INSERT ... ON CONFLICT statement of one observation (SQLite and Postgres);
+    unchanged rows are not rewritten
+    """
+    table = connection.ops.quote_name(Observation._meta.db_table)
+    distinct = 'IS DISTINCT FROM' if connection.vendor == 'postgresql' else 'IS NOT'
+    return (
+        f"INSERT INTO {table} (series_id, period, value, decimals, flag) VALUES (%s, %s, %s, %s, %s) "
+        f"ON CONFLICT (series_id, period) DO UPDATE SET "
+        f"value = excluded.value, decimals = excluded.decimals, flag = excluded.flag "
+        f"WHERE {table}.value {distinct} excluded.value OR {table}.decimals <> excluded.decimals "
+        f"OR {table}.flag <> excluded.flag"
+    )
+
+
+def load_batch(batch, dataset_code, title='', source_url='', batch_size=None):
+    """
+    Bulk load an ObservationBatch (geo × period) into the generic store.
+
+    Geo codes are dictionary-encoded once, every observation is mapped to its
+    series id with NumPy, and the rows are upserted with executemany in
+    batches; observations missing from the batch (e.g. incremental scrapes)
+    are left untouched.
+    Args:
+        batch (ObservationBatch): Scraper output
+        dataset_code (str): Dataset code (see checkpoints.dataset_key)
+        title (str): Dataset title when it is created
+        source_url (str): Data browser page of the dataset
+        batch_size (int): Observations per executemany (defaults to EUROSTAT_CONFIG['STORE_BATCH_SIZE'])
+    Returns:
+        dict: {'codes', 'series', 'observations'} loaded
+    """
+    batch_size = batch_size or settings.EUROSTAT_CONFIG.get('STORE_BATCH_SIZE', DEFAULT_LOAD_BATCH_SIZE)
+    with transaction.atomic():
+        dataset, dimensions = ensure_dataset(dataset_code, title, source_url)
+        code_pks = ensure_codes(dimensions[GEO_DIMENSION], dict(zip(batch.geo_codes, batch.geo_names)))
+        series_pks = ensure_series(dataset, code_pks)
+
+        columns = batch.as_numpy()
+        series = np.array([series_pks[code] for code in batch.geo_codes], dtype=np.int64)[columns['geo_index']]
+        values = columns['value'].astype(object)
+        values[np.isnan(columns['value'])] = None
+        rows = zip(series.tolist(), columns['year'].tolist(), values.tolist(),
+                   columns['decimals'].tolist(), columns['flag'].tolist())
+        sql = _upsert_sql()
+        with connection.cursor() as cursor:
+            while chunk := list(islice(rows, batch_size)):
+                cursor.executemany(sql, chunk)
+        texts = _load_texts(batch, series, columns, batch_size)
+    logger.info(f"Observation store: {len(batch)} observations ({texts} non-numeric) of {len(series_pks)} series "
+                f"loaded into {dataset_code}")
+    return {'codes': len(code_pks), 'series': len(series_pks), 'observations': len(batch), 'texts': texts}
+
+
+def _load_texts(batch, series, columns, batch_size):
+    """
+    Keep ObservationText in step with the observations just upserted: the original
+    text is written for the cells whose stored value cannot rebuild it (non-numeric
+    text, and -0, whose sign SQLite drops), and removed for the other cells of the batch
+    Args:
+        batch (ObservationBatch): Loaded batch
+        series (np.ndarray): Series id of every observation
+        columns (dict): batch.as_numpy()
+        batch_size (int): Rows per statement
+    Returns:
+        int: Observations of the batch stored with their text
+    """
+    negative_zeros = np.flatnonzero((columns['value'] == 0) & np.signbit(columns['value']))
+    texts = {**{int(i): batch.value_text(int(i)) for i in negative_zeros}, **batch.text}
+    wanted = {(int(series[i]), int(columns['year'][i])): text for i, text in texts.items()}
+    loaded = set(zip(series.tolist(), columns['year'].tolist()))
+
+    series_ids = np.unique(series).tolist()
+    stale, found = [], []
+    for start in range(0, len(series_ids), batch_size):
+        observations = Observation.objects.filter(series_id__in=series_ids[start:start + batch_size])
+        for pk, series_id, period, text in (observations.values_list('pk', 'series_id', 'period', 'text__text')
+                                            .iterator()):
+            key = (series_id, period)
+            if key in wanted:
+                if text != wanted[key]:
+                    found.append(ObservationText(observation_id=pk, text=wanted[key]))
+            elif text is not None and key in loaded:
+                stale.append(pk)
+    for start in range(0, len(stale), batch_size):
+        ObservationText.objects.filter(observation_id__in=stale[start:start + batch_size]).delete()
+    ObservationText.objects.bulk_create(found, batch_size=batch_size, update_conflicts=True,
+                                        unique_fields=['observation'], update_fields=['text'])
+    return len(wanted)
+
+
+def gdp_rows(queryset=None):
+    """
+    GDP observations of the store in the GDPData shape
+    Args:
+        queryset (QuerySet): Optional GDPObservation queryset to restrict the rows
+    Yields:
+        tuple: (geo code, year, value text, flag string) ordered by geo code and year
+    """
+    from .models import GDPObservation
+    queryset = queryset if queryset is not None else GDPObservation.objects.all()
+    for observation in queryset.order_by('series__key', 'period').iterator(chunk_size=DEFAULT_LOAD_BATCH_SIZE):
+        yield observation.geo_code, observation.year, observation.value_text, observation.flag_letters
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from scraper import benchmarks
+from scraper.benchmarks import (BenchmarkCheckFailed, BenchmarkConfig, bench_extract, bench_parse,
+                                compare_results, load_results, write_results)
+
+
+def result(case, seconds, **size):
+    return {'suite': 'parse', 'case': case, 'seconds': seconds, **size}
+
+
+class CompareResultsTests(SimpleTestCase):
+
+    def test_regressions_need_both_threshold_and_noise_floor(self):
+        baseline = [result('slower', 0.100, cells=10), result('noise', 0.0001, cells=10),
+                    result('faster', 0.100, cells=10), result('resized', 0.100, cells=10)]
+        results = [result('slower', 0.120, cells=10), result('noise', 0.0005, cells=10),
+                   result('faster', 0.050, cells=10), result('resized', 0.500, cells=20)]
+        comparisons = {comparison['key'][1]: comparison for comparison in compare_results(results, baseline, 0.10)}
+        self.assertEqual(sorted(comparisons), ['faster', 'noise', 'slower'])
+        self.assertTrue(comparisons['slower']['regression'])
+        self.assertFalse(comparisons['noise']['regression'])
+        self.assertFalse(comparisons['faster']['regression'])
+        self.assertAlmostEqual(comparisons['faster']['ratio'], 0.5)
+
+    def test_results_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.json')
+            write_results(path, [result('parse_cells', 0.1, cells=10)], BenchmarkConfig(repeat=1))
+            self.assertEqual(load_results(path), [result('parse_cells', 0.1, cells=10)])
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([result('parse_cells', 0.2)], f)
+            self.assertEqual(load_results(path), [result('parse_cells', 0.2)])
+
+
+class SuiteTests(SimpleTestCase):
+
+    def test_parse_suite(self):
+        results = bench_parse(BenchmarkConfig(cells=1000, repeat=1))
+        self.assertEqual([r['case'] for r in results], ['parse_special_value', 'parse_cells', 'process_gdp_data'])
+        self.assertEqual(results[0]['cells'], 1000)
+
+    def test_parse_suite_refuses_wrong_results(self):
+        with mock.patch.object(benchmarks, 'find_mismatches', return_value=[('1,0', 1.0, 10.0)]), \
+                self.assertRaises(BenchmarkCheckFailed):
+            bench_parse(BenchmarkConfig(cells=10, repeat=1))
+
+    def test_extract_suite_reads_the_inspector_snapshots(self):
+        results = bench_extract(BenchmarkConfig(repeat=1))
+        self.assertEqual(len(results), len(benchmarks.HTML_FIXTURES))
+        self.assertTrue(all(r['items'] > 0 for r in results))
+
+
+class BenchmarkCommandTests(SimpleTestCase):
+
+    def run_command(self, **options):
+        out = StringIO()
+        with mock.patch('eurostat_manager.management.commands.benchmark_eurostat.isolated_database'):
+            call_command('benchmark_eurostat', suites=['parse'], cells=100, repeat=1, stdout=out, **options)
+        return out.getvalue()
+
+    def test_compare_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            self.assertIn('parse_cells', self.run_command(output=path))
+            baseline = load_results(path)
+            for entry in baseline:
+                entry['seconds'] = 1e-9
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(baseline, f)
+            with mock.patch.object(benchmarks, 'MIN_REGRESSION_SECONDS', -1), self.assertRaises(CommandError):
+                self.run_command(compare=path)
+
+    def test_failed_check_is_a_command_error(self):
+        with mock.patch.object(benchmarks, 'find_mismatches', return_value=[('1,0', 1.0, 10.0)]), \
+                self.assertRaisesMessage(CommandError, "correctness check"):
+            self.run_command()
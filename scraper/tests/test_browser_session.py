@@ -0,0 +1,109 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from eurostat_manager import settings
+from scraper.eurostat_scraper import EurostatScraper, profile_in_use
+
+URL = "https://ec.europa.eu/eurostat/databrowser/view/nama_10r_2gdp/default/table"
+
+
+class FakeElement:
+    def __init__(self):
+        self.clicks = 0
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.clicks += 1
+
+
+class FakeDriver:
+    """Page whose consent banner shows up after `banner_after` probes"""
+
+    def __init__(self, cookies=(), banner_after=0):
+        self.cookies = set(cookies)
+        self.banner_after = banner_after
+        self.probes = 0
+        self.button = FakeElement()
+
+    def get_cookie(self, name):
+        return {'name': name} if name in self.cookies else None
+
+    def find_elements(self, by, selector):
+        self.probes += 1
+        return [self.button] if self.probes > self.banner_after else []
+
+    def find_element(self, by, selector):
+        return FakeElement()
+
+
+class ProfileInUseTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.profile = directory.name
+
+    def lock(self, target):
+        os.symlink(target, os.path.join(self.profile, "SingletonLock"))
+
+    def test_free_profile(self):
+        self.assertFalse(profile_in_use(self.profile))
+
+    def test_profile_of_a_live_chrome(self):
+        self.lock(f"{socket.gethostname()}-{os.getpid()}")
+        self.assertTrue(profile_in_use(self.profile))
+
+    def test_stale_lock_of_a_dead_chrome(self):
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        self.lock(f"{socket.gethostname()}-{process.pid}")
+        self.assertFalse(profile_in_use(self.profile))
+
+    def test_lock_of_another_host(self):
+        self.lock(f"other-host-{os.getpid()}")
+        self.assertFalse(profile_in_use(self.profile))
+
+
+class ConsentTests(SimpleTestCase):
+
+    def setUp(self):
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {'BROWSER_PROFILE_DIR': '', 'CONSENT_COOKIE': 'cck1'})
+        config.start()
+        self.addCleanup(config.stop)
+        self.scraper = EurostatScraper(base_url=URL)
+
+    def test_stored_consent_cookie_skips_the_banner(self):
+        self.scraper.driver = FakeDriver(cookies={'cck1'})
+        self.assertFalse(self.scraper.consent_needed())
+        self.scraper.driver = FakeDriver()
+        self.assertTrue(self.scraper.consent_needed())
+
+    def test_probe_does_not_wait_for_the_banner(self):
+        self.scraper.driver = FakeDriver(banner_after=1)
+        self.assertFalse(self.scraper.accept_cookies())
+        self.assertEqual(self.scraper.driver.probes, 1)
+        self.assertTrue(self.scraper.accept_cookies())
+        self.assertEqual(self.scraper.driver.button.clicks, 1)
+
+    def test_late_banner_is_dismissed_while_the_table_loads(self):
+        driver = self.scraper.driver = FakeDriver(banner_after=2)
+        self.scraper.consent_pending = True
+        for _ in range(2):
+            self.assertTrue(self.scraper._table_ready(driver))
+            self.assertTrue(self.scraper.consent_pending)
+        self.assertTrue(self.scraper._table_ready(driver))
+        self.assertFalse(self.scraper.consent_pending)
+        self.assertEqual(driver.button.clicks, 1)
+        self.scraper._table_ready(driver)
+        self.assertEqual(driver.probes, 3)  # No more probes once dismissed
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from eurostat_manager import settings
+from eurostat_manager.management.commands.scrape_eurostat import Command
+from scraper.changes import ChangeLog, changes_since, diff_observations
+from scraper.logconfig import RUN_ID
+from scraper.models import GDPChange
+from scraper.tests.utils import make_batch
+
+
+class DiffObservationsTests(SimpleTestCase):
+
+    def test_inserts_updates_and_unchanged(self):
+        existing = {2020: ('1.0', None, True), 2021: ('2.0', 'p', True), 2022: (None, None, False)}
+        observations = [(2020, '1.0', None), (2021, '2.0', None), (2022, '3.0', None), (2023, '4.0', 'p')]
+        token = RUN_ID.set('run-1')
+        self.addCleanup(RUN_ID.reset, token)
+        changes = diff_observations('AT', existing, observations)
+        self.assertEqual(
+            [(c.year, c.kind, c.old_value, c.old_flag, c.new_value, c.new_flag, c.run_id) for c in changes],
+            [(2021, 'update', '2.0', 'p', '2.0', None, 'run-1'),
+             (2022, 'update', None, None, '3.0', None, 'run-1'),
+             (2023, 'insert', None, None, '4.0', 'p', 'run-1')],
+        )
+        self.assertTrue(all(change.geo_code == 'AT' and change.pk is None for change in changes))
+
+    def test_nothing_changed(self):
+        self.assertEqual(diff_observations('AT', {2020: ('1.0', None, True)}, [(2020, '1.0', None)]), [])
+
+
+class ChangeLogTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_file_lines_are_written_on_commit(self):
+        path = os.path.join(self.directory, 'changes.ndjson')
+        change_log = ChangeLog(path)
+        self.addCleanup(change_log.close)
+        with self.captureOnCommitCallbacks() as callbacks:
+            change_log.record(diff_observations('AT', {}, [(2020, '1.0', 'p'), (2021, '2.0', None)]))
+        self.assertFalse(os.path.exists(path))
+        for callback in callbacks:
+            callback()
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([(line['year'], line['kind'], line['new_value']) for line in lines],
+                         [(2020, 'insert', '1.0'), (2021, 'insert', '2.0')])
+        self.assertEqual([line['id'] for line in lines], list(GDPChange.objects.order_by('id').values_list('id', flat=True)))
+
+    @mock.patch.dict(settings.EUROSTAT_CONFIG, {'CHANGE_LOG_FILE': ''})
+    def test_import_records_inserts_then_revisions(self):
+        with mock.patch.dict(settings.EUROSTAT_CONFIG, {'CHECKPOINT_DIR': self.directory}):
+            Command().import_observations(make_batch({'AT': {'2020': '1.0', '2021': '2.0'}}))
+            _, cursor = changes_since()
+            Command().import_observations(make_batch({'AT': {'2020': '1.0', '2021': '2.5'}}))
+        self.assertEqual(GDPChange.objects.filter(kind='insert').count(), 2)
+        changes, next_cursor = changes_since(cursor)
+        self.assertEqual([(c.geo_code, c.year, c.kind, c.old_value, c.new_value) for c in changes],
+                         [('AT', 2021, 'update', '2.0', '2.5')])
+        self.assertEqual(changes_since(next_cursor), ([], next_cursor))
+
+    def test_changes_since_pages_and_filters(self):
+        ChangeLog('').record(diff_observations('AT', {}, [(2020, '1.0', None), (2021, '2.0', None)])
+                             + diff_observations('BE', {}, [(2020, '3.0', None)]))
+        page, cursor = changes_since(limit=2)
+        self.assertEqual([(c.geo_code, c.year) for c in page], [('AT', 2020), ('AT', 2021)])
+        page, _ = changes_since(cursor)
+        self.assertEqual([(c.geo_code, c.year) for c in page], [('BE', 2020)])
+        self.assertEqual([c.year for c in changes_since(geo_code='BE')[0]], [2020])
+
+    def test_command_advances_the_cursor_file(self):
+        ChangeLog('').record(diff_observations('AT', {}, [(2020, '1.0', None), (2021, '2.0', None)]))
+        cursor_file = os.path.join(self.directory, 'cursor')
+        out = StringIO()
+        call_command('gdp_changes', cursor_file=cursor_file, limit=1, stdout=out)
+        call_command('gdp_changes', cursor_file=cursor_file, stdout=out)
+        self.assertEqual([json.loads(line)['year'] for line in out.getvalue().splitlines()], [2020, 2021])
+        with open(cursor_file, encoding='utf-8') as f:
+            self.assertEqual(int(f.read()), GDPChange.objects.latest('id').id)
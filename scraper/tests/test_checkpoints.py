@@ -0,0 +1,118 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from eurostat_manager import settings
+from eurostat_manager.management.commands.scrape_eurostat import Command
+from scraper.checkpoints import ExtractionCheckpoint, ImportCheckpoint, batch_fingerprint, dataset_key, grid_version
+from scraper.models import GDPData
+from scraper.tests.utils import make_batch
+
+ROWS = {code: {'2020': f"{100 + i}.0", '2021': f"{200 + i}.0"} for i, code in enumerate(['AT', 'BE', 'BG', 'CY', 'CZ'])}
+
+
+class TemporaryCheckpointDir:
+    """Point EUROSTAT_CONFIG['CHECKPOINT_DIR'] at a throwaway directory"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {'CHECKPOINT_DIR': self.directory})
+        config.start()
+        self.addCleanup(config.stop)
+
+
+class ImportCheckpointTests(TemporaryCheckpointDir, SimpleTestCase):
+
+    def test_fingerprint_depends_on_data_and_chunking(self):
+        batch = make_batch(ROWS)
+        self.assertEqual(batch_fingerprint(batch, 2), batch_fingerprint(make_batch(ROWS), 2))
+        self.assertNotEqual(batch_fingerprint(batch, 2), batch_fingerprint(batch, 3))
+        changed = {**ROWS, 'AT': {'2020': '1,0', '2021': '200.0'}}
+        self.assertNotEqual(batch_fingerprint(batch, 2), batch_fingerprint(make_batch(changed), 2))
+
+    def test_completed_chunks_survive_a_restart(self):
+        checkpoint = ImportCheckpoint('abc')
+        checkpoint.mark_done(0)
+        checkpoint.mark_done(2)
+        self.assertEqual(ImportCheckpoint('abc').load(), {0, 2})
+        self.assertEqual(ImportCheckpoint('abd').load(), set())
+        checkpoint.clear()
+        self.assertFalse(os.path.exists(checkpoint.path))
+
+    def test_unreadable_checkpoint_is_ignored(self):
+        checkpoint = ImportCheckpoint('abc')
+        with open(checkpoint.path, 'w', encoding='utf-8') as f:
+            f.write('{"fingerprint": "abc", "comp')
+        with self.assertLogs('scraper.checkpoints', 'WARNING'):
+            self.assertEqual(checkpoint.load(), set())
+
+
+class ChunkedImportTests(TemporaryCheckpointDir, TestCase):
+
+    def test_killed_import_resumes_after_the_last_committed_chunk(self):
+        batch = make_batch(ROWS)
+        command = Command()
+        # Killed while importing the third region (second chunk of two regions)
+        command.resource_monitor = mock.Mock(raise_if_exceeded=mock.Mock(side_effect=[None, None, KeyboardInterrupt]))
+        with self.assertRaises(KeyboardInterrupt):
+            command.import_observations(batch, chunk_size=2)
+        self.assertEqual(GDPData.objects.count(), 4)
+
+        command = Command()
+        with mock.patch.object(Command, 'process_geo_observations', autospec=True,
+                               side_effect=Command.process_geo_observations) as process:
+            command.import_observations(batch, chunk_size=2)
+        self.assertEqual([call.args[1] for call in process.call_args_list], ['BG', 'CY', 'CZ'])
+        self.assertEqual(GDPData.objects.count(), 10)
+        self.assertEqual(os.listdir(self.directory), [])  # Checkpoint removed once complete
+
+    def test_no_resume_imports_every_chunk(self):
+        batch = make_batch(ROWS)
+        ImportCheckpoint(batch_fingerprint(batch, 2)).mark_done(0)
+        command = Command()
+        command.import_observations(batch, chunk_size=2, resume=False)
+        self.assertEqual(GDPData.objects.count(), 10)
+
+
+class ExtractionCheckpointTests(TemporaryCheckpointDir, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.version = grid_version([{'AT': 'Austria'}, {'BE': 'Belgium'}], ['2020', '2021'])
+
+    def test_rows_survive_a_crash(self):
+        checkpoint = ExtractionCheckpoint('nama_10r_2gdp', self.version)
+        checkpoint.append('AT', {'2020': {'value': '1.0', 'flag': None, 'is_available': True}})
+        # Killed without close(): every row was flushed already
+        self.assertEqual(ExtractionCheckpoint('nama_10r_2gdp', self.version).load(),
+                         {'AT': {'2020': {'value': '1.0', 'flag': None, 'is_available': True}}})
+        checkpoint.clear()
+        self.assertEqual(ExtractionCheckpoint('nama_10r_2gdp', self.version).load(), {})
+
+    def test_truncated_last_line_is_ignored(self):
+        checkpoint = ExtractionCheckpoint('nama_10r_2gdp', self.version)
+        checkpoint.append('AT', {})
+        checkpoint.close()
+        with open(checkpoint.path, 'a', encoding='utf-8') as f:
+            f.write('{"row_id": "BE", "da')
+        with self.assertLogs('scraper.checkpoints', 'WARNING'):
+            self.assertEqual(list(ExtractionCheckpoint('nama_10r_2gdp', self.version).load()), ['AT'])
+
+    def test_new_upstream_version_starts_over(self):
+        checkpoint = ExtractionCheckpoint('nama_10r_2gdp', self.version)
+        checkpoint.append('AT', {})
+        checkpoint.close()
+        version = grid_version([{'AT': 'Austria'}, {'BE': 'Belgium'}], ['2020', '2021', '2022'])
+        self.assertNotEqual(version, self.version)
+        self.assertEqual(ExtractionCheckpoint('nama_10r_2gdp', version).load(), {})
+        self.assertEqual(ExtractionCheckpoint('other', self.version).load(), {})
+
+    def test_dataset_key(self):
+        url = "https://ec.europa.eu/eurostat/databrowser/view/nama_10r_2gdp/default/table?lang=en"
+        self.assertEqual(dataset_key(url), 'nama_10r_2gdp')
+        self.assertEqual(dataset_key("http://127.0.0.1:8000/page.html"), dataset_key("http://127.0.0.1:8000/page.html"))
+        self.assertEqual(len(dataset_key("http://127.0.0.1:8000/page.html")), 12)
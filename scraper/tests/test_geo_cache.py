@@ -0,0 +1,60 @@
+import tempfile
+
+from django.test import SimpleTestCase, TestCase
+
+from scraper.geo_cache import GeoCache, geo_area_defaults, headers_hash, resolve_geo_pks
+from scraper.models import GeoArea
+
+GEO_DICTS = [{'AT': 'Austria'}, {'BE': 'Belgium'}]
+
+
+class GeoCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_headers_hash_depends_on_codes_and_order(self):
+        self.assertEqual(headers_hash(['AT', 'BE']), headers_hash(['AT', 'BE']))
+        self.assertNotEqual(headers_hash(['AT', 'BE']), headers_hash(['BE', 'AT']))
+        self.assertNotEqual(headers_hash(['AT', 'BE']), headers_hash(['ATBE']))
+
+    def test_lookup_hits_only_on_the_saved_hash(self):
+        cache = GeoCache('nama_10r_2gdp', self.directory)
+        self.assertIsNone(cache.lookup(headers_hash(['AT', 'BE'])))
+        cache.save(headers_hash(['AT', 'BE']), GEO_DICTS)
+        cache = GeoCache('nama_10r_2gdp', self.directory)
+        self.assertEqual(cache.lookup(headers_hash(['AT', 'BE'])), GEO_DICTS)
+        self.assertIsNone(cache.lookup(headers_hash(['AT', 'BE', 'BG'])))
+        self.assertEqual(cache.cached_geo_dicts(), GEO_DICTS)
+
+    def test_datasets_are_kept_apart(self):
+        GeoCache('nama_10r_2gdp', self.directory).save(headers_hash(['AT']), [{'AT': 'Austria'}])
+        GeoCache('other', self.directory).save(headers_hash(['BE']), [{'BE': 'Belgium'}])
+        self.assertEqual(GeoCache('nama_10r_2gdp', self.directory).lookup(headers_hash(['AT'])), [{'AT': 'Austria'}])
+        self.assertIsNone(GeoCache('other', self.directory).lookup(headers_hash(['AT'])))
+
+    def test_unreadable_cache_is_a_miss(self):
+        cache = GeoCache('nama_10r_2gdp', self.directory)
+        with open(cache.path, 'w', encoding='utf-8') as f:
+            f.write('{"nama_10r_2gdp": {"hash"')
+        with self.assertLogs('scraper.geo_cache', 'WARNING'):
+            self.assertIsNone(cache.lookup(headers_hash(['AT'])))
+
+    def test_geo_area_defaults(self):
+        kosovo = geo_area_defaults('Kosovo*')
+        self.assertTrue(kosovo['is_kosovo'])
+        self.assertEqual(kosovo['notes'], 'UNSCR 1244/1999')
+        self.assertTrue(geo_area_defaults('European Union - 27 countries (from 2020)')['is_eu'])
+        self.assertTrue(geo_area_defaults('Euro area - 20 countries (from 2023)')['is_euro_area'])
+        self.assertEqual(geo_area_defaults('Austria'), {'name': 'Austria', 'is_kosovo': False, 'is_eu': False,
+                                                        'is_euro_area': False, 'notes': None})
+
+
+class ResolveGeoPksTests(TestCase):
+
+    def test_only_stored_codes_are_resolved(self):
+        austria = GeoArea.objects.create(code='AT', name='Austria')
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_geo_pks(iter(['AT', 'BE'])), {'AT': austria.pk})
@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from scraper.importtime import heavy_imports, parse_importtime
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        900 |   selenium.webdriver.common.by
+import time:      2000 |      50000 | selenium.webdriver.chrome
+import time:       800 |      30000 |   selenium.webdriver.chrome.webdriver
+import time:       400 |        400 | pandasql
+"""
+
+
+class ImportTimeTests(SimpleTestCase):
+
+    def test_parse_importtime(self):
+        entries = parse_importtime(OUTPUT + "Traceback line\n")
+        self.assertEqual([entry['module'] for entry in entries],
+                         ['_io', 'selenium.webdriver.common.by', 'selenium.webdriver.chrome',
+                          'selenium.webdriver.chrome.webdriver', 'pandasql'])
+        self.assertEqual([entry['depth'] for entry in entries], [2, 1, 0, 1, 0])
+        self.assertEqual(entries[2]['cumulative_us'], 50000)
+
+    def test_heavy_imports_reports_the_package_once(self):
+        heavy = heavy_imports(parse_importtime(OUTPUT))
+        self.assertEqual([entry['module'] for entry in heavy], ['selenium.webdriver.chrome'])
+
+    def test_startup_stays_light(self):
+        out = StringIO()
+        call_command('profile_startup', top=3, stdout=out)
+        self.assertIn("No heavy backend imported at startup", out.getvalue())
+
+    def test_eager_backend_import_fails(self):
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "heavy module(s) imported at startup"):
+            call_command('profile_startup', modules=['selenium.webdriver.support.ui'], stdout=out)
+        self.assertIn("Heavy import at startup: selenium.webdriver.support", out.getvalue())
+        call_command('profile_startup', modules=['selenium.webdriver.support.ui'], allow_heavy=True, stdout=out)
@@ -0,0 +1,91 @@
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from eurostat_manager import settings
+from scraper.incremental import IncrementalPlan, RefreshState
+from scraper.models import GDPData, GeoArea
+from scraper.records import ObservationBatch
+from scraper.store import load_batch
+
+# {code: {year: (value, flag)}}: AT 2019 is estimated, BE 2020 provisional with a combined flag
+CELLS = {
+    'AT': {2019: ('90.0', 'e'), 2020: ('100.0', None), 2021: ('110.0', 'p')},
+    'BE': {2019: ('190.0', None), 2020: ('200.0', 'bp'), 2021: ('250.0', None)},
+}
+
+
+class IncrementalPlanTests(TestCase):
+
+    def test_from_db(self):
+        for code, years in CELLS.items():
+            area = GeoArea.objects.create(code=code, name=f"Area {code}")
+            GDPData.objects.bulk_create([GDPData(geo_area=area, year=year, value=value, flag=flag, is_available=True)
+                                         for year, (value, flag) in years.items()])
+        plan = IncrementalPlan.from_db()
+        self.assertEqual(plan.newest_year, 2021)
+        self.assertEqual(plan.volatile_cells, {('AT', 2019), ('BE', 2020)})
+        self.assertIsNone(IncrementalPlan.from_db(GDPData.objects.none()))
+
+    @mock.patch.dict(settings.EUROSTAT_CONFIG, {'BASE_URL': None})
+    def test_from_store_is_scoped_to_the_dataset(self):
+        batch = ObservationBatch()
+        for code, years in CELLS.items():
+            batch.add_geo(code)
+            batch.add_row(code, {str(year): {'value': value, 'flag': flag, 'is_available': True}
+                                 for year, (value, flag) in years.items()})
+        load_batch(batch, 'other_dataset')
+        plan = IncrementalPlan.from_store('other_dataset')
+        self.assertEqual(plan.newest_year, 2021)
+        self.assertEqual(plan.volatile_cells, {('AT', 2019), ('BE', 2020)})
+        self.assertIsNone(IncrementalPlan.from_store('nama_10r_2gdp'))
+
+
+class IncrementalPlanFilterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.plan = IncrementalPlan(2021, {('AT', 2018), ('BE', 2020)})
+
+    def test_columns_and_cells(self):
+        self.assertEqual(self.plan.first_year, 2018)
+        self.assertEqual([year for year in range(2017, 2023) if self.plan.wants_column(str(year))],
+                         [2018, 2020, 2021, 2022])
+        self.assertTrue(self.plan.wants_cell('AT', '2018'))
+        self.assertFalse(self.plan.wants_cell('BE', '2018'))
+        self.assertTrue(self.plan.wants_cell('BE', 2022))
+
+    def test_filter_row(self):
+        row = {year: {'value': '1.0', 'flag': None, 'is_available': True} for year in ('2018', '2019', '2021')}
+        self.assertEqual(list(self.plan.filter_row('AT', row)), ['2018', '2021'])
+        self.assertIsNone(self.plan.filter_row('BE', {'2019': row['2019']}))
+        self.assertIsNone(self.plan.filter_row('BE', None))
+
+    def test_key_changes_with_the_plan(self):
+        self.assertEqual(self.plan.key(), 'inc2021_2')
+        self.assertNotEqual(self.plan.key(), IncrementalPlan(2022, set()).key())
+
+
+class RefreshStateTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_full_refresh_due_per_dataset(self):
+        state = RefreshState('nama_10r_2gdp', self.directory)
+        self.assertTrue(state.full_refresh_due(days=30))
+        now = datetime(2025, 3, 25)
+        state.mark_full_refresh(now - timedelta(days=10))
+        self.assertFalse(state.full_refresh_due(days=30, now=now))
+        self.assertTrue(state.full_refresh_due(days=10, now=now))
+        self.assertTrue(RefreshState('other', self.directory).full_refresh_due(days=30, now=now))
+
+    def test_unreadable_state_forces_a_full_refresh(self):
+        state = RefreshState('nama_10r_2gdp', self.directory)
+        with open(state.path, 'w', encoding='utf-8') as f:
+            f.write('{"last_full_refresh": "yesterday"}')
+        with self.assertLogs('scraper.incremental', 'WARNING'):
+            self.assertTrue(state.full_refresh_due(days=30))
@@ -0,0 +1,53 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextvars import copy_context
+
+from django.test import SimpleTestCase
+
+from scraper.logconfig import (RUN_ID, JsonFormatter, LazyRotatingFileHandler, RunIdFilter, SampleFilter,
+                               run_context)
+
+
+def make_record(message='message', level=logging.INFO, **extra):
+    return logging.makeLogRecord({'name': 'scraper.test', 'msg': message, 'levelno': level,
+                                  'levelname': logging.getLevelName(level), **extra})
+
+
+class LogConfigTests(SimpleTestCase):
+
+    def test_run_id_reaches_threads_started_in_the_run(self):
+        seen = []
+        with run_context('run-1'):
+            record = make_record()
+            RunIdFilter().filter(record)
+            thread = threading.Thread(target=copy_context().run, args=(lambda: seen.append(RUN_ID.get()),))
+            thread.start()
+            thread.join()
+        self.assertEqual((record.run_id, seen, RUN_ID.get()), ('run-1', ['run-1'], None))
+
+    def test_sampling_keeps_one_debug_record_in_rate(self):
+        sample = SampleFilter(rate=10)
+        kept = [sample.filter(make_record(level=logging.DEBUG, sample='row')) for _ in range(25)]
+        self.assertEqual(kept.count(True), 3)
+        self.assertTrue(sample.filter(make_record(level=logging.DEBUG)))
+        self.assertTrue(all(sample.filter(make_record(level=logging.WARNING, sample='row')) for _ in range(5)))
+
+    def test_json_lines_carry_run_id_and_extra_fields(self):
+        record = make_record('Row %s', args=('AT',), run_id='run-1', sample='row', cells=3)
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual({key: entry[key] for key in ('level', 'logger', 'run_id', 'message', 'sample', 'cells')},
+                         {'level': 'INFO', 'logger': 'scraper.test', 'run_id': 'run-1', 'message': 'Row AT',
+                          'sample': 'row', 'cells': 3})
+
+    def test_log_directory_is_created_on_first_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'logs', 'scraper.log')
+            handler = LazyRotatingFileHandler(path, maxBytes=1024, backupCount=1)
+            self.assertFalse(os.path.exists(os.path.dirname(path)))
+            handler.emit(make_record())
+            handler.close()
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'message\n')
@@ -0,0 +1,83 @@
+import math
+import os
+import tempfile
+
+import numpy as np
+from django.test import TestCase
+
+from scraper.matrix import GDPMatrix
+from scraper.models import GDPData, GeoArea
+
+
+class GDPMatrixTests(TestCase):
+
+    def setUp(self):
+        cells = {
+            'AT': {2020: ('100.0', 'p'), 2021: ('110.0', None)},
+            'BE': {2020: ('200.0', 'bp'), 2021: ('250.0', None)},
+            'BG': {2020: (':', None)},
+        }
+        for code, years in cells.items():
+            area = GeoArea.objects.create(code=code, name=f"Area {code}")
+            GDPData.objects.bulk_create([
+                GDPData(geo_area=area, year=year, value=value, flag=flag, is_available=value != ':')
+                for year, (value, flag) in years.items()
+            ])
+        self.matrix = GDPMatrix.from_db()
+
+    def test_from_db(self):
+        self.assertEqual(self.matrix.shape, (3, 2))
+        self.assertEqual(self.matrix.codes, ['AT', 'BE', 'BG'])
+        self.assertEqual(self.matrix.names[0], 'Area AT')
+        self.assertEqual(self.matrix.series('BE'), {2020: 200.0, 2021: 250.0})
+        self.assertEqual(self.matrix.series('BG'), {})
+        # Combined flags set every mask
+        self.assertTrue(self.matrix.flag_mask('b')[1, 0] and self.matrix.flag_mask('p')[1, 0])
+        self.assertEqual(int(self.matrix.flag_mask('p').sum()), 2)
+
+    def test_empty(self):
+        matrix = GDPMatrix.empty(['AT'], [2020, 2021])
+        self.assertTrue(np.isnan(matrix.values).all())
+        self.assertFalse(matrix.available.any() or matrix.flags.any())
+
+    def test_aggregate_skips_unavailable_cells(self):
+        self.assertEqual(self.matrix.aggregate('sum'), {2020: 300.0, 2021: 360.0})
+        self.assertEqual(self.matrix.aggregate('mean', axis='geo', codes=['AT', 'BE']), {'AT': 105.0, 'BE': 225.0})
+        self.assertTrue(math.isnan(self.matrix.aggregate('sum', axis='geo')['BG']))
+        with self.assertRaises(ValueError):
+            self.matrix.aggregate('sum', axis='flag')
+
+    def test_rank_and_growth(self):
+        self.assertEqual(self.matrix.rank(2020), [('BE', 200.0), ('AT', 100.0)])
+        self.assertEqual(self.matrix.rank(2021, descending=False, limit=1), [('AT', 110.0)])
+        growth = self.matrix.growth(2020, 2021)
+        self.assertAlmostEqual(growth['BE'], 0.25)
+        self.assertTrue(math.isnan(growth['BG']))
+
+    def test_masked_values_by_flag(self):
+        provisional = self.matrix.masked_values('p')
+        self.assertEqual(np.nansum(provisional), 300.0)
+
+    def test_select(self):
+        sub = self.matrix.select(codes=['BE'], years=[2021])
+        self.assertEqual((sub.codes, sub.years, sub.values.tolist()), (['BE'], [2021], [[250.0]]))
+
+    def test_save_and_memory_mapped_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.matrix.save(directory)
+            loaded = GDPMatrix.load(directory)
+            self.assertIsInstance(loaded.values, np.memmap)
+            self.assertEqual(loaded.codes, self.matrix.codes)
+            np.testing.assert_array_equal(loaded.values, self.matrix.values)
+            np.testing.assert_array_equal(loaded.flags, self.matrix.flags)
+            del loaded
+
+    def test_from_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'snapshot.csv')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("geo_area,year_2020,year_2021\nAT - Austria,\"1,234.5\",\nBE - Belgium,:,7\n")
+            matrix = GDPMatrix.from_csv(path)
+        self.assertEqual(matrix.years, [2020, 2021])
+        self.assertEqual(matrix.series('AT - Austria'), {2020: 1234.5})
+        self.assertEqual(matrix.series('BE - Belgium'), {2021: 7.0})
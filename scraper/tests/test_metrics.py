@@ -0,0 +1,77 @@
+import os
+import tempfile
+import threading
+
+from django.test import TestCase
+
+from scraper.metrics import RunMetrics, load_run_records
+from scraper.models import GeoArea
+from scraper.pipeline import ImportPipeline
+
+
+class FakeDriver:
+    """Stands in for a WebDriver: every command goes through execute"""
+
+    def execute(self, command, params=None):
+        return {'value': None}
+
+
+class RunMetricsTests(TestCase):
+
+    def test_nested_spans_count_into_their_parent(self):
+        metrics = RunMetrics(run_id='run1', dataset='gdp')
+        driver = metrics.instrument_driver(FakeDriver())
+        with metrics.track_queries(), metrics.span('import'):
+            GeoArea.objects.count()
+            for _ in range(2):
+                with metrics.span('row'):
+                    driver.execute('findElement')
+        self.assertEqual(metrics.phases['row']['count'], 2)
+        self.assertEqual(metrics.phases['row']['webdriver_calls'], 2)
+        self.assertEqual(metrics.phases['import']['webdriver_calls'], 2)
+        self.assertEqual(metrics.phases['import']['db_queries'], 1)
+        self.assertEqual(metrics.phases['row']['db_queries'], 0)
+
+    def test_queries_of_other_threads_are_not_counted(self):
+        metrics = RunMetrics()
+        with metrics.track_queries():
+            thread = threading.Thread(target=lambda: GeoArea.objects.count())
+            thread.start()
+            thread.join()
+        self.assertEqual(metrics.db_queries, 0)
+
+    def test_merge_adds_counters_and_phases(self):
+        metrics, shard = RunMetrics(), RunMetrics()
+        with metrics.span('extract'):
+            pass
+        with shard.span('extract'):
+            shard.webdriver_calls += 3
+        shard.db_queries = 2
+        metrics.merge(shard)
+        self.assertEqual((metrics.webdriver_calls, metrics.db_queries), (3, 2))
+        self.assertEqual(metrics.phases['extract']['count'], 2)
+        self.assertEqual(metrics.phases['extract']['webdriver_calls'], 3)
+
+    def test_importer_thread_queries_are_merged(self):
+        metrics = RunMetrics()
+        with ImportPipeline(lambda batch: GeoArea.objects.filter(code__in=batch).count(),
+                            batch_size=1, metrics=metrics) as pipeline:
+            for code in ('AT', 'BE', 'BG'):
+                pipeline.put(code)
+        self.assertEqual(metrics.db_queries, 3)
+
+    def test_write_and_load_records(self):
+        metrics = RunMetrics(run_id='run1', dataset='nama_10r_2gdp')
+        with metrics.span('import'):
+            pass
+        metrics.finish('success')
+        with tempfile.TemporaryDirectory() as directory:
+            json_path, prom_path = metrics.write(directory)
+            self.assertEqual(os.path.basename(prom_path), 'eurostat_scrape_nama_10r_2gdp.prom')
+            with open(prom_path, encoding='utf-8') as f:
+                prom = f.read()
+            records = load_run_records(directory)
+        self.assertIn('eurostat_scrape_phase_seconds{dataset="nama_10r_2gdp",phase="import"}', prom)
+        self.assertIn('eurostat_scrape_success{dataset="nama_10r_2gdp"} 1', prom)
+        self.assertEqual([(record['run_id'], record['status']) for record in records], [('run1', 'success')])
+        self.assertEqual(records[0]['phases']['import']['count'], 1)
@@ -0,0 +1,96 @@
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from eurostat_manager import settings
+from scraper.eurostat_scraper import EurostatScraper
+from scraper.multitab import MultiTabScraper, configured_datasets
+
+DATASETS = {name: f"https://ec.europa.eu/eurostat/databrowser/view/{name}/default/table"
+            for name in ('nama_10r_2gdp', 'nama_10r_3gdp', 'nama_10r_2hhinc')}
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        self.driver.opened += 1
+        handle = f"tab{self.driver.opened}"
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+        self.driver.peak_tabs = max(self.driver.peak_tabs, len(self.driver.window_handles))
+
+
+class FakeDriver:
+    """One browser whose tabs load instantly; tracks which tab every command went to"""
+
+    def __init__(self):
+        self.window_handles = ['tab0']
+        self.current_window_handle = 'tab0'
+        self.opened = 0
+        self.peak_tabs = 1
+        self.urls = {}
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_script(self, script, *args):
+        if args:
+            self.urls[self.current_window_handle] = args[0]
+        return True
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+def render_steps(scraper):
+    """Render pass of a tab: two waits, then the grid of its dataset"""
+    yield 0
+    yield 0
+    if 'hhinc' in scraper.base_url:
+        raise RuntimeError("grid never rendered")
+    scraper._grid = ([{'AT': 'Austria'}], ['2020'])
+
+
+def iter_gdp_rows(scraper):
+    yield 'AT', {'2020': {'value': scraper.base_url[-20:], 'flag': None, 'is_available': True}}
+
+
+class MultiTabScraperTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {'CHECKPOINT_DIR': directory.name,
+                                                            'BROWSER_PROFILE_DIR': ''})
+        config.start()
+        self.addCleanup(config.stop)
+
+    def test_configured_datasets(self):
+        with mock.patch.dict(settings.EUROSTAT_CONFIG, {'DATASETS': {}, 'BASE_URL': DATASETS['nama_10r_2gdp']}):
+            self.assertEqual(configured_datasets(), {'gdp': DATASETS['nama_10r_2gdp']})
+        with mock.patch.dict(settings.EUROSTAT_CONFIG, {'DATASETS': DATASETS}):
+            self.assertEqual(configured_datasets(), DATASETS)
+
+    def test_datasets_share_one_browser_and_failures_stay_isolated(self):
+        scraper = MultiTabScraper(DATASETS, tabs=2)
+        driver = scraper.browser.driver = FakeDriver()
+        with mock.patch.object(EurostatScraper, '_render_steps', render_steps), \
+                mock.patch.object(EurostatScraper, 'iter_gdp_rows', iter_gdp_rows), \
+                self.assertLogs('scraper.multitab', 'ERROR'):
+            results = scraper.run()
+        self.assertEqual(sorted(results), ['nama_10r_2gdp', 'nama_10r_3gdp'])
+        self.assertIsInstance(scraper.errors['nama_10r_2hhinc'], RuntimeError)
+        geo_dicts, years, batch = results['nama_10r_3gdp']
+        self.assertEqual((geo_dicts, years, len(batch)), ([{'AT': 'Austria'}], ['2020'], 1))
+        # The first dataset loads in the initial tab; never more tabs open than allowed
+        self.assertEqual(driver.urls['tab0'], DATASETS['nama_10r_2gdp'])
+        self.assertLessEqual(driver.peak_tabs, 2)
+        self.assertEqual(len(driver.window_handles), 1)  # The last tab keeps the session alive
+
+    def test_run_needs_the_browser(self):
+        with self.assertRaises(RuntimeError):
+            MultiTabScraper(DATASETS).run()
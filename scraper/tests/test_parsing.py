@@ -0,0 +1,40 @@
+import math
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from scraper.parsing import (cell_text, find_mismatches, fuzz_corpus, normalize_number, parse_cells,
+                             parse_special_value)
+from scraper.records import encode_flag
+
+
+class ParseCellsTests(SimpleTestCase):
+    """parse_cells must agree with the scalar parse_special_value on every cell"""
+
+    def test_fuzz_corpus_matches_scalar_parser(self):
+        corpus = fuzz_corpus(5000, seed=7) + [None, math.nan, np.nan, pd.NA, np.float32('nan')]
+        self.assertEqual(find_mismatches(corpus), [])
+
+    def test_pandas_missing_values_are_not_available(self):
+        values, flags, available = parse_cells(pd.Series(['1 234,5(p)', np.nan, None, ':']))
+        self.assertEqual(available.tolist(), [True, False, False, False])
+        self.assertEqual(values[0], 1234.5)
+        self.assertEqual(int(flags[0]), encode_flag('p'))
+        self.assertTrue(np.isnan(values[1:]).all())
+
+    def test_scalar_parser_accepts_nan(self):
+        self.assertEqual(parse_special_value(np.nan), {'value': None, 'flag': None, 'is_available': False})
+
+    def test_cell_text_maps_missing_values_to_empty(self):
+        for missing in (None, math.nan, np.nan, np.float32('nan'), pd.NA, pd.NaT):
+            self.assertEqual(cell_text(missing), '', missing)
+        self.assertEqual(cell_text(0), '0')
+
+    def test_separators_are_normalized(self):
+        self.assertEqual(normalize_number('13\u202f628\xa0365,8'), '13628365.8')
+        self.assertEqual(normalize_number('1.234.567,8'), '1234567.8')
+        self.assertEqual(normalize_number('1,234,567.8'), '1234567.8')
+
+    def test_flags_on_missing_cells_are_kept(self):
+        self.assertEqual(parse_special_value(': c'), {'value': None, 'flag': 'c', 'is_available': False})
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase
+
+from eurostat_manager import settings
+from scraper.eurostat_scraper import EurostatScraper
+from scraper.models import GDPData, GeoArea
+from scraper.pipeline import ImportPipeline
+
+
+class ImportPipelineTests(SimpleTestCase):
+
+    def test_rows_are_imported_in_order_and_in_batches(self):
+        batches = []
+        with ImportPipeline(batches.append, queue_size=4, batch_size=3) as pipeline:
+            for row in range(10):
+                pipeline.put(row)
+        self.assertEqual([row for batch in batches for row in batch], list(range(10)))
+        self.assertTrue(all(len(batch) <= 3 for batch in batches))
+        self.assertEqual((pipeline.rows_imported, pipeline.batches_imported), (10, len(batches)))
+
+    def test_queue_bounds_the_rows_in_flight(self):
+        release = threading.Event()
+        batches = []
+
+        def import_batch(batch):
+            release.wait(5)
+            batches.append(batch)
+
+        pipeline = ImportPipeline(import_batch, queue_size=2, batch_size=1)
+        pipeline.start()
+        producer = threading.Thread(target=lambda: [pipeline.put(row) for row in range(10)])
+        producer.start()
+        producer.join(0.2)
+        # One row in the importer, two in the queue: the producer is blocked
+        self.assertTrue(producer.is_alive())
+        self.assertLessEqual(pipeline.queue.qsize(), 2)
+        release.set()
+        producer.join(5)
+        pipeline.close()
+        self.assertEqual([row for batch in batches for row in batch], list(range(10)))
+        self.assertGreater(pipeline.blocked_seconds, 0)
+
+    def test_importer_error_reaches_the_producer(self):
+        def import_batch(batch):
+            raise ValueError("broken row")
+
+        pipeline = ImportPipeline(import_batch, queue_size=1, batch_size=1)
+        pipeline.start()
+        with self.assertLogs('scraper.pipeline', 'ERROR'), self.assertRaises(RuntimeError) as raised:
+            for row in range(100):
+                pipeline.put(row)
+            pipeline.close()
+        self.assertIsInstance(raised.exception.__cause__, ValueError)
+        with self.assertRaises(RuntimeError):
+            pipeline.close()
+
+
+class PipelinedImportTests(TransactionTestCase):
+    """The importer thread writes on its own connection, outside a test transaction"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {'CHECKPOINT_DIR': os.path.join(self.directory, 'checkpoints'),
+                                                            'BROWSER_PROFILE_DIR': ''})
+        config.start()
+        self.addCleanup(config.stop)
+
+    def test_scrape_command_imports_while_extracting(self):
+        rows = [(code, {'2020': {'value': value, 'flag': 'p', 'is_available': True}})
+                for code, value in (('AT', '100.0'), ('BE', '200.0'), ('BG', '3,617,450.0'))]
+        with mock.patch.object(EurostatScraper, '__enter__', lambda scraper: scraper), \
+                mock.patch.object(EurostatScraper, '__exit__', return_value=False), \
+                mock.patch.object(EurostatScraper, 'load_grid',
+                                  return_value=([{code: f"Area {code}"} for code, _ in rows], ['2020'])), \
+                mock.patch.object(EurostatScraper, 'iter_gdp_rows', return_value=iter(rows)):
+            call_command('scrape_eurostat', pipelined=True, batch_size=2, queue_size=1,
+                         metrics_dir=os.path.join(self.directory, 'metrics'))
+        self.assertEqual(sorted(GDPData.objects.values_list('geo_area__code', 'value', 'flag')),
+                         [('AT', '100.0', 'p'), ('BE', '200.0', 'p'), ('BG', '3,617,450.0', 'p')])
+        self.assertEqual(GeoArea.objects.get(code='BE').name, 'Area BE')
@@ -0,0 +1,47 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from scraper.models import GDPData, GeoArea
+from scraper.pivot import build_wide_table
+
+
+class WideTableTests(TestCase):
+
+    def setUp(self):
+        austria = GeoArea.objects.create(code='AT', name='Austria')
+        belgium = GeoArea.objects.create(code='BE', name='Belgium')
+        GDPData.objects.bulk_create([
+            GDPData(geo_area=austria, year=2020, value='100.0', flag='p', is_available=True),
+            GDPData(geo_area=austria, year=2021, value='110.0', is_available=True),
+            GDPData(geo_area=belgium, year=2021, value='250.0', flag='e', is_available=False),
+        ])
+
+    def test_pivot_by_name(self):
+        table = build_wide_table()
+        self.assertEqual(table.header(), ['geo_area', 'year_2020', 'year_2021'])
+        self.assertEqual(list(table.rows()), [['Austria', '100.0', '110.0'], ['Belgium', '', '']])
+
+    def test_flag_modes(self):
+        table = build_wide_table(label='code', include_unavailable=True)
+        self.assertEqual(list(table.rows('inline')), [['AT', '100.0(p)', '110.0'], ['BE', '', '250.0(e)']])
+        self.assertEqual(table.header('columns')[-2:], ['flag_2020', 'flag_2021'])
+        self.assertEqual(next(table.rows('columns')), ['AT', '100.0', '110.0', 'p', ''])
+        with self.assertRaises(ValueError):
+            list(table.rows('bogus'))
+        with self.assertRaises(ValueError):
+            build_wide_table(label='notes')
+
+    def test_export_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'wide.csv')
+            call_command('export_gdp_wide', output=path, flags='inline', stdout=StringIO())
+            with open(path, newline='', encoding='utf-8') as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows, [['geo_area', 'year_2020', 'year_2021'],
+                                ['Austria', '100.0(p)', '110.0'],
+                                ['Belgium', '', '']])
@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from scraper.records import ObservationBatch, decode_flag, encode_flag, parse_number
+from scraper.tests.utils import make_batch
+
+
+class ObservationBatchTests(SimpleTestCase):
+
+    def setUp(self):
+        self.geo_dicts = [{'AT': 'Austria'}, {'BE': 'Belgium'}, {'BG': 'Bulgaria'}]
+        self.gdp_data = {
+            'AT': {'2020': {'value': '379320.5', 'flag': 'p', 'is_available': True},
+                   '2021': {'value': '0.10', 'flag': None, 'is_available': True},
+                   '2022': {'value': '-0', 'flag': 'bpe', 'is_available': True}},
+            'BE': {'2020': {'value': '3,617,450.0', 'flag': None, 'is_available': True},
+                   '2021': {'value': '1e5', 'flag': 'e', 'is_available': True}},
+        }
+
+    def test_legacy_round_trip(self):
+        batch = ObservationBatch.from_legacy(self.geo_dicts, self.gdp_data)
+        self.assertEqual(batch.to_legacy(), (self.geo_dicts, self.gdp_data))
+
+    def test_non_numeric_text_is_kept(self):
+        batch = ObservationBatch.from_legacy(self.geo_dicts, self.gdp_data)
+        self.assertEqual(sorted(batch.text.values()), ['1e5', '3,617,450.0'])
+        self.assertTrue(np.isnan(batch.as_numpy()['value'][list(batch.text)]).all())
+
+    def test_unavailable_cells_are_dropped(self):
+        gdp_data = {'AT': {'2020': {'value': None, 'flag': 'c', 'is_available': False}}}
+        batch = ObservationBatch.from_legacy(self.geo_dicts, gdp_data)
+        self.assertEqual(len(batch), 0)
+        self.assertEqual([code for code, _, _ in batch.iter_geos()], ['AT', 'BE', 'BG'])
+
+    def test_rows_missing_from_headers_are_skipped(self):
+        gdp_data = dict(self.gdp_data, XX={'2020': {'value': '1', 'flag': None, 'is_available': True}})
+        with self.assertLogs('scraper.records', 'WARNING'):
+            batch = ObservationBatch.from_legacy(self.geo_dicts, gdp_data)
+        self.assertNotIn('XX', batch.geo_lookup)
+
+    def test_extend_remaps_geo_areas_and_text(self):
+        first = make_batch({'AT': {'2020': '1.5'}})
+        second = make_batch({'BE': {'2020': 'n/a'}, 'AT': {'2021': '2'}})
+        first.extend(second)
+        self.assertEqual(list(first.iter_observations()),
+                         [('AT', 2020, '1.5', None), ('BE', 2020, 'n/a', None), ('AT', 2021, '2', None)])
+
+    def test_flags_round_trip(self):
+        for flag in (None, 'p', 'bpe', 'bpecdnsuz'):
+            self.assertEqual(decode_flag(encode_flag(flag)), flag)
+        self.assertEqual(decode_flag(encode_flag('pb')), 'bp')  # Canonical order
+
+    def test_parse_number_only_accepts_exact_round_trips(self):
+        self.assertEqual(parse_number('13628365.8'), (13628365.8, 1))
+        self.assertEqual(parse_number('0.10'), (0.1, 2))
+        for text in ('3,617,450.0', '1e5', ' 12', 'inf', '1_000', '12345678901234567890', None):
+            self.assertTrue(math.isnan(parse_number(text)[0]), text)
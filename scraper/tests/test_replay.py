@@ -0,0 +1,61 @@
+import os
+import tempfile
+from urllib.request import urlopen
+
+from django.conf import settings as django_settings
+from django.test import SimpleTestCase
+
+from scraper.replay import GRID_FILE, ReplayServer, load_manifest, record_session, sanitize_page
+
+INSPECTOR_DIR = os.path.join(django_settings.BASE_DIR, 'inspector')
+
+
+class FakeDriver:
+    """Rendered page as seen through a WebDriver"""
+
+    page_source = ('<html><head><base href="https://ec.europa.eu/"><script src="app.js"></script></head>'
+                   '<body><div id="estat-content-view-table"><span>AT</span></div>'
+                   '<iframe src="https://ec.europa.eu/ads"></iframe></body></html>')
+
+    def execute_script(self, script, selector):
+        return '<div id="estat-content-view-table"><span>AT</span></div>'
+
+
+class ReplayTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_sanitize_page_drops_live_elements(self):
+        page = sanitize_page(FakeDriver.page_source)
+        for tag in ('<script', '<iframe', '<base'):
+            self.assertNotIn(tag, page)
+        self.assertIn('<span>AT</span>', page)
+
+    def test_recorded_session_is_served(self):
+        url = "https://ec.europa.eu/eurostat/databrowser/view/nama_10r_2gdp/default/table?lang=en"
+        record_session(FakeDriver(), self.directory, url, phases={'page_load': {'seconds': 1.5}})
+        self.assertEqual(load_manifest(self.directory)['url'], url)
+        with ReplayServer(self.directory) as server:
+            with urlopen(server.url) as response:
+                page = response.read().decode('utf-8')
+            with urlopen(server.url + GRID_FILE) as response:
+                grid = response.read().decode('utf-8')
+        self.assertIn('<span>AT</span>', page)
+        self.assertNotIn('<script', page)
+        self.assertEqual(grid, FakeDriver().execute_script('', ''))
+
+    def test_inspector_snapshot_is_seeded_and_removed(self):
+        with ReplayServer(INSPECTOR_DIR) as server:
+            seed = server.directory
+            self.assertEqual(server.manifest['source'], 'inspector')
+            with urlopen(server.url) as response:
+                self.assertIn('estat-content-view-table', response.read().decode('utf-8'))
+        self.assertFalse(os.path.exists(seed))
+        self.assertTrue(os.path.exists(INSPECTOR_DIR))
+
+    def test_unknown_directory_is_refused(self):
+        with self.assertRaises(FileNotFoundError):
+            ReplayServer(self.directory)
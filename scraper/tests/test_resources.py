@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from scraper.metrics import RunMetrics
+from scraper.resources import (ResourceLimitExceeded, ResourceMonitor, driver_pid, process_tree_usage,
+                               usage_available)
+
+
+def fake_driver(process):
+    """Selenium driver stand-in whose chromedriver is process"""
+    return SimpleNamespace(service=SimpleNamespace(process=process))
+
+
+@unittest.skipUnless(usage_available(), "Process trees cannot be measured here")
+class ResourceMonitorTests(SimpleTestCase):
+
+    def start_browser(self):
+        """Idle child process standing in for chromedriver"""
+        process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+        self.addCleanup(process.wait)
+        self.addCleanup(process.kill)
+        return process
+
+    def test_process_tree_usage(self):
+        rss, cpu, count = process_tree_usage(os.getpid(), include_children=False)
+        self.assertGreater(rss, 0)
+        self.assertEqual(count, 1)
+        process = self.start_browser()
+        self.assertEqual(driver_pid(fake_driver(process)), process.pid)
+        self.assertIsNone(driver_pid(SimpleNamespace()))
+
+    def test_browsers_of_every_owner_are_summed(self):
+        monitor = ResourceMonitor(RunMetrics(), interval=60, limits={}, trace=False)
+        monitor.attach_driver(fake_driver(self.start_browser()), owner='shard0')
+        monitor.attach_driver(fake_driver(self.start_browser()), owner='shard1')
+        monitor.sample()
+        self.assertEqual(monitor.browser.processes.peak, 2)
+        monitor.detach_driver('shard1')
+        self.assertEqual(list(monitor.browser_pids), ['shard0'])
+        monitor.detach_driver('shard1')  # Already gone: nothing to do
+        monitor.sample()
+        self.assertEqual(monitor.browser.processes.as_dict(), {'peak': 2, 'avg': 1.5})
+
+    def test_limit_aborts_the_run(self):
+        metrics = RunMetrics()
+        monitor = ResourceMonitor(metrics, interval=60, limits={'browser': 1}, trace=False)
+        monitor.attach_driver(fake_driver(self.start_browser()))
+        monitor.raise_if_exceeded()
+        with self.assertLogs('scraper.resources', 'ERROR'):
+            monitor.sample()
+        with self.assertRaises(ResourceLimitExceeded):
+            monitor.raise_if_exceeded()
+        with monitor:
+            pass
+        self.assertIn('browser RSS', metrics.resources['exceeded'])
+        self.assertEqual(metrics.resources['limits_bytes'], {'browser': 1})
+
+    def test_trace_allocations(self):
+        metrics = RunMetrics()
+        monitor = ResourceMonitor(metrics, interval=60, limits={}, trace=True)
+        with monitor.trace_allocations('import'):
+            rows = [str(i) * 10 for i in range(10000)]
+        self.assertGreater(metrics.resources['allocations']['import']['traced_peak_bytes'], 0)
+        self.assertTrue(metrics.resources['allocations']['import']['top'])
+        del rows
+        monitor = ResourceMonitor(RunMetrics(), interval=60, limits={}, trace=False)
+        with monitor.trace_allocations('import'):
+            pass
+        self.assertNotIn('allocations', monitor.metrics.resources)
@@ -0,0 +1,72 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from scraper.scheduling import RunLock, RunLockHeld, ScheduleState
+
+
+class RunLockTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_second_lock_is_refused(self):
+        with RunLock('gdp', self.directory) as lock:
+            self.assertEqual(lock.holder()['pid'], os.getpid())
+            with self.assertRaises(RunLockHeld):
+                with RunLock('gdp', self.directory):
+                    pass
+        self.assertIsNone(RunLock('gdp', self.directory).holder())
+
+    def test_datasets_lock_independently(self):
+        with RunLock('gdp', self.directory), RunLock('other', self.directory):
+            pass
+
+    def test_crashed_owner_does_not_block(self):
+        # The child takes the lock and exits without releasing it
+        script = ("import os, sys; from scraper.scheduling import RunLock; "
+                  "RunLock('gdp', sys.argv[1]).acquire(); os._exit(1)")
+        subprocess.run([sys.executable, '-c', script, self.directory], cwd=settings.BASE_DIR, check=False)
+        lock = RunLock('gdp', self.directory)
+        self.assertIsNone(lock.holder())
+        with self.assertLogs('scraper.scheduling', 'WARNING'):
+            self.assertTrue(lock.acquire())
+        self.assertEqual(lock.holder()['host'], socket.gethostname())
+        lock.release()
+
+    def test_release_keeps_the_file_and_empties_it(self):
+        lock = RunLock('gdp', self.directory)
+        self.assertTrue(lock.acquire())
+        lock.release()
+        self.assertTrue(os.path.exists(lock.path))
+        self.assertEqual(os.path.getsize(lock.path), 0)
+        with self.assertNoLogs('scraper.scheduling', 'WARNING'):
+            self.assertTrue(lock.acquire())
+        lock.release()
+
+
+class ScheduleStateTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.state = ScheduleState({'gdp': timedelta(hours=1)}, jitter=timedelta(0), directory=directory.name)
+
+    def test_never_run_is_due(self):
+        self.assertEqual(self.state.due(), [('gdp', 1)])
+
+    def test_missed_runs_collapse_into_one(self):
+        start = datetime(2024, 1, 1, 12)
+        self.state.record_run('gdp', 'success', now=start)
+        self.assertEqual(self.state.due(now=start + timedelta(minutes=30)), [])
+        self.assertEqual(self.state.due(now=start + timedelta(hours=4, minutes=1)), [('gdp', 4)])
+        reloaded = ScheduleState(self.state.intervals, jitter=timedelta(0), directory=os.path.dirname(self.state.path))
+        self.assertEqual(reloaded.next_run('gdp'), start + timedelta(hours=1))
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from eurostat_manager import settings
+from scraper.eurostat_scraper import EurostatScraper
+from scraper.incremental import RefreshState
+from scraper.models import GDPData, GeoArea, Observation
+from scraper.tests.utils import make_batch
+from scraper.validation import load_history
+
+GDP_URL = "https://ec.europa.eu/eurostat/databrowser/view/nama_10r_2gdp/default/table"
+OTHER_URL = "https://ec.europa.eu/eurostat/databrowser/view/nama_10r_2hhinc/default/table"
+ROWS = {'AT': {'2020': '100.0', '2021': '110.0'}, 'BE': {'2020': '200.0', '2021': '210.0'}}
+
+
+class DatasetScopeTests(TestCase):
+    """Only the BASE_URL dataset goes to GeoArea/GDPData; everything else is scoped to its dataset"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {
+            'BASE_URL': GDP_URL, 'CHECKPOINT_DIR': os.path.join(self.directory, 'checkpoints'),
+            'BROWSER_PROFILE_DIR': '', 'OBSERVATION_STORE': True,
+        })
+        config.start()
+        self.addCleanup(config.stop)
+
+    def scrape(self, url, rows):
+        batch = make_batch(rows)
+        grid = ([{code: code} for code in rows], sorted({year for cells in rows.values() for year in cells}), batch)
+        with mock.patch.object(EurostatScraper, '__enter__', lambda scraper: scraper), \
+                mock.patch.object(EurostatScraper, '__exit__', return_value=False), \
+                mock.patch.object(EurostatScraper, 'extract_grid', return_value=grid):
+            call_command('scrape_eurostat', url=url, metrics_dir=os.path.join(self.directory, 'metrics'))
+
+    def test_other_dataset_goes_to_the_store_only(self):
+        self.scrape(GDP_URL, ROWS)
+        # Ten times the GDP values: compared with the GDP history this would fail the jump check
+        self.scrape(OTHER_URL, {code: {year: f"{float(value) * 10}" for year, value in cells.items()}
+                                for code, cells in ROWS.items()})
+        self.assertEqual(GDPData.objects.get(geo_area__code='AT', year=2020).value, '100.0')
+        self.assertEqual(Observation.objects.filter(series__dataset__code='nama_10r_2hhinc').count(), 4)
+        self.assertEqual(Observation.objects.filter(series__dataset__code='nama_10r_2gdp').count(), 4)
+
+        metrics = os.listdir(os.path.join(self.directory, 'metrics'))
+        self.assertIn('eurostat_scrape_nama_10r_2gdp.prom', metrics)
+        self.assertIn('eurostat_scrape_nama_10r_2hhinc.prom', metrics)
+        self.assertIsNotNone(RefreshState('nama_10r_2hhinc').last_full_refresh())
+        self.assertIsNotNone(RefreshState('nama_10r_2gdp').last_full_refresh())
+
+    def test_history_is_read_from_the_same_dataset(self):
+        self.scrape(GDP_URL, ROWS)
+        self.assertIsNone(load_history(['AT', 'BE'], 'nama_10r_2hhinc'))
+        self.assertEqual(load_history(['AT', 'BE'], 'nama_10r_2gdp').values[0, 0], 100.0)
+
+        self.scrape(OTHER_URL, {'AT': {'2020': '5.0'}})
+        history = load_history(['AT', 'BE'], 'nama_10r_2hhinc')
+        self.assertEqual(history.codes, ['AT'])
+        self.assertEqual(history.values[0, 0], 5.0)
+        self.assertFalse(GeoArea.objects.exclude(code__in=ROWS).exists())
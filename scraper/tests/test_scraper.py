@@ -0,0 +1,84 @@
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+from selenium.common.exceptions import WebDriverException
+
+from eurostat_manager import settings
+from scraper.eurostat_scraper import EurostatScraper
+
+URL = "https://ec.europa.eu/eurostat/databrowser/view/nama_10r_2gdp/default/table"
+GRID = ([{'AT': 'Austria'}, {'BE': 'Belgium'}], ['2020', '2021'])
+
+
+class FakeRow:
+    def __init__(self, row_id):
+        self.row_id = row_id
+
+    def get_attribute(self, name):
+        return self.row_id
+
+
+class FakeDriver:
+    """Browser with a rendered grid of two rows"""
+
+    def find_elements(self, by, selector):
+        return [FakeRow('AT'), FakeRow('BE')]
+
+    def quit(self):
+        pass
+
+
+class SinglePassGridTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {'CHECKPOINT_DIR': directory.name,
+                                                            'BROWSER_PROFILE_DIR': ''})
+        config.start()
+        self.addCleanup(config.stop)
+        self.scraper = EurostatScraper(base_url=URL)
+        self.scraper.driver = FakeDriver()
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        self.scraper._grid = GRID
+
+    def test_headers_and_cells_come_from_one_render(self):
+        cells = {'2020': {'value': '1.0', 'flag': None, 'is_available': True}}
+        with mock.patch.object(self.scraper, '_render_grid', side_effect=self.render), \
+                mock.patch.object(self.scraper, 'extract_row_data', return_value=cells):
+            geo_dicts, years, batch = self.scraper.extract_grid()
+            self.assertEqual(self.scraper.load_grid(), GRID)
+        self.assertEqual(self.renders, 1)
+        self.assertEqual((geo_dicts, years), GRID)
+        self.assertEqual(len(batch), 2)
+
+    def test_browser_crash_renders_again_after_a_restart(self):
+        attempts = [WebDriverException("chrome not reachable"), None]
+
+        def render():
+            error = attempts.pop(0)
+            if error:
+                raise error
+            self.render()
+
+        with mock.patch.object(self.scraper, '_render_grid', side_effect=render), \
+                mock.patch.object(self.scraper, 'setup_driver', side_effect=lambda: setattr(
+                    self.scraper, 'driver', FakeDriver())) as setup_driver, \
+                mock.patch.object(self.scraper, 'capture_screenshot'), \
+                mock.patch('scraper.eurostat_scraper.time.sleep') as sleep, \
+                self.assertLogs('scraper.eurostat_scraper', 'WARNING'):
+            self.assertEqual(self.scraper.load_grid(), GRID)
+        setup_driver.assert_called_once()
+        sleep.assert_called_once_with(2)
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(self.scraper.metrics.phases['retry']['count'], 1)
+
+    def test_retries_are_bounded(self):
+        self.scraper.max_retries = 0
+        with mock.patch.object(self.scraper, '_render_grid', side_effect=WebDriverException("crashed")), \
+                self.assertLogs('scraper.eurostat_scraper', 'ERROR'), self.assertRaises(WebDriverException):
+            self.scraper.load_grid()
@@ -0,0 +1,73 @@
+import base64
+import os
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from scraper.screenshots import ScreenshotRecorder
+
+PNG = base64.b64encode(b'\x89PNG fake').decode()
+
+
+class FakeElement:
+    screenshot_as_base64 = PNG
+
+
+class FakeDriver:
+    """Page with or without the data grid; counts the WebDriver commands used"""
+
+    def __init__(self, grid=True):
+        self.grid = grid
+        self.full_page_captures = 0
+
+    def find_elements(self, by, selector):
+        return [FakeElement()] if self.grid else []
+
+    def get_screenshot_as_base64(self):
+        self.full_page_captures += 1
+        return PNG
+
+
+class ScreenshotRecorderTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_levels(self):
+        recorder = ScreenshotRecorder(self.directory, level='error')
+        self.assertTrue(recorder.enabled('error'))
+        self.assertFalse(recorder.enabled('info'))
+        self.assertFalse(ScreenshotRecorder(self.directory, level='off').enabled('error'))
+        with self.assertRaises(ValueError):
+            ScreenshotRecorder(self.directory, level='debug')
+
+        recorder.capture(FakeDriver(), "progress", level='info')
+        recorder.close()
+        self.assertIsNone(recorder.thread)  # Nothing captured: no writer thread started
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_grid_is_clipped_and_written_in_the_background(self):
+        recorder = ScreenshotRecorder(self.directory, level='info')
+        driver = FakeDriver()
+        recorder.capture(driver, "grid")
+        recorder.capture(FakeDriver(grid=False), "page")
+        recorder.close()
+        self.assertEqual(driver.full_page_captures, 0)
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual([name.split('_')[0] for name in files], ['grid', 'page'])
+        with open(os.path.join(self.directory, files[0]), 'rb') as f:
+            self.assertEqual(f.read(), b'\x89PNG fake')
+
+    def test_ring_keeps_the_last_screenshots_across_runs(self):
+        for i in range(3):
+            with open(os.path.join(self.directory, f"old{i}.png"), 'wb') as f:
+                f.write(b'')
+            os.utime(os.path.join(self.directory, f"old{i}.png"), (time.time() - 100 + i,) * 2)
+        recorder = ScreenshotRecorder(self.directory, level='info', keep=3)
+        for i in range(2):
+            recorder.capture(FakeDriver(), f"new{i}")
+        recorder.close()
+        self.assertEqual(sorted(name[:4] for name in os.listdir(self.directory)), ['new0', 'new1', 'old2'])
@@ -0,0 +1,77 @@
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.test import SimpleTestCase, TestCase
+
+from scraper.models import GeoArea
+from scraper.search import filter_geo_areas, fold, search_backend, search_document, search_geo_areas
+
+
+class FoldTests(SimpleTestCase):
+
+    def test_accents_case_and_punctuation(self):
+        self.assertEqual(fold('Région de Bruxelles-Capitale'), 'region de bruxelles capitale')
+        self.assertEqual(search_document('EU27_2020', 'Union', None), ' eu27 2020 union')
+
+
+class SearchGeoAreasTests(TestCase):
+
+    def setUp(self):
+        GeoArea.objects.create(code='BE10', name='Région de Bruxelles-Capitale')
+        GeoArea.objects.create(code='DE11', name='Stuttgart')
+        GeoArea.objects.create(code='XK', name='Kosovo*', notes='under UNSCR 1244/99')
+
+    def codes(self, query):
+        return [area.code for area in search_geo_areas(query)]
+
+    def test_index_is_used(self):
+        self.assertIn(search_backend(), ('fts5', 'trigram'))
+
+    def test_prefix_and_accent_insensitive(self):
+        self.assertEqual(self.codes('bruxel'), ['BE10'])
+        self.assertEqual(self.codes('REGION bru'), ['BE10'])
+        self.assertEqual(self.codes('de1'), ['DE11'])
+        self.assertEqual(self.codes('1244'), ['XK'])
+        self.assertEqual(self.codes('bruxelles stuttgart'), [])
+        self.assertEqual(self.codes('  '), [])
+
+    def test_filter_geo_areas(self):
+        queryset = filter_geo_areas(GeoArea.objects.all(), 'de')
+        self.assertEqual(sorted(queryset.values_list('code', flat=True)), ['BE10', 'DE11'])
+        self.assertFalse(filter_geo_areas(GeoArea.objects.all(), '').exists())
+
+    def test_save_and_delete_update_the_index(self):
+        area = GeoArea.objects.get(code='DE11')
+        area.name = 'München'
+        area.save()
+        self.assertEqual(self.codes('munchen'), ['DE11'])
+        self.assertEqual(self.codes('stuttgart'), [])
+        area.delete()
+        self.assertEqual(self.codes('munchen'), [])
+
+
+class SearchTextSyncTests(TestCase):
+    """Bulk paths that bypass GeoArea.save() keep search_text in sync"""
+
+    def codes(self, query):
+        return [area.code for area in search_geo_areas(query)]
+
+    def test_queryset_update(self):
+        GeoArea.objects.create(code='BE10', name='Région de Bruxelles-Capitale')
+        GeoArea.objects.filter(code='BE10').update(name='Brussels')
+        self.assertEqual(self.codes('brussels'), ['BE10'])
+        GeoArea.objects.filter(code='BE10').update(name=Concat(F('name'), Value(' Capital')))
+        self.assertEqual(self.codes('capital'), ['BE10'])
+        self.assertEqual(self.codes('bruxelles'), [])
+
+    def test_bulk_create_and_bulk_update(self):
+        GeoArea.objects.bulk_create([GeoArea(code='AT', name='Österreich')])
+        self.assertEqual(self.codes('osterreich'), ['AT'])
+        area = GeoArea.objects.get(code='AT')
+        area.name = 'Austria'
+        GeoArea.objects.bulk_update([area], ['name'])
+        self.assertEqual(self.codes('austria'), ['AT'])
+
+    def test_update_or_create(self):
+        GeoArea.objects.create(code='AT', name='Österreich')
+        GeoArea.objects.update_or_create(code='AT', defaults={'name': 'Austria'})
+        self.assertEqual(self.codes('austria'), ['AT'])
@@ -0,0 +1,94 @@
+import os
+import tempfile
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.test import SimpleTestCase, TestCase
+
+from eurostat_manager import settings
+from scraper.eurostat_scraper import EurostatScraper
+from scraper.sharding import ShardedScraper, ShardMergeError, merge_shards, plan_shards, shard_url
+from scraper.tests.utils import make_batch
+
+URL = "https://ec.europa.eu/eurostat/databrowser/view/nama_10r_3gdp/default/table?lang=en"
+ROWS = {'AT': {'2020': '1.0', '2021': '2.0'}, 'BE': {'2020': '3.0', '2021': '4.0'},
+        'BG': {'2020': '5.0', '2021': '6.0'}}
+
+
+def shard(rows):
+    """(geo_dicts, years, batch) as returned by EurostatScraper.extract_grid"""
+    return [{code: code} for code in rows], sorted({year for cells in rows.values() for year in cells}), make_batch(rows)
+
+
+class MergeShardsTests(SimpleTestCase):
+
+    def test_partition_is_merged(self):
+        results = [shard({'AT': {'2020': '1'}}), shard({'BE': {'2020': '2'}, 'BG': {}})]
+        geo_dicts, years, batch = merge_shards('geo', [['AT'], ['BE', 'BG']], results)
+        self.assertEqual(geo_dicts, [{'AT': 'AT'}, {'BE': 'BE'}, {'BG': 'BG'}])
+        self.assertEqual(years, ['2020'])
+        self.assertEqual(len(batch), 2)
+
+    def test_overlap_and_leak_are_rejected(self):
+        # The second page ignored its filter and rendered AT again
+        results = [shard({'AT': {'2020': '1'}}), shard({'AT': {'2020': '1'}, 'BE': {'2020': '2'}})]
+        with self.assertRaisesRegex(ShardMergeError, 'outside its filter.*several shards'):
+            merge_shards('geo', [['AT'], ['BE']], results)
+
+    def test_gap_is_rejected(self):
+        results = [shard({'AT': {'2020': '1'}}), shard({'BE': {'2020': '2'}})]
+        with self.assertRaisesRegex(ShardMergeError, r"1 geo values in no shard \(e.g. \['BG'\]\)"):
+            merge_shards('geo', [['AT'], ['BE']], results, expected=['AT', 'BE', 'BG'])
+
+    def test_time_shards(self):
+        results = [shard({'AT': {'2020': '1'}}), shard({'AT': {'2021': '2'}})]
+        _, years, batch = merge_shards('time', [['2020'], ['2021']], results)
+        self.assertEqual((years, len(batch)), (['2020', '2021'], 2))
+        with self.assertRaisesRegex(ShardMergeError, 'time values in no shard'):
+            merge_shards('time', [['2020'], ['2021']], results, expected=['2020', '2021', '2022'])
+
+
+class ShardPlanTests(SimpleTestCase):
+
+    def test_shard_url_replaces_the_facet_filter(self):
+        query = parse_qs(urlsplit(shard_url(URL + "&geo=XX", 'geo', ['AT', 'BE'])).query)
+        self.assertEqual(query, {'lang': ['en'], 'geo': ['AT', 'BE']})
+
+    def test_every_value_in_exactly_one_shard(self):
+        values = [f"G{i}" for i in range(10)]
+        groups = plan_shards('geo', values, 3)
+        self.assertEqual(sorted(value for group in groups for value in group), values)
+        self.assertLessEqual(len(groups), 3)
+
+
+class ShardedScraperTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {'CHECKPOINT_DIR': os.path.join(directory.name, 'checkpoints')})
+        config.start()
+        self.addCleanup(config.stop)
+
+    def test_shards_are_extracted_and_reported(self):
+        def extract_grid(scraper):
+            codes = parse_qs(urlsplit(scraper.base_url).query)['geo']
+            return shard({code: ROWS[code] for code in codes})
+
+        with mock.patch.object(EurostatScraper, '__enter__', lambda scraper: scraper), \
+                mock.patch.object(EurostatScraper, '__exit__', return_value=False), \
+                mock.patch.object(EurostatScraper, 'load_grid', return_value=([{code: code} for code in ROWS],
+                                                                              ['2020', '2021'])), \
+                mock.patch.object(EurostatScraper, 'extract_grid', extract_grid):
+            scraper = ShardedScraper(URL, 2)
+            geo_dicts, years, batch = scraper.extract_grid()
+
+        self.assertEqual(len(batch), 6)
+        self.assertEqual(sorted(code for geo in geo_dicts for code in geo), ['AT', 'BE', 'BG'])
+        report = scraper.report
+        self.assertEqual(report['shards'], 2)
+        self.assertEqual(sum(report['values']), 3)
+        self.assertGreaterEqual(report['total_seconds'], report['seconds'] + report['discovery_seconds'])
+        self.assertNotIn('speedup', report)  # Overlap of the shards, reported as parallelism
+        self.assertIsNone(report['changes_since_store'])
+        self.assertIn('discover_shards', scraper.metrics.phases)
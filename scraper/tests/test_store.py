@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from eurostat_manager import settings
+from scraper.models import Observation, ObservationText
+from scraper.store import gdp_rows, load_batch
+from scraper.tests.utils import make_batch
+
+
+@mock.patch.dict(settings.EUROSTAT_CONFIG, {'BASE_URL': None})
+class LoadBatchTests(TestCase):
+
+    def setUp(self):
+        self.rows = {
+            'AT': {'2020': '379320.5', '2021': '0.10', '2022': '-0'},
+            'DE': {'2020': '3,617,450.0', '2021': '1e5'},
+        }
+
+    def test_round_trip_keeps_text_values_cannot_rebuild(self):
+        stats = load_batch(make_batch(self.rows), 'gdp')
+        self.assertEqual(stats, {'codes': 2, 'series': 2, 'observations': 5, 'texts': 3})
+        self.assertEqual(list(gdp_rows()), [
+            ('AT', 2020, '379320.5', None),
+            ('AT', 2021, '0.10', None),
+            ('AT', 2022, '-0', None),
+            ('DE', 2020, '3,617,450.0', None),
+            ('DE', 2021, '1e5', None),
+        ])
+
+    def test_reload_is_idempotent_and_drops_stale_texts(self):
+        load_batch(make_batch(self.rows), 'gdp')
+        load_batch(make_batch(self.rows), 'gdp')
+        self.assertEqual(Observation.objects.count(), 5)
+        self.assertEqual(ObservationText.objects.count(), 3)
+
+        # DE 2020 is a plain number now; DE 2021 changes its text; AT is not in the batch
+        load_batch(make_batch({'DE': {'2020': '3617450.0', '2021': '2e5'}}), 'gdp')
+        self.assertEqual(sorted(ObservationText.objects.values_list('text', flat=True)), ['-0', '2e5'])
+        rows = {(code, year): value for code, year, value, _ in gdp_rows()}
+        self.assertEqual(rows[('DE', 2020)], '3617450.0')
+        self.assertEqual(rows[('DE', 2021)], '2e5')
+        self.assertEqual(rows[('AT', 2020)], '379320.5')
+
+    def test_datasets_are_kept_apart(self):
+        load_batch(make_batch(self.rows), 'gdp')
+        load_batch(make_batch({'AT': {'2020': '1.5'}}), 'other')
+        self.assertEqual(Observation.objects.filter(series__dataset__code='other').count(), 1)
+        self.assertEqual(len(list(gdp_rows())), 5)
@@ -0,0 +1,102 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from eurostat_manager import settings
+from scraper.eurostat_scraper import EurostatScraper
+from scraper.models import GDPData, GeoArea
+from scraper.tests.utils import make_batch
+from scraper.validation import EU_AGGREGATE, EU_MEMBERS, load_history, validate_batch
+
+YEARS = ['2020', '2021', '2022']
+
+
+class ValidationTests(TestCase):
+
+    def setUp(self):
+        self.rows = {code: {year: f"{100 + i}.0" for year in YEARS} for i, code in enumerate(EU_MEMBERS)}
+        totals = [sum(100 + i for i in range(len(EU_MEMBERS)))] * len(YEARS)
+        self.rows[EU_AGGREGATE] = {year: f"{total}.0" for year, total in zip(YEARS, totals)}
+
+    def checks(self, report):
+        return {check['check']: check for check in report.checks}
+
+    def test_clean_batch_passes(self):
+        report = validate_batch(make_batch(self.rows), YEARS)
+        self.assertTrue(report.passed, report.summary())
+        self.assertFalse(self.checks(report)['eu_aggregate'].get('skipped'))
+
+    def test_missing_year_fails_coverage(self):
+        for cells in self.rows.values():
+            del cells['2022']
+        report = validate_batch(make_batch(self.rows), YEARS)
+        self.assertFalse(self.checks(report)['year_coverage']['passed'])
+        self.assertEqual(self.checks(report)['year_coverage']['year'], 2022)
+
+    def test_non_numeric_text_fails(self):
+        for cells in self.rows.values():
+            cells['2021'] = '1,234,5.0'
+        report = validate_batch(make_batch(self.rows), YEARS)
+        self.assertFalse(self.checks(report)['non_numeric']['passed'])
+
+    def test_broken_aggregate_fails(self):
+        self.rows[EU_AGGREGATE]['2021'] = '1.0'
+        failure = self.checks(validate_batch(make_batch(self.rows), YEARS))['eu_aggregate']
+        self.assertFalse(failure['passed'])
+        self.assertEqual(failure['years'], [2021])
+
+    def test_magnitude_jump_against_history(self):
+        self.assertIsNone(load_history(self.rows))
+        for code, cells in self.rows.items():
+            area = GeoArea.objects.create(code=code, name=code)
+            GDPData.objects.bulk_create([GDPData(geo_area=area, year=int(year), value=value, is_available=True)
+                                         for year, value in cells.items()])
+        history = load_history(self.rows)
+        self.assertTrue(validate_batch(make_batch(self.rows), YEARS, history).passed)
+
+        # Values scraped in the wrong unit: every cell x1000
+        scaled = {code: {year: f"{float(value) * 1000:.1f}" for year, value in cells.items()}
+                  for code, cells in self.rows.items()}
+        jumps = self.checks(validate_batch(make_batch(scaled), YEARS, history))['magnitude_jumps']
+        self.assertFalse(jumps['passed'])
+        self.assertEqual(jumps['value'], 1.0)
+
+    def test_incremental_batch_skips_coverage(self):
+        report = validate_batch(make_batch({'AT': {'2022': '1.0'}}), YEARS, incremental=True)
+        self.assertEqual(self.checks(report)['year_coverage']['skipped'], 'incremental batch')
+        self.assertTrue(report.passed)
+
+
+class ValidationCommandTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        config = mock.patch.dict(settings.EUROSTAT_CONFIG, {
+            'BASE_URL': None, 'CHECKPOINT_DIR': os.path.join(self.directory, 'checkpoints'),
+            'BROWSER_PROFILE_DIR': '',
+        })
+        config.start()
+        self.addCleanup(config.stop)
+
+    def scrape(self, rows, **options):
+        grid = ([{code: code} for code in rows], YEARS, make_batch(rows))
+        with mock.patch.object(EurostatScraper, '__enter__', lambda scraper: scraper), \
+                mock.patch.object(EurostatScraper, '__exit__', return_value=False), \
+                mock.patch.object(EurostatScraper, 'extract_grid', return_value=grid):
+            call_command('scrape_eurostat', metrics_dir=os.path.join(self.directory, 'metrics'), **options)
+
+    def test_failed_batch_is_not_imported(self):
+        rows = {'AT': {'2020': '1.0'}, 'BE': {'2020': '2.0'}}  # 2021 and 2022 missing
+        with self.assertLogs('eurostat_manager', 'ERROR'), self.assertRaises(CommandError) as raised:
+            self.scrape(rows)
+        self.assertIn('--skip-validation', str(raised.exception))
+        self.assertFalse(GDPData.objects.exists())
+
+        self.scrape(rows, skip_validation=True)
+        self.assertEqual(GDPData.objects.count(), 2)
@@ -0,0 +1,11 @@
+from scraper.records import ObservationBatch
+
+
+def make_batch(rows, names=None):
+    """ObservationBatch from {code: {year: value text}} (every cell available, no flags)"""
+    batch = ObservationBatch()
+    for code, cells in rows.items():
+        batch.add_geo(code, (names or {}).get(code))
+        batch.add_row(code, {year: {'value': value, 'flag': None, 'is_available': True}
+                             for year, value in cells.items()})
+    return batch
@@ -0,0 +1,268 @@
+import logging
+import time
+
+import numpy as np
+
+from eurostat_manager import settings
+from .matrix import GDPMatrix
+from .models import GDPData
+from .records import FLAG_BITS, FLAG_LETTERS
+from .store import gdp_dataset_code
+
+logger = logging.getLogger(__name__)
+
+# Aggregate compared against the sum of its members (EU from 2020, 27 member states)
+EU_AGGREGATE = 'EU27_2020'
+EU_MEMBERS = ('BE', 'BG', 'CZ', 'DK', 'DE', 'EE', 'IE', 'EL', 'ES', 'FR', 'HR', 'IT', 'CY', 'LV',
+              'LT', 'LU', 'HU', 'MT', 'NL', 'AT', 'PL', 'PT', 'RO', 'SI', 'SK', 'FI', 'SE')
+
+# Thresholds of the checks; EUROSTAT_CONFIG['VALIDATION_THRESHOLDS'] overrides them one by one
+DEFAULT_THRESHOLDS = {
+    'min_year_coverage': 0.5,      # Share of geo areas with a value, for every year column
+    'max_empty_rows': 0.2,         # Share of geo areas without any value
+    'max_non_numeric': 0.01,       # Share of available cells whose text is not a number
+    'jump_factor': 5.0,            # Ratio to the stored value (or last stored year) counted as a jump
+    'max_jump_share': 0.02,        # Share of compared cells that may jump
+    'aggregate_tolerance': 0.02,   # Relative gap between EU27 and the sum of its members (0: check off)
+    'max_aggregate_failures': 0.0, # Share of comparable years outside the tolerance
+    'max_flag_drift': 0.25,        # Change of the share of cells carrying any one flag letter
+}
+
+
+class ValidationFailed(RuntimeError):
+    """Extracted observations failed the data-quality checks; nothing was imported"""
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__(f"Validation failed: {report.summary()}")
+
+
+def validation_thresholds(overrides=None):
+    """
+    Thresholds of validate_batch: defaults, EUROSTAT_CONFIG['VALIDATION_THRESHOLDS'], then overrides
+    Returns:
+        dict: {name: float}
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    configured = settings.EUROSTAT_CONFIG.get('VALIDATION_THRESHOLDS') or {}
+    thresholds.update({name: float(value) for name, value in configured.items() if name in DEFAULT_THRESHOLDS})
+    thresholds.update(overrides or {})
+    return thresholds
+
+
+class ValidationReport:
+    """Outcome of every check: value measured, threshold, pass/fail and details"""
+
+    def __init__(self):
+        self.checks = []
+        self.seconds = 0.0
+        self.history_seconds = 0.0
+
+    def add(self, name, value, threshold, passed, **details):
+        self.checks.append({'check': name, 'value': value, 'threshold': threshold, 'passed': bool(passed), **details})
+
+    def skip(self, name, reason):
+        self.checks.append({'check': name, 'value': None, 'threshold': None, 'passed': True, 'skipped': reason})
+
+    @property
+    def passed(self):
+        return all(check['passed'] for check in self.checks)
+
+    @property
+    def failures(self):
+        return [check for check in self.checks if not check['passed']]
+
+    def summary(self):
+        """One line: failed checks with value and threshold, or 'ok'"""
+        failures = self.failures
+        if not failures:
+            return f"ok ({len(self.checks)} checks in {self.seconds * 1000:.1f} ms)"
+        return ', '.join(f"{check['check']}={check['value']:.4g} (threshold {check['threshold']:.4g})"
+                         for check in failures)
+
+    def as_dict(self):
+        """JSON-serializable report, stored in the run record"""
+        return {'passed': self.passed, 'seconds': self.seconds, 'history_seconds': self.history_seconds,
+                'checks': self.checks}
+
+
+def batch_matrix(batch, years):
+    """
+    Dense geo × year arrays of an ObservationBatch
+    Args:
+        batch (ObservationBatch): Extracted observations
+        years (list): Year columns of the grid (columns without any observation stay empty)
+    Returns:
+        tuple: (years array, values float64, present bool, flags uint16), arrays of shape (n_geos, n_years)
+    """
+    columns = batch.as_numpy()
+    axis = np.union1d(np.asarray([int(year) for year in years], dtype=np.int64), columns['year'].astype(np.int64))
+    shape = (len(batch.geo_codes), len(axis))
+    values = np.full(shape, np.nan)
+    present = np.zeros(shape, dtype=bool)
+    flags = np.zeros(shape, dtype=np.uint16)
+    rows = columns['geo_index']
+    cols = np.searchsorted(axis, columns['year'])
+    values[rows, cols] = columns['value']
+    present[rows, cols] = True
+    flags[rows, cols] = columns['flag']
+    return axis, values, present, flags
+
+
+def load_history(codes, dataset=None):
+    """
+    Stored observations of the given geo areas in the same dataset, for the history checks
+    Args:
+        codes (list): Geo codes of the batch
+        dataset (str): Dataset key of the batch (see checkpoints.dataset_key); GDPData holds
+                       the GDP dataset only, other datasets are read from the observation store
+    Returns:
+        GDPMatrix: Stored values (None when nothing is stored yet)
+    """
+    if dataset is not None and dataset != gdp_dataset_code():
+        history = GDPMatrix.from_store(dataset, codes)
+        return history if history.values.size else None
+    queryset = GDPData.objects.filter(geo_area__code__in=list(codes), is_available=True)
+    if not queryset.exists():
+        return None
+    return GDPMatrix.from_db(queryset)
+
+
+def _align_history(history, codes, axis):
+    """
+    History values and flags aligned to the batch rows and year axis
+    Returns:
+        tuple: (values, flags uint16 bitmask) of shape (n_geos, n_years); NaN / 0 where nothing is stored
+    """
+    values = np.full((len(codes), len(axis)), np.nan)
+    flags = np.zeros(values.shape, dtype=np.uint16)
+    rows = np.array([history.code_index.get(code, -1) for code in codes], dtype=np.int64)
+    cols = np.array([history.year_index.get(int(year), -1) for year in axis], dtype=np.int64)
+    found_rows, found_cols = rows >= 0, cols >= 0
+    if not found_rows.any() or not found_cols.any():
+        return values, flags
+    sub = np.ix_(rows[found_rows], cols[found_cols])
+    target = np.ix_(np.flatnonzero(found_rows), np.flatnonzero(found_cols))
+    stored = np.where(history.available, history.values, np.nan)
+    values[target] = stored[sub]
+    for k, letter in enumerate(history.flag_letters):
+        flags[target] |= np.where(history.flags[k][sub], FLAG_BITS[letter], 0).astype(np.uint16)
+    return values, flags
+
+
+def _forward_fill(values):
+    """Every cell replaced by the last finite value at or before its column (NaN before the first)"""
+    finite = np.isfinite(values)
+    index = np.where(finite, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = values[np.arange(values.shape[0])[:, None], index]
+    filled[~np.maximum.accumulate(finite, axis=1)] = np.nan
+    return filled
+
+
+def validate_batch(batch, years, history=None, thresholds=None, incremental=False):
+    """
+    Vectorized data-quality checks over a whole extracted geo × year batch.
+
+    - year_coverage: every year column has values for enough geo areas (a mis-scroll leaves columns empty)
+    - empty_rows: few geo areas without any value
+    - non_numeric: values parsed as numbers (wrong separators or shifted text cells fail)
+    - magnitude_jumps: values within jump_factor of the stored value of the cell, or of the last
+      stored year for new years
+    - eu_aggregate: EU27_2020 matches the sum of the 27 member states
+    - flag_drift: the share of cells carrying each flag letter is close to the stored one
+
+    Incremental batches only hold the volatile cells, so coverage, empty rows and flag drift are skipped.
+    Args:
+        batch (ObservationBatch): Extracted observations
+        years (list): Year columns of the grid
+        history (GDPMatrix): Stored observations (see load_history); None skips the history checks
+        thresholds (dict): Threshold overrides (see DEFAULT_THRESHOLDS)
+        incremental (bool): Batch of an incremental scrape
+    Returns:
+        ValidationReport: Checks with values and thresholds
+    """
+    limits = validation_thresholds(thresholds)
+    report = ValidationReport()
+    start = time.perf_counter()
+    axis, values, present, flags = batch_matrix(batch, years)
+    n_geos = len(batch.geo_codes)
+
+    if incremental:
+        for name in ('year_coverage', 'empty_rows', 'flag_drift'):
+            report.skip(name, 'incremental batch')
+    elif n_geos:
+        coverage = present.mean(axis=0)
+        worst = int(coverage.argmin()) if len(axis) else None
+        report.add('year_coverage', float(coverage.min()) if len(axis) else 0.0, limits['min_year_coverage'],
+                   len(axis) and coverage.min() >= limits['min_year_coverage'],
+                   year=int(axis[worst]) if worst is not None else None)
+        empty = ~present.any(axis=1)
+        report.add('empty_rows', float(empty.mean()), limits['max_empty_rows'], empty.mean() <= limits['max_empty_rows'],
+                   examples=[batch.geo_codes[i] for i in np.flatnonzero(empty)[:5]])
+
+    n_cells = int(present.sum())
+    non_numeric = float((present & np.isnan(values)).sum() / n_cells) if n_cells else 0.0
+    report.add('non_numeric', non_numeric, limits['max_non_numeric'], non_numeric <= limits['max_non_numeric'])
+
+    if history is None:
+        report.skip('magnitude_jumps', 'no stored history')
+        if not incremental:
+            report.skip('flag_drift', 'no stored history')
+    else:
+        stored, stored_flags = _align_history(history, batch.geo_codes, axis)
+        reference = _forward_fill(stored)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.abs(values / reference)
+        compared = present & np.isfinite(ratio) & (reference != 0)
+        factor = limits['jump_factor']
+        jumps = compared & ((ratio > factor) | (ratio < 1 / factor))
+        if compared.any():
+            share = float(jumps.sum() / compared.sum())
+            rows, cols = np.nonzero(jumps)
+            report.add('magnitude_jumps', share, limits['max_jump_share'], share <= limits['max_jump_share'],
+                       compared=int(compared.sum()),
+                       examples=[f"{batch.geo_codes[i]}/{int(axis[j])}" for i, j in zip(rows[:5], cols[:5])])
+        else:
+            report.skip('magnitude_jumps', 'no overlapping history')
+
+        if not incremental:
+            stored_cells = np.isfinite(stored)
+            if stored_cells.any() and n_cells:
+                drift = {
+                    letter: abs(float((flags[present] & bit != 0).mean()) -
+                                float((stored_flags[stored_cells] & bit != 0).mean()))
+                    for letter, bit in ((letter, FLAG_BITS[letter]) for letter in FLAG_LETTERS)
+                }
+                letter = max(drift, key=drift.get)
+                report.add('flag_drift', drift[letter], limits['max_flag_drift'],
+                           drift[letter] <= limits['max_flag_drift'], flag=letter)
+            else:
+                report.skip('flag_drift', 'no overlapping history')
+
+    _check_aggregate(report, batch, axis, values, present, limits)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _check_aggregate(report, batch, axis, values, present, limits):
+    """EU27_2020 against the sum of its members, for the years where all of them have a value"""
+    tolerance = limits['aggregate_tolerance']
+    if not tolerance:
+        report.skip('eu_aggregate', 'disabled')
+        return
+    aggregate = batch.geo_lookup.get(EU_AGGREGATE)
+    members = [batch.geo_lookup.get(code) for code in EU_MEMBERS]
+    if aggregate is None or None in members:
+        report.skip('eu_aggregate', f'{EU_AGGREGATE} or members not in the batch')
+        return
+    comparable = present[aggregate] & present[members].all(axis=0) & (values[aggregate] != 0)
+    if not comparable.any():
+        report.skip('eu_aggregate', 'no year with the aggregate and every member')
+        return
+    gap = np.abs(values[members].sum(axis=0) - values[aggregate]) / np.abs(values[aggregate])
+    failed = comparable & ~(gap <= tolerance)
+    share = float(failed.sum() / comparable.sum())
+    report.add('eu_aggregate', share, limits['max_aggregate_failures'], share <= limits['max_aggregate_failures'],
+               max_gap=float(np.nanmax(np.where(comparable, gap, np.nan))),
+               years=[int(year) for year in axis[failed][:5]])
@@ -1,3 +1,33 @@
-from django.shortcuts import render
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from .search import DEFAULT_LIMIT, search_geo_areas
+
+# Upper bound for the limit parameter of the lookup API
+MAX_LOOKUP_LIMIT = 100
+
+
+@require_GET
+def geo_lookup(request):
+    """
+    Geo area lookup API: GET /api/geo/lookup/?q=bruss&limit=10
+    Word-prefix match over accent-folded codes, names and notes, best match first.
+    Returns:
+        JsonResponse: {'query': q, 'results': [{'code', 'name', 'is_eu', 'is_euro_area', 'notes'}, ...]}
+    """
+    query = request.GET.get('q', '')
+    try:
+        limit = min(max(int(request.GET.get('limit', DEFAULT_LIMIT)), 1), MAX_LOOKUP_LIMIT)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+    results = [
+        {
+            'code': area.code,
+            'name': area.name,
+            'is_eu': area.is_eu,
+            'is_euro_area': area.is_euro_area,
+            'notes': area.notes,
+        }
+        for area in search_geo_areas(query, limit)
+    ]
+    return JsonResponse({'query': query, 'results': results})